@@ -1,61 +1,97 @@
 """School Schedule integration for Home Assistant."""
 from __future__ import annotations
 
+import importlib
 import logging
+from types import ModuleType
+from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .coordinator import SchoolScheduleCoordinator
-from .http_api import async_setup_http
-from .services import async_setup_services, async_unload_services
-from .store import SchoolScheduleStore
+
+if TYPE_CHECKING:
+    from .coordinator import SchoolScheduleCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.CALENDAR, Platform.TODO]
+
+
+async def _async_import(hass: HomeAssistant, name: str) -> ModuleType:
+    """Import one of the integration's modules without blocking the loop."""
+    return await hass.async_add_executor_job(
+        importlib.import_module, f".{name}", __name__
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up School Schedule from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    coordinator = SchoolScheduleCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    coordinator_module = await _async_import(hass, "coordinator")
+    coordinator: SchoolScheduleCoordinator = (
+        coordinator_module.SchoolScheduleCoordinator(hass, entry)
+    )
 
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    # Create entities from the last known state and load the store in the
+    # background; only a fresh install has to wait for the first refresh.
+    if await coordinator.async_load_cached_state():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
-    # Register services (only once)
-    await async_setup_services(hass)
+    hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    # Register HTTP endpoints (only once)
-    if len(hass.config_entries.async_entries(DOMAIN)) == 1:
-        await async_setup_http(hass)
+    # Registering services is cheap, and automations may call them as soon
+    # as setup is done, so it isn't deferred (the module is imported off
+    # the event loop)
+    services = await _async_import(hass, "services")
+    await services.async_setup_services(hass)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # HTTP endpoints are not needed to display the entities or run services
+    entry.async_create_background_task(
+        hass, _async_setup_http(hass), f"{DOMAIN} http setup"
+    )
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(coordinator.reminders.async_stop)
+    entry.async_on_unload(coordinator.boundaries.async_stop)
 
     return True
 
 
+async def _async_setup_http(hass: HomeAssistant) -> None:
+    """Set up HTTP endpoints (the views are registered only once)."""
+    http_api = await _async_import(hass, "http_api")
+    await http_api.async_setup_http(hass)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
 
-        # Only unload services if no more entries
+        # Only unload services and stop the upload pool if no more entries
         if not hass.data[DOMAIN]:
-            await async_unload_services(hass)
+            services = await _async_import(hass, "services")
+            await services.async_unload_services(hass)
+            http_api = await _async_import(hass, "http_api")
+            http_api.async_unload_http(hass)
 
     return unload_ok
 
 
 async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Remove a config entry and clean up storage."""
-    store = SchoolScheduleStore(hass, entry.entry_id)
+    store_module = await _async_import(hass, "store")
+    store = store_module.SchoolScheduleStore(hass, entry.entry_id)
     await store.async_remove()
     _LOGGER.debug("Removed storage for entry %s", entry.entry_id)
 
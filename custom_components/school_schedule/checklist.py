@@ -0,0 +1,135 @@
+"""Packing checklists for School Schedule.
+
+Ticking items off while a bag is packed happens often and only matters
+until the day has passed, so it is kept out of the schedule document: a
+tick appends no journal record, recompiles nothing and doesn't refresh the
+coordinator. Packed item IDs are held in memory by child and date, saved to
+a small store of their own a few seconds after the last tick, and dropped
+once their date is no longer displayed. Only the ticked child's entity is
+told about a change.
+"""
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+from .store import SchoolScheduleStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PackingChecklist:
+    """Which items each child has packed, by date."""
+
+    def __init__(self, store: SchoolScheduleStore) -> None:
+        """Initialize the checklists."""
+        self._store = store
+        # child -> date (YYYY-MM-DD) -> packed item IDs
+        self._packed: dict[str, dict[str, set[str]]] = {}
+        self._listeners: dict[str, list[CALLBACK_TYPE]] = {}
+
+    async def async_load(self) -> None:
+        """Load the checklists saved before the last restart."""
+        data = await self._store.async_load_packed() or {}
+        self._packed = {
+            child_name: {day: set(item_ids) for day, item_ids in days.items()}
+            for child_name, days in data.get("children", {}).items()
+        }
+
+    def packed(self, child_name: str, day: str) -> set[str]:
+        """Return the IDs of the items a child has packed for a date."""
+        return self._packed.get(child_name, {}).get(day, set())
+
+    @callback
+    def async_set_packed(
+        self, child_name: str, day: str, item_id: str, packed: bool | None = None
+    ) -> bool:
+        """Mark an item packed or not (toggle it if None); return the result."""
+        days = self._packed.setdefault(child_name, {})
+        item_ids = days.setdefault(day, set())
+        if packed is None:
+            packed = item_id not in item_ids
+        if packed != (item_id in item_ids):
+            if packed:
+                item_ids.add(item_id)
+            else:
+                item_ids.discard(item_id)
+            self._async_changed(child_name)
+        if not item_ids:
+            del days[day]
+        if not days:
+            del self._packed[child_name]
+        return packed
+
+    @callback
+    def async_clear(self, child_name: str, day: str | None = None) -> None:
+        """Unpack everything for a date, or for every date if None."""
+        days = self._packed.get(child_name)
+        if not days:
+            return
+        if day is None:
+            del self._packed[child_name]
+        elif days.pop(day, None) is None:
+            return
+        elif not days:
+            del self._packed[child_name]
+        self._async_changed(child_name)
+
+    @callback
+    def async_roll_over(self, first_days: Mapping[str, str]) -> None:
+        """Drop each child's dates before its first displayed date.
+
+        first_days maps every child to the date it is shown (children can
+        have their own switchover time or time zone); children left out no
+        longer exist. Called whenever the displayed dates are worked out,
+        which updates the entities anyway, so listeners are not told.
+        """
+        changed = False
+        for child_name in list(self._packed):
+            days = self._packed[child_name]
+            if (first_day := first_days.get(child_name)) is not None:
+                # ISO dates sort as strings
+                for day in [day for day in days if day < first_day]:
+                    del days[day]
+                    changed = True
+            if first_day is None or not days:
+                del self._packed[child_name]
+                changed = True
+        if changed:
+            _LOGGER.debug("Cleared packing checklists before the displayed dates")
+            self._store.async_delay_save_packed(self._as_dict)
+
+    @callback
+    def async_add_listener(
+        self, child_name: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call update_callback when a child's checklist changes."""
+        listeners = self._listeners.setdefault(child_name, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+            if not listeners:
+                self._listeners.pop(child_name, None)
+
+        return remove_listener
+
+    @callback
+    def _async_changed(self, child_name: str) -> None:
+        """Save soon and update the child's entities."""
+        self._store.async_delay_save_packed(self._as_dict)
+        for update_callback in list(self._listeners.get(child_name, ())):
+            update_callback()
+
+    def _as_dict(self) -> dict[str, Any]:
+        """Return the checklists as stored."""
+        return {
+            "children": {
+                child_name: {day: sorted(item_ids) for day, item_ids in days.items()}
+                for child_name, days in self._packed.items()
+            }
+        }
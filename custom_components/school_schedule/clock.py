@@ -0,0 +1,286 @@
+"""Local day boundaries for School Schedule.
+
+The displayed date changes at two instants a day: local midnight, when
+today moves on, and the switchover time, when the display moves on to the
+next day. ScheduleClock works out both instants once, for a switchover time
+and time zone (Home Assistant's unless a child has its own), and answers
+every read from that until the earlier of the two has passed. Instants are
+found through UTC, so DST changes are handled: a wall time skipped when the
+clocks go forward happens at the moment they jump past it, and one repeated
+when they go back happens the first time round.
+
+BoundaryQueue keeps the next boundary of every clock in one min-heap with a
+single timer for the earliest, so only the clocks whose boundary passed
+are looked at when it goes off.
+"""
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, tzinfo
+from itertools import count
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_SWITCHOVER_TIME
+
+# Replaced heap entries tolerated before the boundary heap is rebuilt
+HEAP_SLACK = 16
+
+
+def parse_switchover(value: str) -> time:
+    """Parse an HH:MM switchover time, falling back to noon if invalid."""
+    try:
+        parts = value.split(":")
+        hour = int(parts[0])
+        minute = int(parts[1]) if len(parts) > 1 else 0
+        if 0 <= hour <= 23 and 0 <= minute <= 59:
+            return time(hour, minute)
+        return time(12, 0)
+    except (ValueError, IndexError, TypeError):
+        return time(12, 0)
+
+
+def local_instant(day: date, at: time, time_zone: tzinfo) -> datetime:
+    """Return the first instant on a local date whose wall time is `at` or later."""
+    wall = datetime.combine(day, at)
+    instant = dt_util.as_utc(wall.replace(tzinfo=time_zone))
+    if instant.astimezone(time_zone).replace(tzinfo=None) == wall:
+        return instant.astimezone(time_zone)
+
+    # The wall time was skipped; the clocks jumped past it between the
+    # instant it maps to with the offset from after the change and the one
+    # with the offset from before
+    low = int(dt_util.as_utc(wall.replace(tzinfo=time_zone, fold=1)).timestamp())
+    high = int(instant.timestamp())
+    while high - low > 1:
+        middle = (low + high) // 2
+        if dt_util.utc_from_timestamp(middle).astimezone(time_zone).replace(
+            tzinfo=None
+        ) >= wall:
+            high = middle
+        else:
+            low = middle
+    return dt_util.utc_from_timestamp(high).astimezone(time_zone)
+
+
+@dataclass(frozen=True)
+class DayState:
+    """The displayed date, valid from `start` until `end`."""
+
+    today: date
+    is_tomorrow: bool
+    # When this state began: today's midnight, or today's switchover once
+    # it has passed
+    start: datetime
+    midnight: datetime
+    next_midnight: datetime
+    next_switchover: datetime
+
+    @property
+    def end(self) -> datetime:
+        """Return when the displayed date or today next changes."""
+        return min(self.next_midnight, self.next_switchover)
+
+    @property
+    def display_date(self) -> date:
+        """Return the date items are shown for."""
+        return self.today + timedelta(days=1) if self.is_tomorrow else self.today
+
+    @property
+    def display_start(self) -> datetime:
+        """Return when the displayed date begins."""
+        return self.next_midnight if self.is_tomorrow else self.midnight
+
+
+class ScheduleClock:
+    """Tell which date is displayed, recomputing only at day boundaries."""
+
+    def __init__(self, switchover: str = DEFAULT_SWITCHOVER_TIME) -> None:
+        """Initialize the clock."""
+        self._switchover_value: str | None = None
+        self._switchover = time(12, 0)
+        self._time_zone_name: str | None = None
+        # The child's own time zone; Home Assistant's is used if None
+        self._own_time_zone: tzinfo | None = None
+        self._time_zone: tzinfo | None = None
+        self._state: DayState | None = None
+        self.set_switchover(switchover)
+
+    @property
+    def switchover(self) -> time:
+        """Return the parsed switchover time."""
+        return self._switchover
+
+    def set_switchover(self, value: str) -> None:
+        """Use a switchover time from the stored document.
+
+        Called on every refresh; the value is only parsed when it changes.
+        """
+        if value == self._switchover_value:
+            return
+        self._switchover_value = value
+        switchover = parse_switchover(value)
+        if switchover != self._switchover:
+            self._switchover = switchover
+            self._state = None
+
+    def set_time_zone(self, name: str | None) -> None:
+        """Use a time zone by name, or Home Assistant's if None.
+
+        Called on every refresh; the zone is only looked up when it changes.
+        An unknown name falls back to Home Assistant's time zone.
+        """
+        if name == self._time_zone_name:
+            return
+        self._time_zone_name = name
+        self._own_time_zone = dt_util.get_time_zone(name) if name else None
+        self._state = None
+
+    def state(self, now: datetime | None = None) -> DayState:
+        """Return the state at an instant, the current one if None."""
+        if now is None:
+            now = dt_util.now()
+        state = self._state
+        if (
+            state is None
+            or self._time_zone
+            is not (self._own_time_zone or dt_util.DEFAULT_TIME_ZONE)
+            or not state.start <= now < state.end
+        ):
+            state = self._state = self._compute(now)
+        return state
+
+    def _compute(self, now: datetime) -> DayState:
+        """Work out the state and its boundaries around an instant."""
+        time_zone = self._time_zone = (
+            self._own_time_zone or dt_util.DEFAULT_TIME_ZONE
+        )
+        today = now.astimezone(time_zone).date()
+        tomorrow = today + timedelta(days=1)
+        midnight = local_instant(today, time.min, time_zone)
+        next_midnight = local_instant(tomorrow, time.min, time_zone)
+        switchover = local_instant(today, self._switchover, time_zone)
+        if now >= switchover:
+            return DayState(
+                today=today,
+                is_tomorrow=True,
+                start=switchover,
+                midnight=midnight,
+                next_midnight=next_midnight,
+                next_switchover=local_instant(tomorrow, self._switchover, time_zone),
+            )
+        return DayState(
+            today=today,
+            is_tomorrow=False,
+            start=midnight,
+            midnight=midnight,
+            next_midnight=next_midnight,
+            next_switchover=switchover,
+        )
+
+
+class BoundaryQueue:
+    """Call back with the keys whose next day boundary has passed.
+
+    Keys are children, or None for the household's own clock. Boundaries
+    that are replaced are left in the heap and skipped when they reach the
+    top.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        action: Callable[[set[str | None]], None],
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._action = action
+        # (boundary timestamp, token, key), earliest first
+        self._heap: list[tuple[float, int, str | None]] = []
+        # key -> (token, boundary timestamp) of its live heap entry
+        self._next: dict[str | None, tuple[int, float]] = {}
+        self._tokens = count()
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_at: float | None = None
+
+    @property
+    def next_boundary(self) -> datetime | None:
+        """Return when the timer goes off next."""
+        if self._timer_at is None:
+            return None
+        return dt_util.as_local(dt_util.utc_from_timestamp(self._timer_at))
+
+    @callback
+    def async_update(self, boundaries: Mapping[str | None, datetime]) -> None:
+        """Set the next boundary of every key; keys left out are dropped."""
+        planned: dict[str | None, tuple[int, float]] = {}
+        for key, when in boundaries.items():
+            planned[key] = self._push(key, when)
+        self._next = planned
+        self._async_set_timer()
+
+    @callback
+    def async_set(self, key: str | None, when: datetime) -> None:
+        """Set the next boundary of one key."""
+        self._next[key] = self._push(key, when)
+        self._async_set_timer()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer."""
+        if self._timer is not None:
+            self._timer()
+            self._timer = None
+            self._timer_at = None
+
+    def _push(self, key: str | None, when: datetime) -> tuple[int, float]:
+        """Return the key's live entry for a boundary, adding one if it moved."""
+        timestamp = when.timestamp()
+        current = self._next.get(key)
+        if current is not None and current[1] == timestamp:
+            return current
+        token = next(self._tokens)
+        heapq.heappush(self._heap, (timestamp, token, key))
+        return token, timestamp
+
+    def _is_live(self, entry: tuple[float, int, str | None]) -> bool:
+        """Return True if a heap entry hasn't been replaced."""
+        planned = self._next.get(entry[2])
+        return planned is not None and planned[0] == entry[1]
+
+    @callback
+    def _async_set_timer(self) -> None:
+        """Set the one timer for the earliest live entry."""
+        if len(self._heap) > 2 * len(self._next) + HEAP_SLACK:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        when = self._heap[0][0] if self._heap else None
+        if when == self._timer_at:
+            return
+        self.async_stop()
+        if when is not None:
+            self._timer_at = when
+            self._timer = async_track_point_in_utc_time(
+                self._hass, self._async_fire_due, dt_util.utc_from_timestamp(when)
+            )
+
+    @callback
+    def _async_fire_due(self, now: datetime) -> None:
+        """Hand every key whose boundary has passed to the action."""
+        self._timer = None
+        self._timer_at = None
+        due: set[str | None] = set()
+        while self._heap and self._heap[0][0] <= now.timestamp():
+            entry = heapq.heappop(self._heap)
+            if self._is_live(entry):
+                del self._next[entry[2]]
+                due.add(entry[2])
+        self._async_set_timer()
+        if due:
+            self._action(due)
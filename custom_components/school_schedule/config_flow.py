@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+import secrets
 from typing import Any
 
 import voluptuous as vol
@@ -10,7 +11,29 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_SWITCHOVER_TIME, DEFAULT_SWITCHOVER_TIME
+from .const import (
+    DOMAIN,
+    CONF_AWAIT_REFRESH,
+    CONF_FEED_TOKEN,
+    CONF_FEED_TOKEN_ENABLED,
+    CONF_JOURNAL_RETENTION,
+    CONF_LOOKAHEAD_DAYS,
+    CONF_REFRESH_COOLDOWN,
+    CONF_REGENERATE_FEED_TOKEN,
+    CONF_SWITCHOVER_TIME,
+    CONF_UPLOAD_RATE_LIMIT,
+    DEFAULT_AWAIT_REFRESH,
+    DEFAULT_JOURNAL_RETENTION_DAYS,
+    DEFAULT_LOOKAHEAD_DAYS,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_SWITCHOVER_TIME,
+    DEFAULT_UPLOAD_RATE_LIMIT,
+    MAX_JOURNAL_RETENTION_DAYS,
+    MAX_LOOKAHEAD_DAYS,
+    MAX_REFRESH_COOLDOWN,
+    MAX_UPLOAD_RATE_LIMIT,
+    MIN_FEED_TOKEN_LENGTH,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -59,13 +82,28 @@ class SchoolScheduleOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._options: dict[str, Any] = {}
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        token = self.config_entry.options.get(CONF_FEED_TOKEN) or ""
+        if len(token) < MIN_FEED_TOKEN_LENGTH:
+            token = ""
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            options = dict(user_input)
+            enabled = options.pop(CONF_FEED_TOKEN_ENABLED)
+            regenerate = options.pop(CONF_REGENERATE_FEED_TOKEN)
+            # Tokens are generated, never typed in, so they can't be guessed
+            if enabled and (regenerate or not token):
+                options[CONF_FEED_TOKEN] = secrets.token_urlsafe(32)
+                self._options = options
+                return await self.async_step_feed_token()
+            if enabled:
+                options[CONF_FEED_TOKEN] = token
+            return self.async_create_entry(title="", data=options)
 
         return self.async_show_form(
             step_id="init",
@@ -74,5 +112,42 @@ class SchoolScheduleOptionsFlowHandler(config_entries.OptionsFlow):
                     CONF_SWITCHOVER_TIME,
                     default=self.config_entry.data.get(CONF_SWITCHOVER_TIME, DEFAULT_SWITCHOVER_TIME),
                 ): str,
+                vol.Optional(
+                    CONF_LOOKAHEAD_DAYS,
+                    default=self.config_entry.options.get(CONF_LOOKAHEAD_DAYS, DEFAULT_LOOKAHEAD_DAYS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_LOOKAHEAD_DAYS)),
+                vol.Optional(CONF_FEED_TOKEN_ENABLED, default=bool(token)): bool,
+                vol.Optional(CONF_REGENERATE_FEED_TOKEN, default=False): bool,
+                vol.Optional(
+                    CONF_REFRESH_COOLDOWN,
+                    default=self.config_entry.options.get(CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_REFRESH_COOLDOWN)),
+                vol.Optional(
+                    CONF_AWAIT_REFRESH,
+                    default=self.config_entry.options.get(CONF_AWAIT_REFRESH, DEFAULT_AWAIT_REFRESH),
+                ): bool,
+                vol.Optional(
+                    CONF_UPLOAD_RATE_LIMIT,
+                    default=self.config_entry.options.get(CONF_UPLOAD_RATE_LIMIT, DEFAULT_UPLOAD_RATE_LIMIT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_UPLOAD_RATE_LIMIT)),
+                vol.Optional(
+                    CONF_JOURNAL_RETENTION,
+                    default=self.config_entry.options.get(CONF_JOURNAL_RETENTION, DEFAULT_JOURNAL_RETENTION_DAYS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_JOURNAL_RETENTION_DAYS)),
             }),
+            description_placeholders={"feed_token": token or "not set"},
+        )
+
+    async def async_step_feed_token(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show a newly generated feed token; it is saved on submit."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=self._options)
+
+        return self.async_show_form(
+            step_id="feed_token",
+            description_placeholders={
+                "feed_token": self._options[CONF_FEED_TOKEN]
+            },
         )
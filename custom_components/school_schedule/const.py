@@ -12,9 +12,37 @@ CONF_ITEM_IMAGE = "image"
 CONF_WEEKLY_SCHEDULE = "weekly_schedule"
 CONF_EXCEPTIONS = "exceptions"
 CONF_SWITCHOVER_TIME = "switchover_time"
+CONF_LOOKAHEAD_DAYS = "lookahead_days"
+CONF_FEED_TOKEN = "feed_token"
+CONF_FEED_TOKEN_ENABLED = "feed_token_enabled"
+CONF_REGENERATE_FEED_TOKEN = "regenerate_feed_token"
+CONF_REFRESH_COOLDOWN = "refresh_cooldown"
+CONF_AWAIT_REFRESH = "await_refresh"
+CONF_UPLOAD_RATE_LIMIT = "upload_rate_limit"
+CONF_JOURNAL_RETENTION = "journal_retention_days"
+
+# Uploaded school calendars are kept here (under the config directory), not
+# in www/ where they would be public
+IMPORT_DIR = "school_schedule"
+
+# Feed tokens are generated; shorter ones (typed in by older versions) are
+# not accepted
+MIN_FEED_TOKEN_LENGTH = 32
 
 # Defaults
 DEFAULT_SWITCHOVER_TIME = "12:00"
+DEFAULT_LOOKAHEAD_DAYS = 7
+MAX_LOOKAHEAD_DAYS = 31
+# Seconds that changes after the first in a burst wait to share one refresh
+DEFAULT_REFRESH_COOLDOWN = 1.0
+MAX_REFRESH_COOLDOWN = 30
+DEFAULT_AWAIT_REFRESH = True
+# Uploads per user per minute (0 for no limit)
+DEFAULT_UPLOAD_RATE_LIMIT = 30
+MAX_UPLOAD_RATE_LIMIT = 600
+# Days folded journal segments are kept for restore (0 to keep none)
+DEFAULT_JOURNAL_RETENTION_DAYS = 30
+MAX_JOURNAL_RETENTION_DAYS = 3650
 
 # Days of week
 DAYS_OF_WEEK = [
@@ -2,26 +2,59 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import logging
-from datetime import datetime, time, timedelta
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from time import perf_counter
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
 from .const import (
     DOMAIN,
+    CONF_AWAIT_REFRESH,
+    CONF_JOURNAL_RETENTION,
+    CONF_LOOKAHEAD_DAYS,
+    CONF_REFRESH_COOLDOWN,
+    DEFAULT_AWAIT_REFRESH,
+    DEFAULT_JOURNAL_RETENTION_DAYS,
+    DEFAULT_LOOKAHEAD_DAYS,
+    DEFAULT_REFRESH_COOLDOWN,
     DEFAULT_SWITCHOVER_TIME,
     DAYS_OF_WEEK,
 )
+from .checklist import PackingChecklist
+from .clock import BoundaryQueue, DayState, ScheduleClock, parse_switchover
+from .matrix import ScheduleMatrix
+from .metrics import SchoolScheduleMetrics
+from .reminders import ReminderScheduler
+from .schedule import ITEM_FIELDS, CompiledSchedule, ItemTable, is_reference
+from .transfer import link_library_items, validate_document
 from .store import SchoolScheduleStore
+from .usage import UsageStatistics
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _first_days(result: dict[str, Any]) -> dict[str, str]:
+    """Return the first date each child still packs for."""
+    return {
+        child_name: child["display_date"]
+        for child_name, child in result["children"].items()
+    }
+
+
 class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinator to manage school schedule data."""
 
@@ -33,109 +66,352 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=1),
+            # Nothing is polled: the boundary queue refreshes at each day
+            # boundary and changes request their own refresh
+            update_interval=None,
+            # The first change in a burst refreshes straight away; the rest
+            # share one refresh when the cooldown ends
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=entry.options.get(
+                    CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN
+                ),
+                immediate=True,
+            ),
         )
         self.config_entry = entry
-        self.store = SchoolScheduleStore(hass, entry.entry_id)
-        self._data: dict[str, Any] = {}
-        self._lock = asyncio.Lock()
+        self._await_refresh: bool = entry.options.get(
+            CONF_AWAIT_REFRESH, DEFAULT_AWAIT_REFRESH
+        )
+        self.metrics = SchoolScheduleMetrics()
+        self.store = SchoolScheduleStore(
+            hass,
+            entry.entry_id,
+            self.metrics,
+            entry.options.get(CONF_JOURNAL_RETENTION, DEFAULT_JOURNAL_RETENTION_DAYS),
+        )
+        self.usage = UsageStatistics(hass)
+        self.checklist = PackingChecklist(self.store)
+        self.reminders = ReminderScheduler(hass)
+        # The household's clock; children with their own switchover time or
+        # time zone also get one of their own
+        self.clock = ScheduleClock()
+        self._clocks: dict[str, ScheduleClock] = {}
+        self.boundaries = BoundaryQueue(hass, self._async_boundaries_passed)
+        # child -> (schedule, displayed date, is_tomorrow, computed entry)
+        self._child_results: dict[
+            str, tuple[CompiledSchedule, date, bool, dict[str, Any]]
+        ] = {}
+        self._data: dict[str, Any] | None = None
+        self._cached_result: dict[str, Any] | None = None
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Held by whole-document changes, and briefly by scoped ones to
+        # register, so a whole-document change runs on its own
+        self._document_lock = asyncio.Lock()
+        self._scoped_changes = 0
+        self._scopes_idle = asyncio.Event()
+        self._scopes_idle.set()
+        self._items: ItemTable | None = None
+        self._compiled: dict[str, CompiledSchedule] = {}
+        self._matrices: dict[str, ScheduleMatrix] = {}
+        self._lookahead_days: int = entry.options.get(
+            CONF_LOOKAHEAD_DAYS, DEFAULT_LOOKAHEAD_DAYS
+        )
+        # child -> (schedule the window was resolved from, (date, entry) pairs)
+        self._lookahead: dict[
+            str, tuple[CompiledSchedule, deque[tuple[date, dict[str, Any]]]]
+        ] = {}
+        self._load_lock = asyncio.Lock()
+
+    async def async_load_cached_state(self) -> bool:
+        """Seed coordinator data from the last computed state, if cached.
+
+        This lets entities be created straight away while the stored
+        document is loaded and recomputed in the background.
+        """
+        cached = await self.store.async_load_cache()
+        if not cached:
+            return False
+        self._cached_result = cached
+        self.data = cached
+        return True
+
+    async def _async_load_data(self) -> dict[str, Any]:
+        """Load the stored document once and keep it in memory."""
+        if self._data is None:
+            # The background first refresh can race an early service call
+            async with self._load_lock:
+                if self._data is None:
+                    data = await self.store.async_load() or {
+                        "children": [],
+                        "item_library": [],
+                        "switchover_time": DEFAULT_SWITCHOVER_TIME,
+                    }
+                    # Ensure item_library exists for older data
+                    if "item_library" not in data:
+                        data["item_library"] = []
+                    # Older versions copied library items into children
+                    link_library_items(data)
+                    await self.checklist.async_load()
+                    self._data = data
+        return self._data
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from storage and compute current items."""
-        stored_data = await self.store.async_load()
-        if stored_data is None:
-            stored_data = {
-                "children": [],
-                "item_library": [],
-                "switchover_time": DEFAULT_SWITCHOVER_TIME,
-            }
-
-        # Ensure item_library exists for older data
-        if "item_library" not in stored_data:
-            stored_data["item_library"] = []
+        """Compute current items from the stored data."""
+        with self.metrics.time("update_data"):
+            return await self._async_compute_data()
 
-        self._data = stored_data
+    async def _async_compute_data(self) -> dict[str, Any]:
+        """Compute which items are needed for each child."""
+        stored_data = await self._async_load_data()
         switchover_time = stored_data.get("switchover_time", DEFAULT_SWITCHOVER_TIME)
+        # One instant for the whole refresh, so every part sees the same day
+        now = dt_util.now()
+        self.clock.set_switchover(switchover_time)
+        day = self.clock.state(now)
 
         # Compute which items are needed for each child
         result: dict[str, Any] = {
             "children": {},
             "item_library": stored_data.get("item_library", []),
             "switchover_time": switchover_time,
-            "display_date": self._get_display_date(switchover_time),
-            "is_tomorrow": self._is_showing_tomorrow(switchover_time),
+            "display_date": day.display_start,
+            "is_tomorrow": day.is_tomorrow,
         }
 
-        library = stored_data.get("item_library", [])
-        for child in stored_data.get("children", []):
-            child_name = child.get("name", "Unknown")
-            items_today = self._get_items_for_date(child, result["display_date"], library)
-            result["children"][child_name] = {
-                "name": child_name,
-                "items": child.get("items", []),
-                "items_today": items_today,
-                "weekly_schedule": child.get("weekly_schedule", {}),
-                "exceptions": child.get("exceptions", {}),
-            }
-
+        schedules = self._compile(stored_data)
+        boundaries: dict[str | None, datetime] = {None: day.end}
+        for child_name, schedule in schedules.items():
+            child_day = self._child_clock(schedule.child, switchover_time).state(now)
+            result["children"][child_name] = self._child_result(
+                child_name, schedule, child_day
+            )
+            boundaries[child_name] = child_day.end
+        # Drop what was kept for children that have been removed
+        for kept in (self._clocks, self._child_results, self._lookahead):
+            for child_name in kept.keys() - schedules.keys():
+                del kept[child_name]
+
+        self.usage.async_update(schedules, day.today)
+        self.checklist.async_roll_over(_first_days(result))
+        self.reminders.async_update(schedules, stored_data.get("reminders", []), now)
+        self.boundaries.async_update(boundaries)
+
+        self._async_cache_result(result)
         return result
 
-    def _get_switchover_time(self, switchover_str: str) -> time:
-        """Parse switchover time string to time object."""
-        try:
-            parts = switchover_str.split(":")
-            hour = int(parts[0])
-            minute = int(parts[1]) if len(parts) > 1 else 0
-            if 0 <= hour <= 23 and 0 <= minute <= 59:
-                return time(hour, minute)
-            return time(12, 0)
-        except (ValueError, IndexError, TypeError):
-            return time(12, 0)
-
-    def _is_showing_tomorrow(self, switchover_str: str) -> bool:
-        """Check if we should show tomorrow's schedule."""
-        now = dt_util.now()
-        switchover = self._get_switchover_time(switchover_str)
-        return now.time() >= switchover
+    def _child_clock(
+        self, child: dict[str, Any], switchover_time: str
+    ) -> ScheduleClock:
+        """Return a child's clock, set to its own settings or the household's."""
+        child_name = child.get("name", "Unknown")
+        clock = self._clocks.get(child_name)
+        if clock is None:
+            clock = self._clocks[child_name] = ScheduleClock()
+        clock.set_switchover(child.get("switchover_time") or switchover_time)
+        clock.set_time_zone(child.get("time_zone"))
+        return clock
+
+    def _child_result(
+        self, child_name: str, schedule: CompiledSchedule, day: DayState
+    ) -> dict[str, Any]:
+        """Return a child's computed entry, reusing it if nothing changed."""
+        kept = self._child_results.get(child_name)
+        if (
+            kept is not None
+            and kept[0] is schedule
+            and kept[1] == day.display_date
+            and kept[2] == day.is_tomorrow
+        ):
+            return kept[3]
+
+        child = schedule.child
+        entry = {
+            "name": child_name,
+            "items": child.get("items", []),
+            "items_today": schedule.items_for(day.display_date),
+            "upcoming": self._advance_lookahead(
+                child_name, schedule, day.display_date
+            ),
+            "weekly_schedule": child.get("weekly_schedule", {}),
+            "exceptions": child.get("exceptions", {}),
+            "display_date": day.display_date.isoformat(),
+            "is_tomorrow": day.is_tomorrow,
+            "switchover_time": child.get("switchover_time"),
+            "time_zone": child.get("time_zone"),
+        }
+        self._child_results[child_name] = (
+            schedule,
+            day.display_date,
+            day.is_tomorrow,
+            entry,
+        )
+        return entry
+
+    @callback
+    def _async_boundaries_passed(self, keys: set[str | None]) -> None:
+        """Move on the children whose displayed date has changed.
+
+        The household's boundary changes the shared display date, so it
+        refreshes everything; a child's own boundary recomputes only that
+        child.
+        """
+        if None in keys or not self.data or self._data is None:
+            self.hass.async_create_task(
+                self.async_refresh(), f"{DOMAIN} day boundary"
+            )
+            return
 
-    def _get_display_date(self, switchover_str: str) -> datetime:
-        """Get the date to display items for."""
         now = dt_util.now()
-        if self._is_showing_tomorrow(switchover_str):
-            return now + timedelta(days=1)
-        return now
-
-    def _get_items_for_date(
-        self, child: dict[str, Any], date: datetime, library: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
-        """Get the items needed for a specific date."""
-        date_str = date.strftime("%Y-%m-%d")
-        exceptions = child.get("exceptions", {})
-
-        # Check for exception first
-        if date_str in exceptions:
-            exception_item_ids = exceptions[date_str]
-            return self._get_items_by_ids(child, exception_item_ids, library)
-
-        # Use weekly schedule
-        day_name = DAYS_OF_WEEK[date.weekday()]
-        weekly_schedule = child.get("weekly_schedule", {})
-        item_ids = weekly_schedule.get(day_name, [])
-
-        return self._get_items_by_ids(child, item_ids, library)
-
-    def _get_items_by_ids(
-        self, child: dict[str, Any], item_ids: list[str], library: list[dict[str, Any]]
+        switchover_time = self._data.get("switchover_time", DEFAULT_SWITCHOVER_TIME)
+        children = dict(self.data["children"])
+        for child_name in keys:
+            schedule = self._compiled.get(child_name)
+            if schedule is None:
+                continue
+            day = self._child_clock(schedule.child, switchover_time).state(now)
+            children[child_name] = self._child_result(child_name, schedule, day)
+            self.boundaries.async_set(child_name, day.end)
+
+        result = {**self.data, "children": children}
+        self.checklist.async_roll_over(_first_days(result))
+        self._async_cache_result(result)
+        self.async_set_updated_data(result)
+
+    @callback
+    def _async_cache_result(self, result: dict[str, Any]) -> None:
+        """Remember the computed state for the next startup if it changed."""
+        cached = {
+            **result,
+            "display_date": result["display_date"].strftime("%Y-%m-%d"),
+        }
+        if cached == self._cached_result:
+            self.metrics.hit("state_cache")
+            return
+        self.metrics.miss("state_cache")
+        self._cached_result = cached
+        self.store.async_delay_save_cache(cached)
+
+    def _compile(self, data: dict[str, Any]) -> dict[str, CompiledSchedule]:
+        """Return compiled schedules for every child, reusing unchanged ones."""
+        library = data.get("item_library", [])
+        if self._items is None or not self._items.is_current(library):
+            self._items = ItemTable(library)
+        compiled: dict[str, CompiledSchedule] = {}
+        for child in data.get("children", []):
+            child_name = child.get("name", "Unknown")
+            schedule = self._compiled.get(child_name)
+            if schedule is None or not schedule.is_current(child, self._items):
+                schedule = CompiledSchedule(child, self._items)
+            compiled[child_name] = schedule
+        self._compiled = compiled
+        return compiled
+
+    def _advance_lookahead(
+        self, child_name: str, schedule: CompiledSchedule, start: date
     ) -> list[dict[str, Any]]:
-        """Get item details by their IDs from child items and library."""
-        # Build a map of all available items (child items + library)
-        child_items = child.get("items", [])
-        item_map = {item["id"]: item for item in child_items}
-        # Library items (don't overwrite child items with same ID)
-        for item in library:
-            if item["id"] not in item_map:
-                item_map[item["id"]] = item
-        return [item_map[item_id] for item_id in item_ids if item_id in item_map]
+        """Return a child's items for the lookahead window from start.
+
+        Windows are kept between refreshes. When the start moves on, days
+        that have passed are dropped and only the new days at the end are
+        resolved; a window is rebuilt only when the child's schedule changed.
+        """
+        previous = self._lookahead.get(child_name)
+        if previous is not None and previous[0] is schedule:
+            window = previous[1]
+            while window and window[0][0] < start:
+                window.popleft()
+            # The clock went backwards; nothing in the window lines up
+            if window and window[0][0] != start:
+                window.clear()
+        else:
+            window = deque()
+
+        day = window[-1][0] + timedelta(days=1) if window else start
+        while len(window) < self._lookahead_days:
+            window.append(
+                (
+                    day,
+                    {"date": day.isoformat(), "items": schedule.items_for(day)},
+                )
+            )
+            day += timedelta(days=1)
+        self._lookahead[child_name] = (schedule, window)
+        return [entry for _, entry in window]
+
+    async def async_get_document(self) -> dict[str, Any]:
+        """Return the current stored document.
+
+        Documents are replaced rather than modified, so callers may keep
+        and read it (off the event loop too) but must not change it.
+        """
+        return await self._async_load_data()
+
+    async def async_get_schedules(self) -> dict[str, CompiledSchedule]:
+        """Return the compiled schedule of every child."""
+        return self._compile(await self._async_load_data())
+
+    async def async_get_matrices(
+        self, start: date, end: date
+    ) -> dict[str, ScheduleMatrix]:
+        """Return every child's schedule matrix from start to end.
+
+        The last matrix for each child is kept, so asking about the same
+        range again costs nothing until that child's schedule changes, and
+        other ranges reuse its packed exceptions.
+        """
+        matrices: dict[str, ScheduleMatrix] = {}
+        for child_name, schedule in (await self.async_get_schedules()).items():
+            matrix = self._matrices.get(child_name)
+            if matrix is None or not matrix.is_current(schedule, start, end):
+                self.metrics.miss("schedule_matrix")
+                matrix = ScheduleMatrix(schedule, start, end, matrix)
+            else:
+                self.metrics.hit("schedule_matrix")
+            matrices[child_name] = matrix
+        self._matrices = matrices
+        return matrices
+
+    @callback
+    def async_add_child_entities(
+        self,
+        entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+        create: Callable[[str], list[Entity]],
+    ) -> None:
+        """Keep a platform's per-child entities in step with the children.
+
+        Entities are created for the children known now and for children
+        added later, on the update that first shows them. Those of a child
+        that is removed or renamed are removed from the entity registry
+        rather than left unavailable.
+        """
+        added: dict[str, list[Entity]] = {}
+
+        @callback
+        def _async_update_children() -> None:
+            if not self.data:
+                return
+            children = self.data.get("children", {})
+            new: list[Entity] = []
+            for child_name in children:
+                if child_name not in added:
+                    added[child_name] = create(child_name)
+                    new.extend(added[child_name])
+            if new:
+                async_add_entities(new)
+
+            registry = er.async_get(self.hass)
+            for child_name in [name for name in added if name not in children]:
+                for entity in added.pop(child_name):
+                    if entity.entity_id and registry.async_get(entity.entity_id):
+                        registry.async_remove(entity.entity_id)
+                    elif entity.hass is not None:
+                        self.hass.async_create_task(entity.async_remove())
+
+        _async_update_children()
+        entry.async_on_unload(self.async_add_listener(_async_update_children))
 
     def _find_child(
         self, data: dict[str, Any], child_name: str
@@ -146,23 +422,198 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 return child
         return None
 
+    def _scope_lock(self, child: str | None, library: bool) -> asyncio.Lock:
+        """Return the lock guarding one child, the library or the settings."""
+        scope = "library" if library else f"child:{child}" if child else "settings"
+        if (lock := self._locks.get(scope)) is None:
+            lock = self._locks[scope] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def _async_hold_scope(
+        self, child: str | None, library: bool, whole: bool
+    ) -> AsyncIterator[None]:
+        """Hold a change's scope until it is durable.
+
+        A scoped change only waits for changes to the same scope. A
+        whole-document change waits for every change in flight and holds
+        new ones off until it is done, so it is ordered against all of them.
+        """
+        if whole:
+            async with self._document_lock:
+                await self._scopes_idle.wait()
+                yield
+            return
+
+        async with self._document_lock:
+            self._scoped_changes += 1
+            self._scopes_idle.clear()
+        try:
+            async with self._scope_lock(child, library):
+                yield
+        finally:
+            self._scoped_changes -= 1
+            if not self._scoped_changes:
+                self._scopes_idle.set()
+
+    @staticmethod
+    def _copy_for_write(
+        current: dict[str, Any], child: str | None, library: bool
+    ) -> dict[str, Any]:
+        """Copy the parts of the document a modifier is allowed to change.
+
+        Everything outside the modifier's scope is shared with the current
+        snapshot, which readers may still be holding.
+        """
+        data = {**current, "children": list(current.get("children", []))}
+        if library:
+            data["item_library"] = copy.deepcopy(current.get("item_library", []))
+        if child is not None:
+            for index, existing in enumerate(data["children"]):
+                if existing.get("name") == child:
+                    data["children"][index] = copy.deepcopy(existing)
+                    break
+        return data
+
+    @staticmethod
+    def _revert_scope(
+        latest: dict[str, Any],
+        before: dict[str, Any],
+        child: str | None,
+        library: bool,
+    ) -> dict[str, Any]:
+        """Return latest with one scope put back as it was in before.
+
+        Changes to other scopes made since are kept.
+        """
+        if library:
+            return {**latest, "item_library": before.get("item_library", [])}
+        if child is None:
+            return {
+                **before,
+                "children": latest.get("children", []),
+                "item_library": latest.get("item_library", []),
+            }
+        children = [c for c in latest.get("children", []) if c.get("name") != child]
+        for index, previous in enumerate(before.get("children", [])):
+            if previous.get("name") == child:
+                children.insert(index, previous)
+                break
+        return {**latest, "children": children}
+
     async def _async_modify_data(
-        self, modifier: callable[[dict[str, Any]], None]
+        self,
+        modifier: Callable[[dict[str, Any]], None],
+        op: str,
+        *,
+        child: str | None = None,
+        library: bool = False,
+        whole: bool = False,
     ) -> None:
-        """Thread-safe data modification with lock."""
-        async with self._lock:
-            data = await self.store.async_load() or {
-                "children": [],
-                "item_library": [],
-                "switchover_time": DEFAULT_SWITCHOVER_TIME,
+        """Apply a modification as a copy-on-write snapshot.
+
+        The modifier runs on a copy of its scope (one child, the library,
+        the top-level settings, or with whole set the whole document) and
+        the new snapshot is swapped in without an await in between, so
+        readers never wait and never see a partial change. The scope is
+        held until the change is durable, which keeps edits to one child in
+        order while edits to different children are journaled concurrently.
+        A change that can't be journaled is taken back out of memory.
+
+        Entities are updated by a debounced refresh. Unless the await_refresh
+        option is off, the caller also waits for that refresh when it runs
+        straight away; otherwise it only waits for the change to be durable.
+        """
+        with self.metrics.time("modify_data"):
+            wait_start = perf_counter()
+            async with self._async_hold_scope(child, library, whole):
+                self.metrics.record("lock_wait", perf_counter() - wait_start)
+                current = await self._async_load_data()
+                data = self._copy_for_write(current, child, library)
+                modifier(data)
+                self._data = data
+                try:
+                    await self.store.async_append(op, current, data)
+                except Exception:
+                    # Changes to other scopes may have been swapped in on top
+                    self._data = (
+                        current
+                        if self._data is data
+                        else self._revert_scope(self._data, current, child, library)
+                    )
+                    self.store.async_revert(self._data)
+                    self.hass.async_create_background_task(
+                        self.async_request_refresh(), f"{DOMAIN} refresh"
+                    )
+                    raise
+            self.metrics.increment("refresh_requests")
+            if self._await_refresh:
+                await self.async_request_refresh()
+            else:
+                self.hass.async_create_background_task(
+                    self.async_request_refresh(), f"{DOMAIN} refresh"
+                )
+
+    async def async_restore(self, until: datetime) -> None:
+        """Restore the schedule to how it was at a point in time."""
+        restored = await self.store.async_load_at(until)
+        if restored is None:
+            raise HomeAssistantError(
+                f"No journaled state available for {until.isoformat()}"
+            )
+
+        def modifier(data: dict[str, Any]) -> None:
+            data.clear()
+            data.update(restored)
+            data.setdefault("item_library", [])
+            link_library_items(data)
+            _LOGGER.info("Restored schedule to %s", until.isoformat())
+
+        await self._async_modify_data(modifier, op="restore", whole=True)
+
+    async def async_import(self, document: dict[str, Any], merge: bool = False) -> None:
+        """Replace the whole document, or merge into it, as one change.
+
+        The document must have been checked with validate_document. When
+        merging, imported children and library items replace those with the
+        same name or ID and everything else is kept. Either way a document
+        without a switchover time keeps the current one.
+        """
+
+        def modifier(data: dict[str, Any]) -> None:
+            imported = document
+            if merge:
+                library = {item["id"]: item for item in data.get("item_library", [])}
+                library.update({item["id"]: item for item in document["item_library"]})
+                children = {c.get("name"): c for c in data.get("children", [])}
+                children.update({c["name"]: c for c in document["children"]})
+                # Existing schedules may refer to library items the import replaced
+                imported = validate_document(
+                    {
+                        "switchover_time": document.get(
+                            "switchover_time", data.get("switchover_time")
+                        ),
+                        "item_library": list(library.values()),
+                        "children": list(children.values()),
+                    }
+                )
+            # Reminders aren't part of the import format, so they are kept, as
+            # is the switchover time when the document leaves it out
+            kept = {
+                key: data[key]
+                for key in ("reminders", "switchover_time")
+                if data.get(key) and key not in imported
             }
-            # Ensure item_library exists
-            if "item_library" not in data:
-                data["item_library"] = []
-            modifier(data)
-            self._data = data
-            await self.store.async_save(data)
-        await self.async_refresh()
+            data.clear()
+            data.update(imported)
+            data.update(kept)
+            _LOGGER.info(
+                "Imported %d children and %d library items",
+                len(document["children"]),
+                len(document["item_library"]),
+            )
+
+        await self._async_modify_data(modifier, op="import", whole=True)
 
     async def async_add_child(self, name: str) -> None:
         """Add a new child."""
@@ -181,7 +632,7 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             )
             _LOGGER.info("Added child: %s", name)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="add_child", child=name)
 
     async def async_remove_child(self, name: str) -> None:
         """Remove a child."""
@@ -193,7 +644,7 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 raise HomeAssistantError(f"Child '{name}' not found")
             _LOGGER.info("Removed child: %s", name)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="remove_child", child=name)
 
     async def async_add_item(
         self, child_name: str, item_id: str, item_name: str, image: str
@@ -218,7 +669,7 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             )
             _LOGGER.info("Added item '%s' to child '%s'", item_name, child_name)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="add_item", child=child_name)
 
     async def async_remove_item(self, child_name: str, item_id: str) -> None:
         """Remove an item from a child."""
@@ -248,7 +699,7 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
             _LOGGER.info("Removed item '%s' from child '%s'", item_id, child_name)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="remove_item", child=child_name)
 
     async def async_update_item(
         self,
@@ -264,12 +715,19 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if not child:
                 raise HomeAssistantError(f"Child '{child_name}' not found")
 
+            library = {item.get("id"): item for item in data.get("item_library", [])}
             for item in child.get("items", []):
                 if item.get("id") == item_id:
-                    if item_name is not None:
-                        item["name"] = item_name
-                    if image is not None:
-                        item["image"] = image
+                    for field, value in (("name", item_name), ("image", image)):
+                        if value is None:
+                            continue
+                        # The library's own value clears the child's override
+                        if is_reference(item) and value == library.get(
+                            item_id, {}
+                        ).get(field):
+                            item.pop(field, None)
+                        else:
+                            item[field] = value
                     _LOGGER.info(
                         "Updated item '%s' for child '%s'", item_id, child_name
                     )
@@ -279,7 +737,7 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 f"Item '{item_id}' not found for child '{child_name}'"
             )
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="update_item", child=child_name)
 
     async def async_set_weekly_schedule(
         self, child_name: str, day: str, item_ids: list[str]
@@ -311,7 +769,73 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             child["weekly_schedule"][day] = list(item_ids)
             _LOGGER.info("Set %s schedule for '%s': %s", day, child_name, item_ids)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="set_weekly_schedule", child=child_name)
+
+    async def async_set_schedules(
+        self,
+        child_name: str,
+        weekly_schedule: dict[str, list[str]],
+        exceptions: dict[str, list[str] | None],
+    ) -> None:
+        """Apply several weekly schedule and exception changes as one edit.
+
+        Exceptions mapped to None are removed. The changes are validated
+        together, so either all of them are applied or none is.
+        """
+        invalid_days = set(weekly_schedule) - set(DAYS_OF_WEEK)
+        if invalid_days:
+            raise HomeAssistantError(
+                f"Invalid days: {', '.join(invalid_days)}. "
+                f"Must be one of: {', '.join(DAYS_OF_WEEK)}"
+            )
+        for date_str in exceptions:
+            try:
+                datetime.strptime(date_str, "%Y-%m-%d")
+            except ValueError as err:
+                raise HomeAssistantError(
+                    f"Invalid date format '{date_str}'. Use YYYY-MM-DD."
+                ) from err
+
+        def modifier(data: dict[str, Any]) -> None:
+            child = self._find_child(data, child_name)
+            if not child:
+                raise HomeAssistantError(f"Child '{child_name}' not found")
+
+            # Validate item IDs exist (in child's items OR shared library)
+            child_item_ids = {item.get("id") for item in child.get("items", [])}
+            library_item_ids = {item.get("id") for item in data.get("item_library", [])}
+            valid_ids = child_item_ids | library_item_ids
+            used_ids = set().union(
+                *weekly_schedule.values(),
+                *(ids for ids in exceptions.values() if ids),
+            )
+            invalid_ids = used_ids - valid_ids
+            if invalid_ids:
+                raise HomeAssistantError(
+                    f"Invalid item IDs for {child_name}: {', '.join(invalid_ids)}"
+                )
+
+            schedule = child.setdefault(
+                "weekly_schedule", {d: [] for d in DAYS_OF_WEEK}
+            )
+            for day, item_ids in weekly_schedule.items():
+                schedule[day] = list(item_ids)
+
+            child_exceptions = child.setdefault("exceptions", {})
+            for date_str, item_ids in exceptions.items():
+                if item_ids is None:
+                    child_exceptions.pop(date_str, None)
+                else:
+                    child_exceptions[date_str] = list(item_ids)
+
+            _LOGGER.info(
+                "Set schedules for '%s': %d days, %d exceptions",
+                child_name,
+                len(weekly_schedule),
+                len(exceptions),
+            )
+
+        await self._async_modify_data(modifier, op="set_schedules", child=child_name)
 
     async def async_add_exception(
         self, child_name: str, date_str: str, item_ids: list[str]
@@ -349,7 +873,62 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                 "Added exception for '%s' on %s: %s", child_name, date_str, item_ids
             )
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="add_exception", child=child_name)
+
+    async def async_add_exceptions(
+        self, exceptions: dict[str, dict[str, list[str]]]
+    ) -> None:
+        """Add exceptions for several children as one change.
+
+        exceptions maps child names to {date: item IDs}. Every child and
+        item ID is checked before anything is changed.
+        """
+        for dates in exceptions.values():
+            for date_str in dates:
+                try:
+                    datetime.strptime(date_str, "%Y-%m-%d")
+                except ValueError as err:
+                    raise HomeAssistantError(
+                        f"Invalid date format '{date_str}'. Use YYYY-MM-DD."
+                    ) from err
+
+        def modifier(data: dict[str, Any]) -> None:
+            children = data["children"]
+            index = {child.get("name"): i for i, child in enumerate(children)}
+            missing = set(exceptions) - set(index)
+            if missing:
+                raise HomeAssistantError(
+                    f"Children not found: {', '.join(sorted(missing))}"
+                )
+
+            library_item_ids = {item.get("id") for item in data.get("item_library", [])}
+            for child_name, dates in exceptions.items():
+                child = children[index[child_name]]
+                child_item_ids = {item.get("id") for item in child.get("items", [])}
+                invalid_ids = set().union(*dates.values()) - (
+                    child_item_ids | library_item_ids
+                )
+                if invalid_ids:
+                    raise HomeAssistantError(
+                        f"Invalid item IDs for {child_name}: {', '.join(invalid_ids)}"
+                    )
+                # Children are shared with the previous snapshot, so replace
+                # rather than modify them
+                children[index[child_name]] = {
+                    **child,
+                    "exceptions": {
+                        **child.get("exceptions", {}),
+                        **{date_str: list(ids) for date_str, ids in dates.items()},
+                    },
+                }
+
+            _LOGGER.info(
+                "Added %d exceptions for %d children",
+                sum(len(dates) for dates in exceptions.values()),
+                len(exceptions),
+            )
+
+        await self._async_modify_data(modifier, op="add_exceptions", whole=True)
 
     async def async_remove_exception(self, child_name: str, date_str: str) -> None:
         """Remove an exception."""
@@ -367,19 +946,164 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             del child["exceptions"][date_str]
             _LOGGER.info("Removed exception for '%s' on %s", child_name, date_str)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="remove_exception", child=child_name)
 
     async def async_set_switchover_time(self, switchover_time: str) -> None:
         """Set the switchover time."""
         # Validate time format
-        parsed = self._get_switchover_time(switchover_time)
+        parsed = parse_switchover(switchover_time)
         normalized = f"{parsed.hour:02d}:{parsed.minute:02d}"
 
         def modifier(data: dict[str, Any]) -> None:
             data["switchover_time"] = normalized
             _LOGGER.info("Set switchover time to %s", normalized)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="set_switchover_time")
+
+    async def async_set_child_switchover(
+        self,
+        child_name: str,
+        switchover_time: str | None = None,
+        time_zone: str | None = None,
+    ) -> None:
+        """Set a child's own switchover time and time zone.
+
+        None leaves a setting as it is; an empty string goes back to the
+        household's.
+        """
+        changes: dict[str, str] = {}
+        if switchover_time:
+            parsed = parse_switchover(switchover_time)
+            changes["switchover_time"] = f"{parsed.hour:02d}:{parsed.minute:02d}"
+        elif switchover_time is not None:
+            changes["switchover_time"] = ""
+        if time_zone and dt_util.get_time_zone(time_zone) is None:
+            raise HomeAssistantError(f"Unknown time zone '{time_zone}'")
+        if time_zone is not None:
+            changes["time_zone"] = time_zone
+
+        def modifier(data: dict[str, Any]) -> None:
+            child = self._find_child(data, child_name)
+            if not child:
+                raise HomeAssistantError(f"Child '{child_name}' not found")
+
+            for key, value in changes.items():
+                if value:
+                    child[key] = value
+                else:
+                    child.pop(key, None)
+            _LOGGER.info(
+                "Set switchover for '%s' to %s in %s",
+                child_name,
+                child.get("switchover_time", "the household's time"),
+                child.get("time_zone", "the household's time zone"),
+            )
+
+        await self._async_modify_data(
+            modifier, op="set_child_switchover", child=child_name
+        )
+
+    # Reminder methods
+
+    async def async_set_reminder(self, reminder: dict[str, Any]) -> None:
+        """Add a reminder, or replace the one with the same ID."""
+
+        def modifier(data: dict[str, Any]) -> None:
+            children = {child.get("name") for child in data.get("children", [])}
+            unknown = set(reminder.get("children", [])) - children
+            if unknown:
+                raise HomeAssistantError(
+                    f"Children not found: {', '.join(sorted(unknown))}"
+                )
+            # Items must be in the library or belong to a child reminded
+            valid_ids = {item.get("id") for item in data.get("item_library", [])}
+            for child in data.get("children", []):
+                if child.get("name") in reminder.get("children", children):
+                    valid_ids.update(item.get("id") for item in child.get("items", []))
+            invalid_ids = set(reminder.get("items", [])) - valid_ids
+            if invalid_ids:
+                raise ServiceValidationError(
+                    f"Invalid item IDs for reminder '{reminder['id']}': "
+                    f"{', '.join(sorted(invalid_ids))}"
+                )
+            # A new list, as the current one is shared with the last snapshot
+            data["reminders"] = [
+                *(r for r in data.get("reminders", []) if r["id"] != reminder["id"]),
+                reminder,
+            ]
+            _LOGGER.info("Set reminder '%s'", reminder["id"])
+
+        await self._async_modify_data(modifier, op="set_reminder")
+
+    async def async_remove_reminder(self, reminder_id: str) -> None:
+        """Remove a reminder."""
+
+        def modifier(data: dict[str, Any]) -> None:
+            reminders = data.get("reminders", [])
+            if not any(r["id"] == reminder_id for r in reminders):
+                raise HomeAssistantError(f"Reminder '{reminder_id}' not found")
+            data["reminders"] = [r for r in reminders if r["id"] != reminder_id]
+            _LOGGER.info("Removed reminder '%s'", reminder_id)
+
+        await self._async_modify_data(modifier, op="remove_reminder")
+
+    # Packing checklist methods
+
+    async def _async_packing_day(
+        self, child_name: str, day: date | None
+    ) -> tuple[CompiledSchedule, date]:
+        """Return a child's schedule and the date to pack for."""
+        data = await self._async_load_data()
+        schedule = self._compile(data).get(child_name)
+        if schedule is None:
+            raise HomeAssistantError(f"Child '{child_name}' not found")
+        first_day = self._child_clock(
+            schedule.child, data.get("switchover_time", DEFAULT_SWITCHOVER_TIME)
+        ).state().display_date
+        if day is None:
+            day = first_day
+        elif day < first_day:
+            raise HomeAssistantError(
+                f"Cannot pack for {day.isoformat()}, it is before {first_day.isoformat()}"
+            )
+        return schedule, day
+
+    async def async_set_packed(
+        self,
+        child_name: str,
+        item_id: str,
+        day: date | None = None,
+        packed: bool | None = None,
+    ) -> bool:
+        """Mark an item packed (or toggle it) for the displayed date or a later one.
+
+        Checklists live outside the stored document, so this neither saves
+        the document nor refreshes; only the child's entities update.
+        """
+        schedule, day = await self._async_packing_day(child_name, day)
+        if not any(item["id"] == item_id for item in schedule.items_for(day)):
+            raise HomeAssistantError(
+                f"Item '{item_id}' is not needed by '{child_name}' on {day.isoformat()}"
+            )
+        return self.checklist.async_set_packed(
+            child_name, day.isoformat(), item_id, packed
+        )
+
+    async def async_clear_packed(
+        self, child_names: list[str] | None = None, day: date | None = None
+    ) -> None:
+        """Unpack the children's items for a date, or for every date."""
+        schedules = self._compile(await self._async_load_data())
+        if child_names is None:
+            child_names = list(schedules)
+        elif unknown := set(child_names) - set(schedules):
+            raise HomeAssistantError(
+                f"Children not found: {', '.join(sorted(unknown))}"
+            )
+        for child_name in child_names:
+            self.checklist.async_clear(
+                child_name, day.isoformat() if day is not None else None
+            )
 
     # Item Library methods
 
@@ -403,22 +1127,44 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             data["item_library"] = library
             _LOGGER.info("Added library item: %s", item_name)
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="add_library_item", library=True)
 
     async def async_remove_library_item(self, item_id: str) -> None:
-        """Remove an item from the shared library."""
+        """Remove an item from the shared library.
+
+        Children it was assigned to keep their own copy of it.
+        """
 
         def modifier(data: dict[str, Any]) -> None:
             library = data.get("item_library", [])
-            original_count = len(library)
-            data["item_library"] = [i for i in library if i.get("id") != item_id]
-
-            if len(data["item_library"]) == original_count:
+            removed = next((i for i in library if i.get("id") == item_id), None)
+            if removed is None:
                 raise HomeAssistantError(f"Library item '{item_id}' not found")
+            data["item_library"] = [i for i in library if i is not removed]
+
+            def detach(item: dict[str, Any]) -> dict[str, Any]:
+                if not is_reference(item) or item.get("id") != item_id:
+                    return item
+                return {
+                    "id": item_id,
+                    **{
+                        field: item.get(field, removed.get(field, ""))
+                        for field in ITEM_FIELDS
+                    },
+                }
+
+            # Children are shared with the current snapshot, so replace them
+            for index, child in enumerate(data["children"]):
+                items = [detach(item) for item in child.get("items", [])]
+                if any(new is not old for new, old in zip(items, child.get("items", []))):
+                    data["children"][index] = {**child, "items": items}
 
             _LOGGER.info("Removed library item: %s", item_id)
 
-        await self._async_modify_data(modifier)
+        # Touches the library and the children using the item
+        await self._async_modify_data(
+            modifier, op="remove_library_item", whole=True
+        )
 
     async def async_update_library_item(
         self,
@@ -442,12 +1188,12 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
 
             raise HomeAssistantError(f"Library item '{item_id}' not found")
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="update_library_item", library=True)
 
     async def async_assign_library_item(
         self, child_name: str, item_id: str
     ) -> None:
-        """Assign a library item to a child (copies item to child's items)."""
+        """Assign a library item to a child by reference."""
 
         def modifier(data: dict[str, Any]) -> None:
             # Find the library item
@@ -472,15 +1218,11 @@ class SchoolScheduleCoordinator(DataUpdateCoordinator[dict[str, Any]]):
                     f"Item '{item_id}' already assigned to {child_name}"
                 )
 
-            # Copy the item to the child
-            child["items"].append({
-                "id": library_item["id"],
-                "name": library_item["name"],
-                "image": library_item["image"],
-            })
+            # Library edits show up for the child without touching it
+            child["items"].append({"id": library_item["id"], "library": True})
             _LOGGER.info(
                 "Assigned library item '%s' to child '%s'",
                 item_id, child_name
             )
 
-        await self._async_modify_data(modifier)
+        await self._async_modify_data(modifier, op="assign_library_item", child=child_name)
@@ -0,0 +1,42 @@
+"""Diagnostics support for School Schedule."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+
+from .const import DOMAIN
+from .coordinator import SchoolScheduleCoordinator
+from .sensor import build_state_attributes
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Only sizes, counts and timings are reported, never children's names or
+    their items.
+    """
+    coordinator: SchoolScheduleCoordinator = hass.data[DOMAIN][entry.entry_id]
+    document = await coordinator.async_get_document()
+    children = document.get("children", [])
+
+    return {
+        "metrics": coordinator.metrics.as_dict(),
+        "document": {
+            "bytes": len(json_bytes(document)),
+            "children": len(children),
+            "child_items": sum(len(c.get("items", [])) for c in children),
+            "library_items": len(document.get("item_library", [])),
+            "exceptions": sum(len(c.get("exceptions", {})) for c in children),
+            "journal_seq": coordinator.store.seq,
+        },
+        "state_attributes_bytes": (
+            len(json_bytes(build_state_attributes(coordinator.data)))
+            if coordinator.data
+            else 0
+        ),
+    }
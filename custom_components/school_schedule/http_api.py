@@ -1,16 +1,45 @@
 """HTTP API for School Schedule integration."""
 from __future__ import annotations
 
+import asyncio
+import hmac
 import logging
+import math
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from time import monotonic, perf_counter
+from typing import IO, TYPE_CHECKING
 
 from aiohttp import web
 
-from homeassistant.components.http import HomeAssistantView
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
+from homeassistant.components.http import (
+    KEY_AUTHENTICATED,
+    KEY_HASS_USER,
+    HomeAssistantView,
+)
+from homeassistant.components.http.ban import (
+    process_success_login,
+    process_wrong_login,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_FEED_TOKEN,
+    CONF_UPLOAD_RATE_LIMIT,
+    DEFAULT_UPLOAD_RATE_LIMIT,
+    DOMAIN,
+    IMPORT_DIR,
+    MIN_FEED_TOKEN_LENGTH,
+)
+from .ics import build_calendar
+from .metrics import SchoolScheduleMetrics
+
+if TYPE_CHECKING:
+    from .coordinator import SchoolScheduleCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,31 +49,166 @@ ALLOWED_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp"}
 # Max file size (5MB)
 MAX_FILE_SIZE = 5 * 1024 * 1024
 
+# School calendars for school_schedule.import_ics
+CALENDAR_EXTENSIONS = {".ics"}
+MAX_CALENDAR_SIZE = 15 * 1024 * 1024
+
+# Threads reading and writing uploaded files, kept apart from Home
+# Assistant's shared executor
+UPLOAD_WORKERS = 2
+# Uploads handled at once
+UPLOAD_SLOTS = 4
+# Uploads waiting for a slot; further uploads are refused with 429 straight away
+UPLOAD_QUEUE = 16
+# Seconds a refused client is asked to wait before trying again
+UPLOAD_RETRY_AFTER = 2
+# Window for the per-user upload rate limit
+RATE_LIMIT_WINDOW = 60
+# Allowance for the multipart framing around an uploaded file
+MULTIPART_OVERHEAD = 64 * 1024
+
+# hass.data keys: set once the views are registered (they can't be removed,
+# so they outlive reloads), and the upload pool while the entry is loaded
+DATA_VIEWS = f"{DOMAIN}_views"
+DATA_UPLOAD_EXECUTOR = f"{DOMAIN}_upload_executor"
+
 
 class SchoolScheduleUploadView(HomeAssistantView):
-    """Handle image uploads for school schedule items."""
+    """Handle image uploads for school schedule items.
+
+    Images (and small calendars) are posted to /api/school_schedule/upload
+    and school calendars to /api/school_schedule/upload/calendar, so a
+    request's size is checked against the limit for its kind before any of
+    it is read. Files are read and written on a small pool of its own, and
+    only UPLOAD_SLOTS uploads are handled at once, with up to UPLOAD_QUEUE
+    more waiting for a slot. Uploads beyond that, or beyond a user's rate
+    limit, get 429 with Retry-After. While the integration is unloaded the
+    pool is stopped and uploads get 503.
+    """
 
     url = "/api/school_schedule/upload"
+    extra_urls = ["/api/school_schedule/upload/{kind:calendar}"]
     name = "api:school_schedule:upload"
     requires_auth = True
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the view."""
         self._hass = hass
-
-    async def post(self, request: web.Request) -> web.Response:
+        self._slots = asyncio.Semaphore(UPLOAD_SLOTS)
+        self._waiting = 0
+        # user ID -> monotonic times of their uploads within the window
+        self._recent: dict[str, deque[float]] = {}
+
+    def _coordinator(self) -> SchoolScheduleCoordinator | None:
+        """Return the coordinator of the first configured entry."""
+        for coordinator in self._hass.data.get(DOMAIN, {}).values():
+            return coordinator
+        return None
+
+    def _metrics(self) -> SchoolScheduleMetrics | None:
+        """Return the metrics of the first configured entry."""
+        if (coordinator := self._coordinator()) is not None:
+            return coordinator.metrics
+        return None
+
+    def _rate_limited(self, user_id: str) -> int | None:
+        """Count an upload, or return seconds to wait if over the limit."""
+        coordinator = self._coordinator()
+        limit = (
+            coordinator.config_entry.options.get(
+                CONF_UPLOAD_RATE_LIMIT, DEFAULT_UPLOAD_RATE_LIMIT
+            )
+            if coordinator is not None
+            else DEFAULT_UPLOAD_RATE_LIMIT
+        )
+        if not limit:
+            return None
+
+        now = monotonic()
+        # Forget users (and uploads) outside the window
+        for uid in list(self._recent):
+            times = self._recent[uid]
+            while times and times[0] <= now - RATE_LIMIT_WINDOW:
+                times.popleft()
+            if not times:
+                del self._recent[uid]
+
+        times = self._recent.setdefault(user_id, deque())
+        if len(times) >= limit:
+            return max(1, math.ceil(times[-limit] + RATE_LIMIT_WINDOW - now))
+        times.append(now)
+        return None
+
+    def _refuse(self, reason: str, retry_after: int) -> web.Response:
+        """Return 429 asking the client to try again later."""
+        if (metrics := self._metrics()) is not None:
+            metrics.increment(f"upload_{reason}")
+        return web.json_response(
+            {"success": False, "error": "Too many uploads, try again shortly"},
+            status=429,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    async def post(
+        self, request: web.Request, kind: str | None = None
+    ) -> web.Response:
         """Handle POST request for image upload."""
+        max_size = MAX_CALENDAR_SIZE if kind == "calendar" else MAX_FILE_SIZE
+        if (
+            request.content_length is not None
+            and request.content_length > max_size + MULTIPART_OVERHEAD
+        ):
+            return web.json_response(
+                {
+                    "success": False,
+                    "error": f"File too large (max {max_size // (1024 * 1024)}MB)",
+                },
+                status=413,
+            )
+        executor: ThreadPoolExecutor | None = self._hass.data.get(
+            DATA_UPLOAD_EXECUTOR
+        )
+        if executor is None:
+            return web.json_response(
+                {"success": False, "error": "School Schedule is not loaded"},
+                status=503,
+            )
+        # Refuse before reading anything once the queue is full
+        if self._slots.locked() and self._waiting >= UPLOAD_QUEUE:
+            return self._refuse("busy", UPLOAD_RETRY_AFTER)
+        user = request.get(KEY_HASS_USER)
+        if (
+            user is not None
+            and (retry_after := self._rate_limited(user.id)) is not None
+        ):
+            return self._refuse("rate_limited", retry_after)
+
+        start = perf_counter()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            if (metrics := self._metrics()) is not None:
+                metrics.record("upload_wait", perf_counter() - start)
+            response = await self._async_handle_upload(
+                request, kind == "calendar", executor
+            )
+        finally:
+            self._slots.release()
+            if (metrics := self._metrics()) is not None:
+                metrics.record("upload", perf_counter() - start)
+        return response
+
+    async def _async_handle_upload(
+        self,
+        request: web.Request,
+        calendar_route: bool,
+        executor: ThreadPoolExecutor,
+    ) -> web.Response:
+        """Validate and store an uploaded image or school calendar."""
         try:
-            # Get the www directory
-            www_dir = Path(self._hass.config.path("www"))
-            school_schedule_dir = www_dir / "school-schedule"
-
-            # Create directory if it doesn't exist
-            if not school_schedule_dir.exists():
-                await self._hass.async_add_executor_job(
-                    school_schedule_dir.mkdir, True, True
-                )
-
             # Read the entire post data
             data = await request.post()
 
@@ -67,44 +231,62 @@ class SchoolScheduleUploadView(HomeAssistantView):
 
             # Validate file extension
             ext = Path(filename).suffix.lower()
-            if ext not in ALLOWED_EXTENSIONS:
+            is_calendar = ext in CALENDAR_EXTENSIONS
+            allowed = (
+                CALENDAR_EXTENSIONS
+                if calendar_route
+                else ALLOWED_EXTENSIONS | CALENDAR_EXTENSIONS
+            )
+            if ext not in allowed:
                 return web.json_response(
-                    {"success": False, "error": f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"},
+                    {"success": False, "error": f"Invalid file type. Allowed: {', '.join(allowed)}"},
                     status=400
                 )
 
-            # Read file content
-            content = file_field.file.read()
+            # Read file content (one byte over the limit shows it's too big);
+            # only the calendar route takes calendars larger than an image
+            max_size = MAX_CALENDAR_SIZE if calendar_route else MAX_FILE_SIZE
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(
+                executor, file_field.file.read, max_size + 1
+            )
 
             # Check file size
-            if len(content) > MAX_FILE_SIZE:
+            if len(content) > max_size:
                 return web.json_response(
-                    {"success": False, "error": "File too large (max 5MB)"},
+                    {"success": False, "error": f"File too large (max {max_size // (1024 * 1024)}MB)"},
                     status=400
                 )
 
+            # Images are served from www/, calendars stay private
+            if is_calendar:
+                school_schedule_dir = Path(self._hass.config.path(IMPORT_DIR))
+            else:
+                school_schedule_dir = Path(self._hass.config.path("www")) / "school-schedule"
+
             # Sanitize filename - only allow alphanumeric, dash, underscore
             safe_name = re.sub(r"[^a-zA-Z0-9_-]", "_", Path(filename).stem)
-            safe_filename = f"{safe_name}{ext}"
 
             # Save file
-            file_path = school_schedule_dir / safe_filename
-
-            # If file exists, add a number suffix
-            counter = 1
-            while file_path.exists():
-                safe_filename = f"{safe_name}_{counter}{ext}"
-                file_path = school_schedule_dir / safe_filename
-                counter += 1
-
-            await self._hass.async_add_executor_job(
-                self._write_file, file_path, content
+            file_path = await loop.run_in_executor(
+                executor,
+                self._write_file,
+                school_schedule_dir,
+                safe_name,
+                ext,
+                content,
             )
+            safe_filename = file_path.name
 
-            # Return the local path for HA
-            local_path = f"/local/school-schedule/{safe_filename}"
+            # Return the local path for HA (calendars: the path for import_ics)
+            if is_calendar:
+                local_path = str(file_path)
+            else:
+                local_path = f"/local/school-schedule/{safe_filename}"
 
-            _LOGGER.info("Uploaded image: %s (%d bytes)", local_path, len(content))
+            _LOGGER.info("Uploaded file: %s (%d bytes)", local_path, len(content))
+            if (metrics := self._metrics()) is not None:
+                metrics.increment("upload_bytes", len(content))
 
             return web.json_response({
                 "success": True,
@@ -120,12 +302,140 @@ class SchoolScheduleUploadView(HomeAssistantView):
             )
 
     @staticmethod
-    def _write_file(path: Path, content: bytes) -> None:
-        """Write file to disk."""
-        with open(path, "wb") as f:
-            f.write(content)
+    def _write_file(directory: Path, stem: str, ext: str, content: bytes) -> Path:
+        """Write file to disk, adding a number suffix if the name is taken."""
+        directory.mkdir(parents=True, exist_ok=True)
+        counter = 0
+        while True:
+            path = directory / (f"{stem}_{counter}{ext}" if counter else f"{stem}{ext}")
+            try:
+                # Exclusive create, so two uploads can't claim the same name
+                with open(path, "xb") as f:
+                    f.write(content)
+            except FileExistsError:
+                counter += 1
+            else:
+                return path
+
+
+class SchoolScheduleCalendarFeedView(HomeAssistantView):
+    """Serve the schedule as an ICS feed for calendar apps.
+
+    The household feed is at /api/school_schedule/calendar.ics and each
+    child's at /api/school_schedule/calendar/<name>.ics. Requests need a
+    Home Assistant login, or ?token= matching the generated feed token.
+    Refused requests count as failed logins for Home Assistant's IP bans.
+    """
+
+    url = "/api/school_schedule/calendar.ics"
+    extra_urls = ["/api/school_schedule/calendar/{child}.ics"]
+    name = "api:school_schedule:calendar"
+    # Calendar apps can't log in, so authentication is checked in get()
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self._hass = hass
+        # child (None for the household) -> (document seq, rendered feed)
+        self._cache: dict[str | None, tuple[int, bytes]] = {}
+
+    def _coordinator(self) -> SchoolScheduleCoordinator | None:
+        """Return the coordinator of the first configured entry."""
+        for coordinator in self._hass.data.get(DOMAIN, {}).values():
+            return coordinator
+        return None
+
+    def _authorized(
+        self, request: web.Request, coordinator: SchoolScheduleCoordinator
+    ) -> bool:
+        """Check the request has a login or the feed token."""
+        if request.get(KEY_AUTHENTICATED, False):
+            return True
+        token = coordinator.config_entry.options.get(CONF_FEED_TOKEN) or ""
+        given = request.query.get("token")
+        # Short tokens typed in by older versions could be guessed
+        return (
+            len(token) >= MIN_FEED_TOKEN_LENGTH
+            and given is not None
+            and hmac.compare_digest(token.encode(), given.encode())
+        )
+
+    async def get(self, request: web.Request, child: str | None = None) -> web.Response:
+        """Return the feed, or 304 if the client's copy is current."""
+        coordinator = self._coordinator()
+        if coordinator is None:
+            return web.Response(status=404)
+        if not self._authorized(request, coordinator):
+            await process_wrong_login(request)
+            return web.Response(status=401)
+        process_success_login(request)
+
+        schedules = await coordinator.async_get_schedules()
+        if child is not None and child not in schedules:
+            return web.Response(status=404)
+
+        seq = coordinator.store.seq
+        modified = (
+            coordinator.store.last_modified or dt_util.utcnow()
+        ).replace(microsecond=0)
+        etag = f"{coordinator.config_entry.entry_id[:8]}-{seq}"
+        headers = {"Cache-Control": "private, max-age=300"}
+
+        if request.if_none_match:
+            not_modified = any(tag.value == etag for tag in request.if_none_match)
+        else:
+            since = request.if_modified_since
+            not_modified = since is not None and modified <= since
+        if not_modified:
+            coordinator.metrics.hit("calendar_feed")
+            response = web.Response(status=304, headers=headers)
+            response.etag = etag
+            return response
+        coordinator.metrics.miss("calendar_feed")
+
+        cached = self._cache.get(child)
+        if cached is None or cached[0] != seq:
+            body = build_calendar(
+                coordinator.config_entry.entry_id,
+                f"{child} School Schedule" if child else "School Schedule",
+                [schedules[child]] if child else list(schedules.values()),
+                dt_util.as_utc(modified),
+            )
+            self._cache[child] = cached = (seq, body)
+
+        response = web.Response(
+            body=cached[1],
+            content_type="text/calendar",
+            charset="utf-8",
+            headers=headers,
+        )
+        response.etag = etag
+        response.last_modified = modified
+        return response
 
 
 async def async_setup_http(hass: HomeAssistant) -> None:
-    """Set up HTTP endpoints."""
+    """Start the upload pool, and register HTTP endpoints the first time."""
+    if DATA_UPLOAD_EXECUTOR not in hass.data:
+        hass.data[DATA_UPLOAD_EXECUTOR] = ThreadPoolExecutor(
+            max_workers=UPLOAD_WORKERS, thread_name_prefix=f"{DOMAIN}_upload"
+        )
+    if hass.data.get(DATA_VIEWS):
+        return
+    hass.data[DATA_VIEWS] = True
+
+    @callback
+    def _async_shutdown(event: Event) -> None:
+        async_unload_http(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_shutdown)
     hass.http.register_view(SchoolScheduleUploadView(hass))
+    hass.http.register_view(SchoolScheduleCalendarFeedView(hass))
+
+
+@callback
+def async_unload_http(hass: HomeAssistant) -> None:
+    """Stop the upload pool; the views stay, answering 503 and 404."""
+    executor: ThreadPoolExecutor | None = hass.data.pop(DATA_UPLOAD_EXECUTOR, None)
+    if executor is not None:
+        executor.shutdown(wait=False)
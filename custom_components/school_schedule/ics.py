@@ -0,0 +1,331 @@
+"""iCalendar (RFC 5545) export and import for School Schedule.
+
+Each child's weekly schedule becomes one recurring all-day event per
+distinct set of items (days sharing the same items share a BYDAY rule).
+Exceptions are expressed against those series: an EXDATE drops the regular
+day, an RDATE adds a date to the series with the same items, and only
+exceptions whose items match no series become single events. The feed
+stays a handful of events however far ahead a client looks.
+
+Importing goes the other way for school calendars: events are read one at
+a time from the file and matched against keyword rules to produce
+exceptions.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .schedule import CompiledSchedule
+
+PRODID = "-//School Schedule//Home Assistant//EN"
+
+# Recurrences start here so the feed doesn't change as days go by
+SERIES_START = date(2024, 1, 1)
+
+ICAL_DAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+_ESCAPED = re.compile(r"\\([\\;,nN])")
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line to 75 octets."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line
+    parts: list[str] = []
+    start = 0
+    limit = 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Don't split a UTF-8 sequence
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(encoded[start:end].decode())
+        start = end
+        limit = 74  # continuation lines start with a space
+    return "\r\n ".join(parts)
+
+
+def _date(value: date) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def _uid(*parts: str) -> str:
+    digest = hashlib.sha1("/".join(parts).encode()).hexdigest()[:16]
+    return f"{digest}@school_schedule"
+
+
+def _event(
+    lines: list[str],
+    uid: str,
+    stamp: str,
+    start: date,
+    child_name: str,
+    items: list[dict[str, Any]],
+    extra: list[str],
+) -> None:
+    names = ", ".join(item.get("name", "") for item in items)
+    lines.extend(
+        [
+            "BEGIN:VEVENT",
+            f"UID:{uid}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{_date(start)}",
+            f"DTEND;VALUE=DATE:{_date(start + timedelta(days=1))}",
+            f"SUMMARY:{_escape(f'{child_name}: {names}')}",
+            f"DESCRIPTION:{_escape(f'Items needed: {names}')}",
+            "TRANSP:TRANSPARENT",
+            *extra,
+            "END:VEVENT",
+        ]
+    )
+
+
+def _child_events(
+    lines: list[str], uid_base: str, stamp: str, schedule: CompiledSchedule
+) -> None:
+    """Add the events for one child."""
+
+    def key(items: list[dict[str, Any]]) -> tuple[str, ...]:
+        return tuple(item["id"] for item in items)
+
+    # Weekdays grouped by the items they need
+    series: dict[tuple[str, ...], list[int]] = {}
+    for weekday, items in enumerate(schedule.weekly):
+        if items:
+            series.setdefault(key(items), []).append(weekday)
+
+    exdates: dict[tuple[str, ...], list[date]] = {k: [] for k in series}
+    rdates: dict[tuple[str, ...], list[date]] = {k: [] for k in series}
+    single: list[tuple[date, list[dict[str, Any]]]] = []
+    for date_str, items in sorted(schedule.exceptions.items()):
+        day = date.fromisoformat(date_str)
+        regular = key(schedule.weekly[day.weekday()])
+        override = key(items)
+        if override == regular:
+            continue
+        if regular in series and day >= SERIES_START:
+            exdates[regular].append(day)
+        if not items:
+            continue
+        if override in series:
+            rdates[override].append(day)
+        else:
+            single.append((day, items))
+
+    for item_ids, weekdays in series.items():
+        # SERIES_START is a Monday, so this is the first matching weekday
+        start = SERIES_START + timedelta(days=weekdays[0])
+        extra = [
+            "RRULE:FREQ=WEEKLY;BYDAY=" + ",".join(ICAL_DAYS[d] for d in weekdays)
+        ]
+        if exdates[item_ids]:
+            extra.append(
+                "EXDATE;VALUE=DATE:" + ",".join(_date(d) for d in exdates[item_ids])
+            )
+        if rdates[item_ids]:
+            extra.append(
+                "RDATE;VALUE=DATE:" + ",".join(_date(d) for d in rdates[item_ids])
+            )
+        _event(
+            lines,
+            _uid(uid_base, schedule.name, "weekly", *item_ids),
+            stamp,
+            start,
+            schedule.name,
+            schedule.weekly[weekdays[0]],
+            extra,
+        )
+
+    for day, items in single:
+        _event(
+            lines,
+            _uid(uid_base, schedule.name, day.isoformat()),
+            stamp,
+            day,
+            schedule.name,
+            items,
+            [],
+        )
+
+
+def build_calendar(
+    uid_base: str,
+    name: str,
+    schedules: list[CompiledSchedule],
+    modified: datetime,
+) -> bytes:
+    """Render children's schedules as an iCalendar document."""
+    stamp = modified.strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        f"X-WR-CALNAME:{_escape(name)}",
+    ]
+    for schedule in schedules:
+        _child_events(lines, uid_base, stamp, schedule)
+    lines.append("END:VCALENDAR")
+    return ("\r\n".join(_fold(line) for line in lines) + "\r\n").encode()
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """Join folded content lines back together."""
+    current: str | None = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _unescape(text: str) -> str:
+    """Undo TEXT escaping."""
+    return _ESCAPED.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), text)
+
+
+def _parse_when(params: str, value: str) -> date | datetime | None:
+    """Parse a DTSTART/DTEND value into a date or an aware datetime."""
+    try:
+        if "VALUE=DATE" in params.upper().split(";") or len(value) == 8:
+            return datetime.strptime(value[:8], "%Y%m%d").date()
+        parsed = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    if value.endswith("Z"):
+        return parsed.replace(tzinfo=dt_util.UTC)
+    tz = None
+    for param in params.split(";"):
+        if param.upper().startswith("TZID="):
+            tz = dt_util.get_time_zone(param[5:].strip('"'))
+    return parsed.replace(tzinfo=tz or dt_util.DEFAULT_TIME_ZONE)
+
+
+def iter_events(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Yield VEVENTs from iCalendar lines without reading the whole file.
+
+    Each event is a dict with summary, description, start, end and
+    recurring (whether it has an RRULE or RDATE). Properties of components
+    nested in an event, such as a VALARM's DESCRIPTION, are skipped.
+    """
+    event: dict[str, Any] | None = None
+    # Components open inside the current event
+    nested = 0
+    for line in _unfold(lines):
+        name, _, value = line.partition(":")
+        name, _, params = name.partition(";")
+        name = name.upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {"summary": "", "description": "", "recurring": False}
+            nested = 0
+        elif event is None:
+            continue
+        elif name == "BEGIN":
+            nested += 1
+        elif nested:
+            if name == "END":
+                nested -= 1
+        elif name == "END" and value.upper() == "VEVENT":
+            if event.get("start") is not None:
+                yield event
+            event = None
+        elif name in ("SUMMARY", "DESCRIPTION"):
+            event[name.lower()] = _unescape(value)
+        elif name == "DTSTART":
+            event["start"] = _parse_when(params, value)
+        elif name == "DTEND":
+            event["end"] = _parse_when(params, value)
+        elif name in ("RRULE", "RDATE"):
+            event["recurring"] = True
+
+
+def _event_dates(event: dict[str, Any]) -> list[date]:
+    """Return the local dates an event covers."""
+    start = event["start"]
+    end = event.get("end")
+    if isinstance(start, datetime):
+        start_day = dt_util.as_local(start).date()
+        if isinstance(end, datetime) and end > start:
+            # An event ending at midnight doesn't cover the next day
+            last_day = dt_util.as_local(end - timedelta(microseconds=1)).date()
+        else:
+            last_day = start_day
+    else:
+        start_day = start
+        # All-day DTEND is exclusive
+        last_day = end - timedelta(days=1) if isinstance(end, date) and end > start else start
+    return [
+        start_day + timedelta(days=offset)
+        for offset in range((last_day - start_day).days + 1)
+    ]
+
+
+def read_exceptions(
+    path: Path, rules: list[dict[str, Any]], since: date | None
+) -> tuple[dict[str, list[str]], dict[str, int]]:
+    """Map the events in an ICS file to exceptions using keyword rules.
+
+    A rule matches when any of its keywords appears (ignoring case) in the
+    event's summary or description; the first matching rule wins. When
+    several events fall on one date their items are combined, except that
+    a rule with no items (a day off) overrides everything else that day.
+    Returns {date: item IDs} and counts of what was read.
+    """
+    exceptions: dict[str, list[str]] = {}
+    days_off: set[str] = set()
+    counts = {"events": 0, "matched": 0, "recurring_skipped": 0}
+    keywords = [[keyword.lower() for keyword in rule["keyword"]] for rule in rules]
+
+    with path.open(encoding="utf-8", errors="replace") as ics_file:
+        for event in iter_events(ics_file):
+            counts["events"] += 1
+            if event["recurring"]:
+                counts["recurring_skipped"] += 1
+                continue
+            text = f"{event['summary']}\n{event['description']}".lower()
+            rule = next(
+                (
+                    rule
+                    for rule, words in zip(rules, keywords)
+                    if any(word in text for word in words)
+                ),
+                None,
+            )
+            if rule is None:
+                continue
+            counts["matched"] += 1
+            for day in _event_dates(event):
+                if since is not None and day < since:
+                    continue
+                date_str = day.isoformat()
+                if not rule["item_ids"]:
+                    days_off.add(date_str)
+                    exceptions[date_str] = []
+                elif date_str not in days_off:
+                    items = exceptions.setdefault(date_str, [])
+                    items.extend(i for i in rule["item_ids"] if i not in items)
+
+    return exceptions, counts
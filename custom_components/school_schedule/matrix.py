@@ -0,0 +1,208 @@
+"""Bit-packed schedule matrices for School Schedule.
+
+A child's schedule over a date range is held as one integer per item, with
+bit i set when the item is needed start + i days. The weekly schedule is
+laid down for the whole range with a single multiplication, and exceptions
+are packed into bits once per schedule and shifted into place, so building
+a matrix costs about the same for a week as for ten years. Counting days and
+finding runs of days are then bitwise operations over the whole range.
+"""
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from datetime import date, timedelta
+from itertools import combinations
+from typing import Any
+
+from .schedule import CompiledSchedule
+
+WEEK_MASK = 0x7F
+
+# Pairs of items needed together reported per child
+TOGETHER_LIMIT = 10
+
+
+def _longest_run(bits: int) -> int:
+    """Return the length of the longest run of set bits."""
+    run = 0
+    while bits:
+        bits &= bits >> 1
+        run += 1
+    return run
+
+
+def _pack(indexes: Iterable[int], size: int) -> int:
+    """Return an integer with the given bits set."""
+    packed = bytearray((size + 7) // 8)
+    for index in indexes:
+        packed[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(packed, "little")
+
+
+class _ExceptionBits:
+    """A schedule's exceptions as bits counted from its first exception."""
+
+    def __init__(self, schedule: CompiledSchedule) -> None:
+        dated = sorted(
+            (date.fromisoformat(date_str).toordinal(), items)
+            for date_str, items in schedule.exceptions.items()
+        )
+        self.ordinals = [ordinal for ordinal, _ in dated]
+        self.item_ids = [
+            list(dict.fromkeys(item["id"] for item in items)) for _, items in dated
+        ]
+        self.items: dict[str, dict[str, Any]] = {}
+        for _, items in dated:
+            for item in items:
+                self.items.setdefault(item["id"], item)
+
+        self.epoch = self.ordinals[0] if dated else 0
+        size = self.ordinals[-1] - self.epoch + 1 if dated else 0
+        self.days = _pack((ordinal - self.epoch for ordinal in self.ordinals), size)
+        indexes: dict[str, list[int]] = {}
+        for ordinal, item_ids in zip(self.ordinals, self.item_ids):
+            for item_id in item_ids:
+                indexes.setdefault(item_id, []).append(ordinal - self.epoch)
+        self.rows = {item_id: _pack(days, size) for item_id, days in indexes.items()}
+
+    def window(self, bits: int, start: int, days: int) -> int:
+        """Return bits for the days from ordinal start."""
+        offset = start - self.epoch
+        bits = bits >> offset if offset >= 0 else bits << -offset
+        return bits & ((1 << days) - 1)
+
+    def between(self, start: int, end: int) -> list[list[str]]:
+        """Return the items of each exception from ordinal start to end."""
+        return self.item_ids[
+            bisect_left(self.ordinals, start) : bisect_right(self.ordinals, end)
+        ]
+
+
+class ScheduleMatrix:
+    """One child's items by day over a date range."""
+
+    def __init__(
+        self,
+        schedule: CompiledSchedule,
+        start: date,
+        end: date,
+        previous: ScheduleMatrix | None = None,
+    ) -> None:
+        """Lay out a compiled schedule from start to end (inclusive).
+
+        A previous matrix of the same schedule lends its packed exceptions.
+        """
+        # Kept to tell whether a later schedule still matches this one
+        self.schedule = schedule
+        self.start = start
+        self.end = end
+        self.days = (end - start).days + 1
+        self._stats: dict[str, Any] | None = None
+        if previous is not None and previous.schedule is schedule:
+            self._exceptions = previous._exceptions
+        else:
+            self._exceptions = _ExceptionBits(schedule)
+
+        # Items by weekday, the first being the start's weekday
+        shift = start.weekday()
+        self._weekdays: list[list[str]] = [
+            list(dict.fromkeys(item["id"] for item in schedule.weekly[(shift + k) % 7]))
+            for k in range(7)
+        ]
+        self.items: dict[str, dict[str, Any]] = {}
+        for items in schedule.weekly:
+            for item in items:
+                self.items.setdefault(item["id"], item)
+        for item_id, item in self._exceptions.items.items():
+            self.items.setdefault(item_id, item)
+
+        # One bit at the start of every week in the range
+        every_week = ((1 << (7 * -(-self.days // 7))) - 1) // WEEK_MASK
+        first = start.toordinal()
+        regular_days = ((1 << self.days) - 1) & ~self._exceptions.window(
+            self._exceptions.days, first, self.days
+        )
+        # Regular (non-exception) days falling on each weekday
+        self._weekday_counts = [
+            (regular_days & (every_week << k)).bit_count() for k in range(7)
+        ]
+
+        weekly: dict[str, int] = {}
+        for k, item_ids in enumerate(self._weekdays):
+            for item_id in item_ids:
+                weekly[item_id] = weekly.get(item_id, 0) | (1 << k)
+        self.rows: dict[str, int] = {}
+        for item_id in self.items:
+            bits = (weekly.get(item_id, 0) * every_week) & regular_days
+            if item_id in self._exceptions.rows:
+                bits |= self._exceptions.window(
+                    self._exceptions.rows[item_id], first, self.days
+                )
+            if bits:
+                self.rows[item_id] = bits
+
+    def is_current(self, schedule: CompiledSchedule, start: date, end: date) -> bool:
+        """Return True if laid out from this schedule over this range."""
+        return schedule is self.schedule and start == self.start and end == self.end
+
+    def _date(self, index: int) -> str:
+        return (self.start + timedelta(days=index)).isoformat()
+
+    def _together(self) -> list[dict[str, Any]]:
+        """Return the pairs of items most often needed on the same day.
+
+        Pairs are counted per weekday (weighted by the number of regular
+        days on it) and per exception day, rather than per pair of rows.
+        """
+        order = {item_id: index for index, item_id in enumerate(self.items)}
+        shared: dict[tuple[str, str], int] = {}
+
+        def add(item_ids: list[str], days: int) -> None:
+            for pair in combinations(sorted(item_ids, key=order.__getitem__), 2):
+                shared[pair] = shared.get(pair, 0) + days
+
+        for k, item_ids in enumerate(self._weekdays):
+            if self._weekday_counts[k]:
+                add(item_ids, self._weekday_counts[k])
+        for item_ids in self._exceptions.between(
+            self.start.toordinal(), self.end.toordinal()
+        ):
+            add(item_ids, 1)
+
+        return [
+            {"items": list(pair), "days": days}
+            for pair, days in heapq.nlargest(
+                TOGETHER_LIMIT, shared.items(), key=lambda pair: pair[1]
+            )
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        """Summarize the items needed over the range."""
+        if self._stats is not None:
+            return self._stats
+
+        busy = 0
+        items: dict[str, dict[str, Any]] = {}
+        for item_id, bits in self.rows.items():
+            busy |= bits
+            items[item_id] = {
+                "name": self.items[item_id].get("name"),
+                "days": bits.bit_count(),
+                "longest_streak": _longest_run(bits),
+                "first_date": self._date((bits & -bits).bit_length() - 1),
+                "last_date": self._date(bits.bit_length() - 1),
+            }
+
+        self._stats = {
+            "days_with_items": busy.bit_count(),
+            "items": items,
+            "never_scheduled": [
+                item["id"]
+                for item in self.schedule.items
+                if item["id"] not in self.rows
+            ],
+            "together": self._together(),
+        }
+        return self._stats
@@ -0,0 +1,125 @@
+"""Timing and size counters for School Schedule hot paths."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Number of recent samples kept per timed operation for percentiles
+SAMPLE_WINDOW = 256
+
+
+class TimingStat:
+    """Rolling latency samples for one operation."""
+
+    def __init__(self) -> None:
+        """Initialize the stat."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._samples: deque[float] = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Return the pct-th percentile of recent samples in milliseconds."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+        return ordered[rank] * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary of the stat."""
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class SchoolScheduleMetrics:
+    """Collect timings, counters and gauges for one config entry."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._timings: dict[str, TimingStat] = {}
+        self._counters: dict[str, int] = {}
+        self._gauges: dict[str, float] = {}
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Time the wrapped block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a timing sample."""
+        if (stat := self._timings.get(name)) is None:
+            stat = self._timings[name] = TimingStat()
+        stat.add(seconds)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its latest value."""
+        self._gauges[name] = value
+
+    def hit(self, cache: str) -> None:
+        """Count a cache hit."""
+        self.increment(f"{cache}_hits")
+
+    def miss(self, cache: str) -> None:
+        """Count a cache miss."""
+        self.increment(f"{cache}_misses")
+
+    def timing(self, name: str) -> TimingStat:
+        """Return the stat for a timed operation."""
+        return self._timings.get(name) or TimingStat()
+
+    def counter(self, name: str) -> int:
+        """Return a counter's value."""
+        return self._counters.get(name, 0)
+
+    def gauge(self, name: str) -> float | None:
+        """Return a gauge's latest value."""
+        return self._gauges.get(name)
+
+    def hit_rates(self) -> dict[str, float]:
+        """Return the hit rate of every cache that has been used."""
+        rates = {}
+        for name, hits in self._counters.items():
+            if not name.endswith("_hits"):
+                continue
+            cache = name[: -len("_hits")]
+            total = hits + self.counter(f"{cache}_misses")
+            rates[cache] = round(hits / total, 4)
+        for name in self._counters:
+            if name.endswith("_misses"):
+                rates.setdefault(name[: -len("_misses")], 0.0)
+        return rates
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics."""
+        return {
+            "timings": {
+                name: stat.as_dict() for name, stat in sorted(self._timings.items())
+            },
+            "counters": dict(sorted(self._counters.items())),
+            "gauges": dict(sorted(self._gauges.items())),
+            "cache_hit_rates": self.hit_rates(),
+        }
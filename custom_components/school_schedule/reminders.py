@@ -0,0 +1,247 @@
+"""Reminders for School Schedule.
+
+A reminder fires at a time of day, a number of days before each date a
+child needs items (any items, or only the ones it names), as a
+``school_schedule_reminder`` event and optionally a notify call. The next
+fire time of every reminder for every child sits in one min-heap with a
+single timer set for the earliest, instead of automations polling the
+sensor. When a child's schedule or a reminder changes, only the entries
+for that child or reminder are worked out again; entries they replace are
+left in the heap and skipped when they reach the top.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+from datetime import date, datetime, time, timedelta
+from itertools import count
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .clock import local_instant
+from .const import DOMAIN
+from .schedule import CompiledSchedule
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_REMINDER = f"{DOMAIN}_reminder"
+
+# Days searched for the next date a reminder applies to; schedules repeat
+# weekly, so only exceptions further out than this are missed until then
+REMINDER_HORIZON_DAYS = 366
+
+# Replaced heap entries tolerated before the heap is rebuilt
+HEAP_SLACK = 64
+
+
+def _matching_items(
+    reminder: dict[str, Any], schedule: CompiledSchedule, day: date
+) -> list[dict[str, Any]]:
+    """Return the items a reminder is about on a date."""
+    items = schedule.items_for(day)
+    if item_ids := reminder.get("items"):
+        return [item for item in items if item["id"] in item_ids]
+    return items
+
+
+def _fire_time(reminder: dict[str, Any], day: date) -> datetime:
+    """Return when a reminder fires for a date."""
+    return local_instant(
+        day - timedelta(days=reminder.get("days_before", 1)),
+        time.fromisoformat(reminder["time"]),
+        dt_util.DEFAULT_TIME_ZONE,
+    )
+
+
+def _message(
+    child_name: str, items: list[dict[str, Any]], days_before: int, day: date
+) -> str:
+    """Return the notification text."""
+    names = ", ".join(item.get("name") or item["id"] for item in items)
+    if days_before == 0:
+        when = "today"
+    elif days_before == 1:
+        when = "tomorrow"
+    else:
+        when = f"on {day.strftime('%A')}"
+    return f"{child_name} needs {names} {when}"
+
+
+class ReminderScheduler:
+    """Fire every child's reminders from one heap and one timer."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        # (fire timestamp, token, reminder ID, child), earliest first
+        self._heap: list[tuple[float, int, str, str]] = []
+        # (reminder ID, child) -> (token, date, fire time) of its live heap
+        # entry, or None when nothing is due within the horizon
+        self._next: dict[tuple[str, str], tuple[int, date, datetime] | None] = {}
+        self._tokens = count()
+        self._reminders: dict[str, dict[str, Any]] = {}
+        self._schedules: dict[str, CompiledSchedule] = {}
+        self._timer: CALLBACK_TYPE | None = None
+        self._timer_at: float | None = None
+
+    @property
+    def next_fire(self) -> datetime | None:
+        """Return when the timer goes off next."""
+        if self._timer_at is None:
+            return None
+        return dt_util.as_local(dt_util.utc_from_timestamp(self._timer_at))
+
+    @callback
+    def async_update(
+        self,
+        schedules: dict[str, CompiledSchedule],
+        reminders: list[dict[str, Any]],
+        now: datetime,
+    ) -> None:
+        """Replan the entries whose reminder or child's schedule changed.
+
+        Called on every refresh with the instant the refresh was computed
+        for; compiled schedules and stored reminders are replaced rather than
+        modified, so unchanged ones are skipped by identity.
+        """
+        by_id = {reminder["id"]: reminder for reminder in reminders}
+        planned: dict[tuple[str, str], tuple[int, date, datetime] | None] = {}
+        for reminder_id, reminder in by_id.items():
+            reminder_changed = self._reminders.get(reminder_id) is not reminder
+            children = reminder.get("children")
+            for child_name, schedule in schedules.items():
+                if children and child_name not in children:
+                    continue
+                key = (reminder_id, child_name)
+                if (
+                    reminder_changed
+                    or self._schedules.get(child_name) is not schedule
+                    or key not in self._next
+                ):
+                    planned[key] = self._async_plan(reminder, child_name, schedule, now)
+                else:
+                    planned[key] = self._next[key]
+
+        # Dropped entries are left for the heap to skip
+        self._next = planned
+        self._reminders = by_id
+        self._schedules = dict(schedules)
+        self._async_set_timer()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the timer."""
+        if self._timer is not None:
+            self._timer()
+            self._timer = None
+            self._timer_at = None
+
+    def _async_plan(
+        self,
+        reminder: dict[str, Any],
+        child_name: str,
+        schedule: CompiledSchedule,
+        after: datetime,
+    ) -> tuple[int, date, datetime] | None:
+        """Push the first time after `after` the reminder applies to a child."""
+        day = after.date() + timedelta(days=reminder.get("days_before", 1))
+        if _fire_time(reminder, day) <= after:
+            day += timedelta(days=1)
+        for _ in range(REMINDER_HORIZON_DAYS):
+            if _matching_items(reminder, schedule, day):
+                fire = _fire_time(reminder, day)
+                token = next(self._tokens)
+                heapq.heappush(
+                    self._heap, (fire.timestamp(), token, reminder["id"], child_name)
+                )
+                return token, day, fire
+            day += timedelta(days=1)
+        return None
+
+    def _is_live(self, entry: tuple[float, int, str, str]) -> bool:
+        """Return True if a heap entry hasn't been replaced."""
+        planned = self._next.get((entry[2], entry[3]))
+        return planned is not None and planned[0] == entry[1]
+
+    @callback
+    def _async_set_timer(self) -> None:
+        """Set the one timer for the earliest live entry."""
+        # Many edits leave many replaced entries behind; drop them in one go
+        if len(self._heap) > 2 * len(self._next) + HEAP_SLACK:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+        when = self._heap[0][0] if self._heap else None
+        if when == self._timer_at:
+            return
+        self.async_stop()
+        if when is not None:
+            self._timer_at = when
+            self._timer = async_track_point_in_utc_time(
+                self._hass, self._async_fire_due, dt_util.utc_from_timestamp(when)
+            )
+
+    @callback
+    def _async_fire_due(self, now: datetime) -> None:
+        """Fire every entry that is due and plan each one's next time."""
+        self._timer = None
+        self._timer_at = None
+        while self._heap and self._heap[0][0] <= now.timestamp():
+            entry = heapq.heappop(self._heap)
+            if not self._is_live(entry):
+                continue
+            _, _, reminder_id, child_name = entry
+            key = (reminder_id, child_name)
+            _, day, fire = self._next[key]
+            reminder = self._reminders[reminder_id]
+            schedule = self._schedules[child_name]
+            self._async_fire(reminder, child_name, day, schedule)
+            self._next[key] = self._async_plan(reminder, child_name, schedule, fire)
+        self._async_set_timer()
+
+    @callback
+    def _async_fire(
+        self,
+        reminder: dict[str, Any],
+        child_name: str,
+        day: date,
+        schedule: CompiledSchedule,
+    ) -> None:
+        """Send one reminder."""
+        items = _matching_items(reminder, schedule, day)
+        _LOGGER.debug(
+            "Reminder '%s' for '%s' on %s", reminder["id"], child_name, day
+        )
+        self._hass.bus.async_fire(
+            EVENT_REMINDER,
+            {
+                "reminder": reminder["id"],
+                "child": child_name,
+                "date": day.isoformat(),
+                "items": [
+                    {"id": item["id"], "name": item.get("name")} for item in items
+                ],
+            },
+        )
+        if notify := reminder.get("notify"):
+            self._hass.async_create_task(
+                self._async_notify(
+                    notify,
+                    _message(child_name, items, reminder.get("days_before", 1), day),
+                )
+            )
+
+    async def _async_notify(self, service: str, message: str) -> None:
+        """Call a notify service, logging rather than raising failures."""
+        domain, _, name = service.partition(".")
+        try:
+            await self._hass.services.async_call(
+                domain, name, {"title": "School Schedule", "message": message}
+            )
+        except HomeAssistantError as err:
+            _LOGGER.warning("Could not send reminder with %s: %s", service, err)
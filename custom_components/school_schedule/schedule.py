@@ -0,0 +1,123 @@
+"""Compiled per-child schedules for School Schedule.
+
+The stored document keeps schedules as item IDs. Resolving them means
+looking items up in the child's items and the shared library for every
+lookup; a compiled schedule does that once per change and answers date
+lookups with two dictionary reads.
+
+Children refer to library items instead of holding copies of them: an item
+``{"id": "hat", "library": true}`` is the library's hat, and any name or
+image it also has overrides the library's for that child only. All children
+resolve through one ItemTable per library, so identical items are shared
+rather than rebuilt for every child.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from .const import DAYS_OF_WEEK
+
+ITEM_FIELDS = ("name", "image")
+
+
+def is_reference(item: dict[str, Any]) -> bool:
+    """Return True if a child's item refers to a library item."""
+    return bool(item.get("library"))
+
+
+class ItemTable:
+    """The library's items, and every per-child variant of them, interned."""
+
+    def __init__(self, library: list[dict[str, Any]]) -> None:
+        """Index a library snapshot."""
+        # Kept to tell whether a later document still has this library
+        self.library = library
+        self._items: dict[str, dict[str, Any]] = {
+            item["id"]: item for item in library
+        }
+        # (id, name, image) -> the one dict used for that item everywhere
+        self._interned: dict[tuple[str, str, str], dict[str, Any]] = {}
+
+    def is_current(self, library: list[dict[str, Any]]) -> bool:
+        """Return True if built from this (copy-on-write) library."""
+        return library is self.library
+
+    def get(self, item_id: str) -> dict[str, Any] | None:
+        """Return a library item."""
+        return self._items.get(item_id)
+
+    def resolve(self, item: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the item a child's item stands for.
+
+        Own items are returned as they are. A reference resolves to the
+        library item itself unless it overrides something, and to None if
+        the library no longer has it.
+        """
+        if not is_reference(item):
+            return item
+        base = self._items.get(item["id"])
+        if base is None:
+            return None
+        if not any(field in item for field in ITEM_FIELDS):
+            return base
+        key = (
+            item["id"],
+            item.get("name", base.get("name", "")),
+            item.get("image", base.get("image", "")),
+        )
+        if (resolved := self._interned.get(key)) is None:
+            resolved = self._interned[key] = {
+                "id": key[0],
+                "name": key[1],
+                "image": key[2],
+            }
+        return resolved
+
+
+class CompiledSchedule:
+    """A child's weekly schedule and exceptions with item IDs resolved."""
+
+    def __init__(self, child: dict[str, Any], table: ItemTable) -> None:
+        """Compile a child's schedule against its items and the library."""
+        self.name: str = child.get("name", "Unknown")
+        # Kept to tell whether a later document still matches this one
+        self.child = child
+        self.table = table
+
+        # The child's items win over library items with the same ID
+        own: dict[str, dict[str, Any]] = {}
+        for item in child.get("items", []):
+            if (resolved := table.resolve(item)) is not None:
+                own[item["id"]] = resolved
+        # The child's own and assigned items
+        self.items: list[dict[str, Any]] = list(own.values())
+
+        def resolve(item_ids: list[str]) -> list[dict[str, Any]]:
+            items = []
+            for item_id in item_ids:
+                item = own.get(item_id) or table.get(item_id)
+                if item is not None:
+                    items.append(item)
+            return items
+
+        weekly_schedule = child.get("weekly_schedule", {})
+        self.weekly: list[list[dict[str, Any]]] = [
+            resolve(weekly_schedule.get(day, [])) for day in DAYS_OF_WEEK
+        ]
+        self.exceptions: dict[str, list[dict[str, Any]]] = {
+            date_str: resolve(item_ids)
+            for date_str, item_ids in child.get("exceptions", {}).items()
+        }
+
+    def is_current(self, child: dict[str, Any], table: ItemTable) -> bool:
+        """Return True if compiled from these (copy-on-write) documents."""
+        return child is self.child and table is self.table
+
+    def items_for(self, day: date) -> list[dict[str, Any]]:
+        """Return the items needed on a date."""
+        if self.exceptions:
+            items = self.exceptions.get(day.strftime("%Y-%m-%d"))
+            if items is not None:
+                return items
+        return self.weekly[day.weekday()]
@@ -2,11 +2,19 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -14,10 +22,65 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
 from .coordinator import SchoolScheduleCoordinator
+from .metrics import SchoolScheduleMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class SchoolScheduleDebugSensorEntityDescription(SensorEntityDescription):
+    """Describes a School Schedule debug sensor."""
+
+    value_fn: Callable[[SchoolScheduleMetrics], float | None]
+
+
+DEBUG_SENSORS: tuple[SchoolScheduleDebugSensorEntityDescription, ...] = (
+    SchoolScheduleDebugSensorEntityDescription(
+        key="refresh_p95",
+        name="School Schedule refresh p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda metrics: metrics.timing("update_data").percentile(95),
+    ),
+    SchoolScheduleDebugSensorEntityDescription(
+        key="modify_p95",
+        name="School Schedule change p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda metrics: metrics.timing("modify_data").percentile(95),
+    ),
+    SchoolScheduleDebugSensorEntityDescription(
+        key="lock_wait_p95",
+        name="School Schedule lock wait p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda metrics: metrics.timing("lock_wait").percentile(95),
+    ),
+    SchoolScheduleDebugSensorEntityDescription(
+        key="calendar_p95",
+        name="School Schedule calendar query p95",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        value_fn=lambda metrics: metrics.timing("calendar_events").percentile(95),
+    ),
+    SchoolScheduleDebugSensorEntityDescription(
+        key="bytes_written",
+        name="School Schedule bytes written",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.counter("bytes_written"),
+    ),
+    SchoolScheduleDebugSensorEntityDescription(
+        key="document_size",
+        name="School Schedule stored size",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        value_fn=lambda metrics: metrics.gauge("document_bytes"),
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -27,16 +90,120 @@ async def async_setup_entry(
     coordinator: SchoolScheduleCoordinator = hass.data[DOMAIN][entry.entry_id]
 
     # Add a master sensor that tracks all children
-    entities = [SchoolScheduleMasterSensor(coordinator, entry)]
+    entities: list[SensorEntity] = [SchoolScheduleMasterSensor(coordinator, entry)]
+
+    # Debug sensors are created disabled; enable them to see where time goes
+    entities.extend(
+        SchoolScheduleDebugSensor(coordinator, entry, description)
+        for description in DEBUG_SENSORS
+    )
 
     async_add_entities(entities)
 
+    # And a packing checklist sensor per child, as children come and go
+    coordinator.async_add_child_entities(
+        entry,
+        async_add_entities,
+        lambda child_name: [
+            SchoolSchedulePackingSensor(coordinator, entry, child_name)
+        ],
+    )
+
+
+def format_display_date(data: dict[str, Any]) -> str | None:
+    """Return the displayed date as YYYY-MM-DD."""
+    display_date = data.get("display_date")
+
+    # Safely format the date (cached state holds it as a string)
+    if isinstance(display_date, datetime):
+        return display_date.strftime("%Y-%m-%d")
+    if isinstance(display_date, str):
+        return display_date
+    return None
+
+
+def child_display_date(data: dict[str, Any], child_name: str) -> str | None:
+    """Return the date a child's items are shown for as YYYY-MM-DD."""
+    child_data = data.get("children", {}).get(child_name) or {}
+    # Older cached state only has the household's date
+    return child_data.get("display_date") or format_display_date(data)
+
+
+def build_state_attributes(data: dict[str, Any]) -> dict[str, Any]:
+    """Build the master sensor's attributes from coordinator data."""
+    attrs: dict[str, Any] = {
+        "display_date": format_display_date(data),
+        "is_tomorrow": data.get("is_tomorrow", False),
+        "switchover_time": data.get("switchover_time", "12:00"),
+        "children": {},
+        "item_library": [
+            {
+                "id": item.get("id"),
+                "name": item.get("name"),
+                "image": item.get("image"),
+            }
+            for item in data.get("item_library", [])
+        ],
+    }
+
+    for child_name, child_data in data.get("children", {}).items():
+        attrs["children"][child_name] = {
+            "items_today": [
+                {
+                    "id": item.get("id"),
+                    "name": item.get("name"),
+                    "image": item.get("image"),
+                }
+                for item in child_data.get("items_today", [])
+            ],
+            "upcoming": [
+                {
+                    "date": day.get("date"),
+                    "items": [
+                        {
+                            "id": item.get("id"),
+                            "name": item.get("name"),
+                            "image": item.get("image"),
+                        }
+                        for item in day.get("items", [])
+                    ],
+                }
+                for day in child_data.get("upcoming", [])
+            ],
+            # Library items are sent as references plus any overrides; the
+            # panel resolves them against item_library
+            "all_items": [
+                {
+                    key: item[key]
+                    for key in ("id", "library", "name", "image")
+                    if key in item
+                }
+                for item in child_data.get("items", [])
+            ],
+            "weekly_schedule": child_data.get("weekly_schedule", {}),
+            "exceptions": child_data.get("exceptions", {}),
+        }
+        # Only children on another day than the household, because of their
+        # own switchover time or time zone, say which day they are on
+        display_date = child_display_date(data, child_name)
+        if display_date != attrs["display_date"]:
+            attrs["children"][child_name]["display_date"] = display_date
+            attrs["children"][child_name]["is_tomorrow"] = child_data.get(
+                "is_tomorrow", False
+            )
+
+    return attrs
+
 
 class SchoolScheduleMasterSensor(
     CoordinatorEntity[SchoolScheduleCoordinator], SensorEntity
 ):
     """Sensor representing the entire school schedule."""
 
+    # Rebuilt on every refresh and large; usage history is kept as long-term
+    # statistics instead
+    _unrecorded_attributes = frozenset({"children", "item_library"})
+
     def __init__(
         self,
         coordinator: SchoolScheduleCoordinator,
@@ -75,58 +242,119 @@ class SchoolScheduleMasterSensor(
         """Return extra state attributes."""
         if not self.coordinator.data:
             return {}
+        with self.coordinator.metrics.time("state_attributes"):
+            return build_state_attributes(self.coordinator.data)
 
-        data = self.coordinator.data
-        display_date = data.get("display_date")
-
-        # Safely format the date
-        formatted_date = None
-        if display_date is not None:
-            if isinstance(display_date, datetime):
-                formatted_date = display_date.strftime("%Y-%m-%d")
-            elif isinstance(display_date, str):
-                formatted_date = display_date
-
-        attrs: dict[str, Any] = {
-            "display_date": formatted_date,
-            "is_tomorrow": data.get("is_tomorrow", False),
-            "switchover_time": data.get("switchover_time", "12:00"),
-            "children": {},
-            "item_library": [
-                {
-                    "id": item.get("id"),
-                    "name": item.get("name"),
-                    "image": item.get("image"),
-                }
-                for item in data.get("item_library", [])
-            ],
-        }
+    @property
+    def icon(self) -> str:
+        """Return the icon."""
+        return "mdi:bag-personal"
 
-        for child_name, child_data in data.get("children", {}).items():
-            attrs["children"][child_name] = {
-                "items_today": [
-                    {
-                        "id": item.get("id"),
-                        "name": item.get("name"),
-                        "image": item.get("image"),
-                    }
-                    for item in child_data.get("items_today", [])
-                ],
-                "all_items": [
-                    {
-                        "id": item.get("id"),
-                        "name": item.get("name"),
-                        "image": item.get("image"),
-                    }
-                    for item in child_data.get("items", [])
-                ],
-                "weekly_schedule": child_data.get("weekly_schedule", {}),
-                "exceptions": child_data.get("exceptions", {}),
-            }
 
-        return attrs
+class SchoolSchedulePackingSensor(
+    CoordinatorEntity[SchoolScheduleCoordinator], SensorEntity
+):
+    """Items a child still has to pack for the displayed date.
+
+    Besides coordinator refreshes, the sensor updates itself when its
+    child's checklist changes; other children's entities are left alone.
+    """
+
+    _attr_native_unit_of_measurement = "items"
+
+    def __init__(
+        self,
+        coordinator: SchoolScheduleCoordinator,
+        entry: ConfigEntry,
+        child_name: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._child_name = child_name
+        self._attr_unique_id = f"{entry.entry_id}_{child_name}_packing"
+        self._attr_name = f"{child_name} Packing"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for changes to the child's checklist."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.checklist.async_add_listener(
+                self._child_name, self.async_write_ha_state
+            )
+        )
+
+    def _checklist(self) -> tuple[str | None, list[str], set[str]]:
+        """Return the displayed date, the item IDs needed and those packed."""
+        data = self.coordinator.data or {}
+        day = child_display_date(data, self._child_name)
+        child_data = data.get("children", {}).get(self._child_name)
+        if day is None or child_data is None:
+            return day, [], set()
+        item_ids = list(
+            dict.fromkeys(item["id"] for item in child_data.get("items_today", []))
+        )
+        return day, item_ids, self.coordinator.checklist.packed(self._child_name, day)
+
+    @property
+    def available(self) -> bool:
+        """Return True while the child exists."""
+        return super().available and self._child_name in (
+            self.coordinator.data or {}
+        ).get("children", {})
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of items not packed yet."""
+        _, item_ids, packed = self._checklist()
+        return sum(item_id not in packed for item_id in item_ids)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the date and the items packed for it."""
+        day, item_ids, packed = self._checklist()
+        return {
+            "child": self._child_name,
+            "date": day,
+            "needed": len(item_ids),
+            "packed": [item_id for item_id in item_ids if item_id in packed],
+        }
 
     @property
     def icon(self) -> str:
         """Return the icon."""
-        return "mdi:bag-personal"
+        _, item_ids, packed = self._checklist()
+        if item_ids and packed.issuperset(item_ids):
+            return "mdi:bag-checked"
+        return "mdi:bag-personal-outline"
+
+
+class SchoolScheduleDebugSensor(
+    CoordinatorEntity[SchoolScheduleCoordinator], SensorEntity
+):
+    """Sensor exposing one of the integration's performance metrics."""
+
+    entity_description: SchoolScheduleDebugSensorEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: SchoolScheduleCoordinator,
+        entry: ConfigEntry,
+        description: SchoolScheduleDebugSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._entry = entry
+        self._attr_unique_id = f"{entry.entry_id}_debug_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the metric's current value."""
+        value = self.entity_description.value_fn(self.coordinator.metrics)
+        if isinstance(value, float):
+            return round(value, 3)
+        return value
@@ -2,14 +2,25 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
+from pathlib import Path
 from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, DAYS_OF_WEEK
+from .const import DOMAIN, DAYS_OF_WEEK, IMPORT_DIR
+from .ics import read_exceptions
+from .transfer import FORMAT_JSON, FORMATS, export_document, parse_document
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,13 +30,31 @@ SERVICE_ADD_ITEM = "add_item"
 SERVICE_REMOVE_ITEM = "remove_item"
 SERVICE_UPDATE_ITEM = "update_item"
 SERVICE_SET_WEEKLY_SCHEDULE = "set_weekly_schedule"
+SERVICE_SET_SCHEDULES = "set_schedules"
 SERVICE_ADD_EXCEPTION = "add_exception"
 SERVICE_REMOVE_EXCEPTION = "remove_exception"
 SERVICE_SET_SWITCHOVER_TIME = "set_switchover_time"
+SERVICE_SET_CHILD_SWITCHOVER = "set_child_switchover"
 SERVICE_ADD_LIBRARY_ITEM = "add_library_item"
 SERVICE_REMOVE_LIBRARY_ITEM = "remove_library_item"
 SERVICE_UPDATE_LIBRARY_ITEM = "update_library_item"
 SERVICE_ASSIGN_LIBRARY_ITEM = "assign_library_item"
+SERVICE_RESTORE = "restore"
+SERVICE_GET_ITEMS = "get_items"
+SERVICE_IMPORT = "import"
+SERVICE_EXPORT = "export"
+SERVICE_IMPORT_ICS = "import_ics"
+SERVICE_STATS = "stats"
+SERVICE_SET_PACKED = "set_packed"
+SERVICE_CLEAR_PACKED = "clear_packed"
+SERVICE_SET_REMINDER = "set_reminder"
+SERVICE_REMOVE_REMINDER = "remove_reminder"
+
+# Longest date range get_items resolves in one call
+GET_ITEMS_MAX_DAYS = 366
+
+# Longest date range stats covers in one call (about ten years)
+STATS_MAX_DAYS = 3653
 
 ADD_CHILD_SCHEMA = vol.Schema({
     vol.Required("name"): cv.string,
@@ -60,6 +89,17 @@ SET_WEEKLY_SCHEDULE_SCHEMA = vol.Schema({
     vol.Required("item_ids"): vol.All(cv.ensure_list, [cv.string]),
 })
 
+SET_SCHEDULES_SCHEMA = vol.Schema({
+    vol.Required("child_name"): cv.string,
+    vol.Optional("weekly_schedule", default={}): {
+        vol.In(DAYS_OF_WEEK): vol.All(cv.ensure_list, [cv.string]),
+    },
+    # YYYY-MM-DD -> item IDs, or null to remove the exception
+    vol.Optional("exceptions", default={}): {
+        cv.string: vol.Any(None, vol.All(cv.ensure_list, [cv.string])),
+    },
+})
+
 ADD_EXCEPTION_SCHEMA = vol.Schema({
     vol.Required("child_name"): cv.string,
     vol.Required("date"): cv.string,  # YYYY-MM-DD format
@@ -71,10 +111,45 @@ REMOVE_EXCEPTION_SCHEMA = vol.Schema({
     vol.Required("date"): cv.string,
 })
 
+SET_PACKED_SCHEMA = vol.Schema({
+    vol.Required("child_name"): cv.string,
+    vol.Required("item_id"): cv.string,
+    # Defaults to the displayed date
+    vol.Optional("date"): cv.date,
+    # Omit to toggle
+    vol.Optional("packed"): cv.boolean,
+})
+
+CLEAR_PACKED_SCHEMA = vol.Schema({
+    vol.Optional("children"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("date"): cv.date,
+})
+
+SET_REMINDER_SCHEMA = vol.Schema({
+    vol.Required("reminder_id"): cv.string,
+    vol.Required("time"): cv.time,
+    # 1 for the evening before, 0 for the same morning
+    vol.Optional("days_before", default=1): vol.All(vol.Coerce(int), vol.Range(min=0, max=7)),
+    vol.Optional("children"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("item_ids"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("notify"): cv.service,
+})
+
+REMOVE_REMINDER_SCHEMA = vol.Schema({
+    vol.Required("reminder_id"): cv.string,
+})
+
 SET_SWITCHOVER_TIME_SCHEMA = vol.Schema({
     vol.Required("time"): cv.string,  # HH:MM format
 })
 
+SET_CHILD_SWITCHOVER_SCHEMA = vol.Schema({
+    vol.Required("child_name"): cv.string,
+    # Empty strings go back to the household's settings
+    vol.Optional("time"): cv.string,  # HH:MM format
+    vol.Optional("time_zone"): cv.string,
+})
+
 ADD_LIBRARY_ITEM_SCHEMA = vol.Schema({
     vol.Required("item_id"): cv.string,
     vol.Required("item_name"): cv.string,
@@ -96,6 +171,42 @@ ASSIGN_LIBRARY_ITEM_SCHEMA = vol.Schema({
     vol.Required("item_id"): cv.string,
 })
 
+RESTORE_SCHEMA = vol.Schema({
+    vol.Required("until"): cv.datetime,
+})
+
+IMPORT_SCHEMA = vol.Schema({
+    vol.Required("content"): cv.string,
+    vol.Optional("format", default=FORMAT_JSON): vol.In(FORMATS),
+    vol.Optional("mode", default="replace"): vol.In(["replace", "merge"]),
+})
+
+EXPORT_SCHEMA = vol.Schema({
+    vol.Optional("format", default=FORMAT_JSON): vol.In(FORMATS),
+})
+
+IMPORT_ICS_SCHEMA = vol.Schema({
+    vol.Required("path"): cv.string,
+    vol.Required("rules"): vol.All(cv.ensure_list, [vol.Schema({
+        vol.Required("keyword"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required("item_ids"): vol.All(cv.ensure_list, [cv.string]),
+    })]),
+    vol.Optional("children"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("include_past", default=False): cv.boolean,
+})
+
+GET_ITEMS_SCHEMA = vol.Schema({
+    vol.Required("start_date"): cv.date,
+    vol.Optional("end_date"): cv.date,
+    vol.Optional("children"): vol.All(cv.ensure_list, [cv.string]),
+})
+
+STATS_SCHEMA = vol.Schema({
+    vol.Required("start_date"): cv.date,
+    vol.Required("end_date"): cv.date,
+    vol.Optional("children"): vol.All(cv.ensure_list, [cv.string]),
+})
+
 
 async def async_setup_services(hass: HomeAssistant) -> None:
     """Set up services for School Schedule integration."""
@@ -154,6 +265,15 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             call.data["item_ids"],
         )
 
+    async def handle_set_schedules(call: ServiceCall) -> None:
+        """Handle set_schedules service call."""
+        coordinator = await get_coordinator()
+        await coordinator.async_set_schedules(
+            call.data["child_name"],
+            call.data["weekly_schedule"],
+            call.data["exceptions"],
+        )
+
     async def handle_add_exception(call: ServiceCall) -> None:
         """Handle add_exception service call."""
         coordinator = await get_coordinator()
@@ -171,11 +291,59 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             call.data["date"],
         )
 
+    async def handle_set_packed(call: ServiceCall) -> ServiceResponse:
+        """Handle set_packed service call."""
+        coordinator = await get_coordinator()
+        packed = await coordinator.async_set_packed(
+            call.data["child_name"],
+            call.data["item_id"],
+            call.data.get("date"),
+            call.data.get("packed"),
+        )
+        return {"packed": packed}
+
+    async def handle_clear_packed(call: ServiceCall) -> None:
+        """Handle clear_packed service call."""
+        coordinator = await get_coordinator()
+        await coordinator.async_clear_packed(
+            call.data.get("children"), call.data.get("date")
+        )
+
+    async def handle_set_reminder(call: ServiceCall) -> None:
+        """Handle set_reminder service call."""
+        coordinator = await get_coordinator()
+        reminder: dict[str, Any] = {
+            "id": call.data["reminder_id"],
+            "time": call.data["time"].strftime("%H:%M"),
+            "days_before": call.data["days_before"],
+        }
+        if call.data.get("children"):
+            reminder["children"] = call.data["children"]
+        if call.data.get("item_ids"):
+            reminder["items"] = call.data["item_ids"]
+        if "notify" in call.data:
+            reminder["notify"] = call.data["notify"]
+        await coordinator.async_set_reminder(reminder)
+
+    async def handle_remove_reminder(call: ServiceCall) -> None:
+        """Handle remove_reminder service call."""
+        coordinator = await get_coordinator()
+        await coordinator.async_remove_reminder(call.data["reminder_id"])
+
     async def handle_set_switchover_time(call: ServiceCall) -> None:
         """Handle set_switchover_time service call."""
         coordinator = await get_coordinator()
         await coordinator.async_set_switchover_time(call.data["time"])
 
+    async def handle_set_child_switchover(call: ServiceCall) -> None:
+        """Handle set_child_switchover service call."""
+        coordinator = await get_coordinator()
+        await coordinator.async_set_child_switchover(
+            call.data["child_name"],
+            call.data.get("time"),
+            call.data.get("time_zone"),
+        )
+
     async def handle_add_library_item(call: ServiceCall) -> None:
         """Handle add_library_item service call."""
         coordinator = await get_coordinator()
@@ -207,19 +375,190 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             call.data["item_id"],
         )
 
+    async def handle_restore(call: ServiceCall) -> None:
+        """Handle restore service call."""
+        coordinator = await get_coordinator()
+        await coordinator.async_restore(dt_util.as_utc(call.data["until"]))
+
+    async def handle_get_items(call: ServiceCall) -> ServiceResponse:
+        """Handle get_items service call."""
+        coordinator = await get_coordinator()
+        start = call.data["start_date"]
+        end = call.data.get("end_date", start)
+        if end < start:
+            raise HomeAssistantError("end_date must not be before start_date")
+        if (end - start).days >= GET_ITEMS_MAX_DAYS:
+            raise HomeAssistantError(
+                f"Date range is limited to {GET_ITEMS_MAX_DAYS} days"
+            )
+
+        schedules = await coordinator.async_get_schedules()
+        if "children" in call.data:
+            unknown = set(call.data["children"]) - set(schedules)
+            if unknown:
+                raise HomeAssistantError(
+                    f"Children not found: {', '.join(sorted(unknown))}"
+                )
+            schedules = {name: schedules[name] for name in call.data["children"]}
+
+        children: dict[str, dict[str, list[dict[str, Any]]]] = {
+            name: {} for name in schedules
+        }
+        day = start
+        while day <= end:
+            date_str = day.isoformat()
+            for name, schedule in schedules.items():
+                children[name][date_str] = [
+                    {
+                        "id": item.get("id"),
+                        "name": item.get("name"),
+                        "image": item.get("image", ""),
+                    }
+                    for item in schedule.items_for(day)
+                ]
+            day += timedelta(days=1)
+
+        return {"children": children}
+
+    async def handle_stats(call: ServiceCall) -> ServiceResponse:
+        """Handle stats service call."""
+        coordinator = await get_coordinator()
+        start = call.data["start_date"]
+        end = call.data["end_date"]
+        if end < start:
+            raise HomeAssistantError("end_date must not be before start_date")
+        if (end - start).days >= STATS_MAX_DAYS:
+            raise HomeAssistantError(f"Date range is limited to {STATS_MAX_DAYS} days")
+
+        matrices = await coordinator.async_get_matrices(start, end)
+        if "children" in call.data:
+            unknown = set(call.data["children"]) - set(matrices)
+            if unknown:
+                raise HomeAssistantError(
+                    f"Children not found: {', '.join(sorted(unknown))}"
+                )
+            matrices = {name: matrices[name] for name in call.data["children"]}
+
+        children = {name: matrix.stats() for name, matrix in matrices.items()}
+        used = {item_id for matrix in matrices.values() for item_id in matrix.rows}
+        data = await coordinator.async_get_document()
+        return {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "days": (end - start).days + 1,
+            "children": children,
+            # Shared items none of these children need in the range
+            "never_scheduled": [
+                item["id"]
+                for item in data.get("item_library", [])
+                if item["id"] not in used
+            ],
+        }
+
+    async def handle_import(call: ServiceCall) -> None:
+        """Handle import service call."""
+        coordinator = await get_coordinator()
+        # Parsing a large household is kept off the event loop
+        document = await hass.async_add_executor_job(
+            parse_document, call.data["content"], call.data["format"]
+        )
+        await coordinator.async_import(document, merge=call.data["mode"] == "merge")
+
+    async def handle_export(call: ServiceCall) -> ServiceResponse:
+        """Handle export service call."""
+        coordinator = await get_coordinator()
+        data = await coordinator.async_get_document()
+        # Stored snapshots are never modified in place, so this is safe
+        content = await hass.async_add_executor_job(
+            export_document, data, call.data["format"]
+        )
+        return {"format": call.data["format"], "content": content}
+
+    async def handle_import_ics(call: ServiceCall) -> ServiceResponse:
+        """Handle import_ics service call."""
+        coordinator = await get_coordinator()
+        # Relative paths are in the config directory, wherever HA was started
+        path = Path(hass.config.path(call.data["path"]))
+        import_dir = Path(hass.config.path(IMPORT_DIR)).resolve()
+        if not (
+            path.resolve().is_relative_to(import_dir)
+            or hass.config.is_allowed_path(str(path))
+        ):
+            raise HomeAssistantError(
+                f"Cannot read {path}: not an upload or an allowed external directory"
+            )
+
+        since = None if call.data["include_past"] else dt_util.now().date()
+        try:
+            exceptions, counts = await hass.async_add_executor_job(
+                read_exceptions, path, call.data["rules"], since
+            )
+        except OSError as err:
+            raise HomeAssistantError(f"Cannot read {path}: {err}") from err
+
+        schedules = await coordinator.async_get_schedules()
+        children = call.data.get("children", list(schedules))
+        if exceptions and children:
+            await coordinator.async_add_exceptions(
+                {child_name: exceptions for child_name in children}
+            )
+        return {**counts, "dates": len(exceptions)}
+
     hass.services.async_register(DOMAIN, SERVICE_ADD_CHILD, handle_add_child, schema=ADD_CHILD_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_REMOVE_CHILD, handle_remove_child, schema=REMOVE_CHILD_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_ADD_ITEM, handle_add_item, schema=ADD_ITEM_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_REMOVE_ITEM, handle_remove_item, schema=REMOVE_ITEM_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_UPDATE_ITEM, handle_update_item, schema=UPDATE_ITEM_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_SET_WEEKLY_SCHEDULE, handle_set_weekly_schedule, schema=SET_WEEKLY_SCHEDULE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_SCHEDULES, handle_set_schedules, schema=SET_SCHEDULES_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_ADD_EXCEPTION, handle_add_exception, schema=ADD_EXCEPTION_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_REMOVE_EXCEPTION, handle_remove_exception, schema=REMOVE_EXCEPTION_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PACKED,
+        handle_set_packed,
+        schema=SET_PACKED_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_CLEAR_PACKED, handle_clear_packed, schema=CLEAR_PACKED_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_REMINDER, handle_set_reminder, schema=SET_REMINDER_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_REMOVE_REMINDER, handle_remove_reminder, schema=REMOVE_REMINDER_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_SET_SWITCHOVER_TIME, handle_set_switchover_time, schema=SET_SWITCHOVER_TIME_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_CHILD_SWITCHOVER, handle_set_child_switchover, schema=SET_CHILD_SWITCHOVER_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_ADD_LIBRARY_ITEM, handle_add_library_item, schema=ADD_LIBRARY_ITEM_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_REMOVE_LIBRARY_ITEM, handle_remove_library_item, schema=REMOVE_LIBRARY_ITEM_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_UPDATE_LIBRARY_ITEM, handle_update_library_item, schema=UPDATE_LIBRARY_ITEM_SCHEMA)
     hass.services.async_register(DOMAIN, SERVICE_ASSIGN_LIBRARY_ITEM, handle_assign_library_item, schema=ASSIGN_LIBRARY_ITEM_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE, handle_restore, schema=RESTORE_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ITEMS,
+        handle_get_items,
+        schema=GET_ITEMS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STATS,
+        handle_stats,
+        schema=STATS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(DOMAIN, SERVICE_IMPORT, handle_import, schema=IMPORT_SCHEMA)
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_ICS,
+        handle_import_ics,
+        schema=IMPORT_ICS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        handle_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
 
 
 async def async_unload_services(hass: HomeAssistant) -> None:
@@ -230,10 +569,22 @@ async def async_unload_services(hass: HomeAssistant) -> None:
     hass.services.async_remove(DOMAIN, SERVICE_REMOVE_ITEM)
     hass.services.async_remove(DOMAIN, SERVICE_UPDATE_ITEM)
     hass.services.async_remove(DOMAIN, SERVICE_SET_WEEKLY_SCHEDULE)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULES)
     hass.services.async_remove(DOMAIN, SERVICE_ADD_EXCEPTION)
     hass.services.async_remove(DOMAIN, SERVICE_REMOVE_EXCEPTION)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_PACKED)
+    hass.services.async_remove(DOMAIN, SERVICE_CLEAR_PACKED)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_REMINDER)
+    hass.services.async_remove(DOMAIN, SERVICE_REMOVE_REMINDER)
     hass.services.async_remove(DOMAIN, SERVICE_SET_SWITCHOVER_TIME)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_CHILD_SWITCHOVER)
     hass.services.async_remove(DOMAIN, SERVICE_ADD_LIBRARY_ITEM)
     hass.services.async_remove(DOMAIN, SERVICE_REMOVE_LIBRARY_ITEM)
     hass.services.async_remove(DOMAIN, SERVICE_UPDATE_LIBRARY_ITEM)
     hass.services.async_remove(DOMAIN, SERVICE_ASSIGN_LIBRARY_ITEM)
+    hass.services.async_remove(DOMAIN, SERVICE_RESTORE)
+    hass.services.async_remove(DOMAIN, SERVICE_GET_ITEMS)
+    hass.services.async_remove(DOMAIN, SERVICE_IMPORT)
+    hass.services.async_remove(DOMAIN, SERVICE_EXPORT)
+    hass.services.async_remove(DOMAIN, SERVICE_IMPORT_ICS)
+    hass.services.async_remove(DOMAIN, SERVICE_STATS)
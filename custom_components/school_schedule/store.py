@@ -1,38 +1,557 @@
-"""Storage handler for School Schedule."""
+"""Storage handler for School Schedule.
+
+The schedule document is persisted as a snapshot (a regular HA ``Store``)
+plus an append-only journal of JSON-lines mutation records.  Each mutation
+only appends the parts of the document it changed; the journal is folded
+back into the snapshot every ``JOURNAL_COMPACT_THRESHOLD`` records.
+
+Folded journals are not deleted but archived as segments, each headed by
+the document it started from, so the audit trail and point-in-time restore
+reach back as far as the retention setting keeps them.
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.storage import Store
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import DOMAIN
+from .const import DEFAULT_JOURNAL_RETENTION_DAYS, DOMAIN
+from .metrics import SchoolScheduleMetrics
 
 _LOGGER = logging.getLogger(__name__)
 
 STORAGE_VERSION = 1
 
+# Number of journal records kept before they are folded into the snapshot
+JOURNAL_COMPACT_THRESHOLD = 100
+
+# Delay before the last computed state is written to the startup cache
+CACHE_SAVE_DELAY = 10
+
+# Delay before packing checklists are written, so a packing spree is one write
+PACKED_SAVE_DELAY = 5
+
+# Bookkeeping keys stored alongside the document in the snapshot
+JOURNAL_SEQ_KEY = "journal_seq"
+JOURNAL_TS_KEY = "journal_ts"
+
+# Key of the document an archived journal segment starts from, in its
+# first line
+ARCHIVE_BASE_KEY = "base"
+
+
+def _diff_record(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    """Build a journal record describing the change from before to after."""
+    record: dict[str, Any] = {}
+
+    # Unchanged parts are shared between copy-on-write snapshots, so the
+    # identity checks keep the diff proportional to what actually changed.
+    changed = {
+        key: value
+        for key, value in after.items()
+        if key != "children"
+        and (value is not before.get(key) and value != before.get(key))
+    }
+    if changed:
+        record["set"] = changed
+    removed = [key for key in before if key != "children" and key not in after]
+    if removed:
+        record["unset"] = removed
+
+    before_children = {c.get("name"): c for c in before.get("children", [])}
+    after_children = {c.get("name"): c for c in after.get("children", [])}
+    children: dict[str, Any] = {
+        name: child
+        for name, child in after_children.items()
+        if child is not before_children.get(name)
+        and child != before_children.get(name)
+    }
+    for name in before_children:
+        if name not in after_children:
+            children[name] = None
+    if children:
+        record["children"] = children
+
+    if list(before_children) != list(after_children):
+        record["order"] = list(after_children)
+
+    return record
+
+
+def _apply_record(data: dict[str, Any], record: dict[str, Any]) -> None:
+    """Apply a journal record to a document in place."""
+    data.update(record.get("set", {}))
+    for key in record.get("unset", []):
+        data.pop(key, None)
+
+    children = {c.get("name"): c for c in data.get("children", [])}
+    for name, child in record.get("children", {}).items():
+        if child is None:
+            children.pop(name, None)
+        else:
+            children[name] = child
+
+    order = record.get("order", list(children))
+    data["children"] = [children[name] for name in order if name in children]
+
+
+def _replay(
+    data: dict[str, Any] | None,
+    seq: int,
+    records: list[dict[str, Any]],
+    until: datetime | None = None,
+) -> tuple[dict[str, Any] | None, int, int, datetime | None]:
+    """Apply the records after seq, up to a point in time if given.
+
+    Returns the document, its sequence number, the number of records
+    replayed and when the last one replayed was made.
+    """
+    replayed = 0
+    modified: datetime | None = None
+    for record in records:
+        if record.get("seq", 0) <= seq:
+            continue
+        record_ts = dt_util.parse_datetime(record.get("ts", ""))
+        if until is not None and (record_ts is None or record_ts > until):
+            break
+        if data is None:
+            data = {"children": []}
+        _apply_record(data, record)
+        seq = record["seq"]
+        modified = record_ts or modified
+        replayed += 1
+    return data, seq, replayed, modified
+
+
+def _parse_lines(raw: bytes) -> tuple[list[dict[str, Any]], int]:
+    """Parse complete JSON lines; return them and the bytes they span."""
+    records: list[dict[str, Any]] = []
+    valid = 0
+    for line in raw.splitlines(keepends=True):
+        if not line.endswith(b"\n"):
+            break
+        try:
+            records.append(json_loads(line))
+        except ValueError:
+            break
+        valid += len(line)
+    return records, valid
+
 
 class SchoolScheduleStore:
     """Class to manage School Schedule storage."""
 
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        metrics: SchoolScheduleMetrics | None = None,
+        retention_days: float = DEFAULT_JOURNAL_RETENTION_DAYS,
+    ) -> None:
         """Initialize the store."""
+        self._hass = hass
+        self._metrics = metrics or SchoolScheduleMetrics()
+        self._retention = timedelta(days=retention_days)
         self._store: Store = Store(
             hass,
             STORAGE_VERSION,
             f"{DOMAIN}.{entry_id}",
         )
+        self._cache: Store = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.cache",
+        )
+        self._packed: Store = Store(
+            hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.{entry_id}.packed",
+        )
+        self._journal_path = Path(
+            hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry_id}.journal")
+        )
+        self._seq = 0
+        self._last_modified: datetime | None = None
+        self._journal_records = 0
+        self._has_snapshot = False
+        self._latest: dict[str, Any] = {}
+        # (document, seq, snapshot time) the current journal started from,
+        # once known; it heads the journal's segment when archived
+        self._base: tuple[dict[str, Any] | None, int, str | None] | None = None
+        self._pending_lines: list[str] = []
+        self._compact = False
+        self._waiters: list[asyncio.Future[None]] = []
+        self._writer: asyncio.Task[None] | None = None
+
+    @property
+    def seq(self) -> int:
+        """Return the sequence number of the last persisted mutation."""
+        return self._seq
+
+    @property
+    def last_modified(self) -> datetime | None:
+        """Return when the document was last changed, if known."""
+        return self._last_modified
 
     async def async_load(self) -> dict[str, Any] | None:
-        """Load data from storage."""
-        return await self._store.async_load()
+        """Load data from storage, replaying the journal onto the snapshot."""
+        snapshot = await self._store.async_load()
+        if snapshot is None:
+            self._base = (None, 0, None)
+        else:
+            base = dict(snapshot)
+            self._base = (
+                base,
+                base.pop(JOURNAL_SEQ_KEY, 0),
+                base.pop(JOURNAL_TS_KEY, None),
+            )
+        data, seq, replayed, modified = await self._async_read(
+            snapshot, repair=True
+        )
+        self._seq = seq
+        self._last_modified = modified
+        self._journal_records = replayed
+        if replayed:
+            _LOGGER.debug("Replayed %d journal records up to #%d", replayed, seq)
+        return data
+
+    async def async_load_at(self, until: datetime) -> dict[str, Any] | None:
+        """Load the document as it was at a point in time.
+
+        Returns None if that is older than the archived journal reaches.
+        """
+        snapshot = await self._store.async_load()
+        if snapshot is not None and JOURNAL_TS_KEY in snapshot:
+            snapshot_ts = dt_util.parse_datetime(snapshot[JOURNAL_TS_KEY])
+            if snapshot_ts is not None and until < snapshot_ts:
+                return await self._hass.async_add_executor_job(
+                    self._load_archived, until
+                )
+        data, _, _, _ = await self._async_read(snapshot, until)
+        return data
+
+    async def async_append(
+        self, op: str, before: dict[str, Any], after: dict[str, Any]
+    ) -> None:
+        """Persist a mutation by appending its changes to the journal.
+
+        The record and its sequence number are assigned before the first
+        await, so callers that swap in ``after`` and call this straight away
+        get records in the same order as their in-memory changes. Records
+        appended while a write is in flight are written together with a
+        single fsync.
+        """
+        record = _diff_record(before, after)
+        if not record:
+            return
+        self._seq += 1
+        self._latest = after
+        self._last_modified = dt_util.utcnow()
+        self._pending_lines.append(
+            json_dumps(
+                {
+                    "seq": self._seq,
+                    "ts": self._last_modified.isoformat(),
+                    "op": op,
+                    **record,
+                }
+            )
+        )
+        if (
+            not self._has_snapshot
+            or self._journal_records + len(self._pending_lines)
+            > JOURNAL_COMPACT_THRESHOLD
+        ):
+            self._compact = True
+        await self._async_schedule_write()
+
+    @callback
+    def async_revert(self, data: dict[str, Any]) -> None:
+        """Take back appended changes whose records couldn't be written.
+
+        data is the document once they are taken back out of memory; it
+        becomes the base of the next snapshot. The sequence number moves on
+        rather than back, so anything keyed on it (the calendar feed's cache
+        and ETag) drops what was built from the reverted changes, and the
+        numbers handed out for them are never reused.
+        """
+        self._seq += 1
+        self._latest = data
+        self._last_modified = dt_util.utcnow()
 
     async def async_save(self, data: dict[str, Any]) -> None:
-        """Save data to storage."""
-        await self._store.async_save(data)
+        """Save a full snapshot of the data and truncate the journal."""
+        self._latest = data
+        self._compact = True
+        await self._async_schedule_write()
+
+    def _async_schedule_write(self) -> asyncio.Future[None]:
+        """Return a future that resolves once pending writes are durable."""
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._waiters.append(future)
+        if self._writer is None:
+            self._writer = self._hass.async_create_task(
+                self._async_write(), f"{DOMAIN} journal writer"
+            )
+        return future
+
+    async def _async_write(self) -> None:
+        """Write pending journal records and snapshots until none are left."""
+        try:
+            while self._waiters:
+                lines, self._pending_lines = self._pending_lines, []
+                waiters, self._waiters = self._waiters, []
+                compact, self._compact = self._compact, False
+                try:
+                    if lines:
+                        await self._async_write_lines(lines)
+                    if compact:
+                        await self._async_write_snapshot()
+                except Exception as err:
+                    for waiter in waiters:
+                        waiter.set_exception(err)
+                else:
+                    for waiter in waiters:
+                        waiter.set_result(None)
+        finally:
+            self._writer = None
+
+    async def _async_write_lines(self, lines: list[str]) -> None:
+        """Append a batch of records to the journal."""
+        with self._metrics.time("journal_append"):
+            written = await self._hass.async_add_executor_job(
+                self._append_lines, lines
+            )
+        self._journal_records += len(lines)
+        self._metrics.increment("journal_batches")
+        self._metrics.increment("bytes_written", written)
+        self._metrics.set_gauge("journal_records", self._journal_records)
+
+    async def _async_write_snapshot(self) -> None:
+        """Fold everything applied so far into a new snapshot."""
+        latest, seq = self._latest, self._seq
+        snapshot_ts = dt_util.utcnow().isoformat()
+        with self._metrics.time("store_save"):
+            await self._store.async_save(
+                {**latest, JOURNAL_SEQ_KEY: seq, JOURNAL_TS_KEY: snapshot_ts}
+            )
+            self._has_snapshot = True
+            # The snapshot now covers every journal record, so a crash before
+            # the journal is archived below is harmless: replay skips records
+            # up to its seq.
+            base, self._base = self._base, (latest, seq, snapshot_ts)
+            size = await self._hass.async_add_executor_job(
+                self._compact_journal, base
+            )
+        self._journal_records = 0
+        self._metrics.increment("bytes_written", size)
+        self._metrics.set_gauge("document_bytes", size)
+        self._metrics.set_gauge("journal_records", 0)
+
+    async def async_load_cache(self) -> dict[str, Any] | None:
+        """Load the last computed state cached for fast startup."""
+        cached = await self._cache.async_load()
+        if cached:
+            self._metrics.hit("startup_cache")
+        else:
+            self._metrics.miss("startup_cache")
+        return cached
+
+    @callback
+    def async_delay_save_cache(self, data: dict[str, Any]) -> None:
+        """Schedule a write of the last computed state."""
+        self._cache.async_delay_save(lambda: data, CACHE_SAVE_DELAY)
+
+    async def async_load_packed(self) -> dict[str, Any] | None:
+        """Load the packing checklists."""
+        return await self._packed.async_load()
+
+    @callback
+    def async_delay_save_packed(
+        self, data_func: Callable[[], dict[str, Any]]
+    ) -> None:
+        """Schedule a write of the packing checklists."""
+        self._packed.async_delay_save(data_func, PACKED_SAVE_DELAY)
 
     async def async_remove(self) -> None:
         """Remove storage file."""
         await self._store.async_remove()
+        await self._cache.async_remove()
+        await self._packed.async_remove()
+        await self._hass.async_add_executor_job(self._remove_journal)
+        await self._hass.async_add_executor_job(self._remove_archives)
+
+    async def _async_read(
+        self,
+        snapshot: dict[str, Any] | None,
+        until: datetime | None = None,
+        repair: bool = False,
+    ) -> tuple[dict[str, Any] | None, int, int, datetime | None]:
+        """Replay journal records on top of a loaded snapshot.
+
+        Returns the document, its sequence number, the number of records
+        replayed and when the last change included was made. Only the
+        startup load may repair the journal; later reads can race a batch
+        being appended, whose partial tail must be left alone.
+        """
+        records = await self._hass.async_add_executor_job(
+            self._read_journal, repair
+        )
+
+        data: dict[str, Any] | None = None
+        seq = 0
+        modified: datetime | None = None
+        if snapshot is not None:
+            self._has_snapshot = True
+            data = dict(snapshot)
+            seq = data.pop(JOURNAL_SEQ_KEY, 0)
+            modified = dt_util.parse_datetime(data.pop(JOURNAL_TS_KEY, ""))
+
+        data, seq, replayed, replayed_modified = _replay(data, seq, records, until)
+        return data, seq, replayed, replayed_modified or modified
+
+    def _read_journal(self, repair: bool = False) -> list[dict[str, Any]]:
+        """Read complete journal records.
+
+        With repair, a torn record left by a crash is cut off the file;
+        otherwise an incomplete last line is only skipped.
+        """
+        try:
+            raw = self._journal_path.read_bytes()
+        except FileNotFoundError:
+            return []
+
+        records, valid = _parse_lines(raw)
+        if repair and valid < len(raw):
+            _LOGGER.warning(
+                "Discarding %d bytes of incomplete data at the end of %s",
+                len(raw) - valid,
+                self._journal_path,
+            )
+            with self._journal_path.open("r+b") as journal:
+                journal.truncate(valid)
+
+        return records
+
+    def _append_lines(self, lines: list[str]) -> int:
+        """Append records to the journal, flush them to disk and return size.
+
+        If the write fails, whatever part of the batch reached the file is
+        cut off again, so later batches don't land behind a torn record.
+        """
+        payload = "".join(f"{line}\n" for line in lines).encode()
+        self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._journal_path.open("ab") as journal:
+            start = journal.tell()
+            try:
+                journal.write(payload)
+                journal.flush()
+                os.fsync(journal.fileno())
+            except OSError:
+                with suppress(OSError):
+                    journal.truncate(start)
+                raise
+        return len(payload)
+
+    def _compact_journal(
+        self, base: tuple[dict[str, Any] | None, int, str | None] | None
+    ) -> int:
+        """Archive the journal once folded and return the snapshot size.
+
+        Without a known base (the store was written without being loaded
+        first) the segment couldn't be replayed, so it is dropped.
+        """
+        if base is not None and self._retention > timedelta(0):
+            self._archive_journal(base)
+        self._remove_journal()
+        self._expire_archives()
+        return os.path.getsize(self._store.path)
+
+    def _archive_journal(
+        self, base: tuple[dict[str, Any] | None, int, str | None]
+    ) -> None:
+        """Copy the journal to a segment headed by the document it started from."""
+        try:
+            raw = self._journal_path.read_bytes()
+        except FileNotFoundError:
+            return
+        records, valid = _parse_lines(raw)
+        if not records:
+            return
+        document, seq, snapshot_ts = base
+        header = json_dumps(
+            {"seq": seq, "ts": snapshot_ts, ARCHIVE_BASE_KEY: document}
+        )
+        # Named after the last seq it holds, so names sort in order
+        path = self._journal_path.with_name(
+            f"{self._journal_path.name}.{records[-1]['seq']:010d}"
+        )
+        temp = path.with_name(f"{path.name}.tmp")
+        with temp.open("wb") as archive:
+            archive.write(f"{header}\n".encode())
+            archive.write(raw[:valid])
+            archive.flush()
+            os.fsync(archive.fileno())
+        os.replace(temp, path)
+
+    def _archives(self) -> list[Path]:
+        """Return the archived journal segments, oldest first."""
+        prefix = f"{self._journal_path.name}."
+        return sorted(
+            path
+            for path in self._journal_path.parent.glob(f"{prefix}*")
+            if path.name[len(prefix) :].isdigit()
+        )
+
+    def _expire_archives(self) -> None:
+        """Remove segments archived longer ago than the retention."""
+        cutoff = time.time() - self._retention.total_seconds()
+        for path in self._archives():
+            if path.stat().st_mtime >= cutoff:
+                break
+            path.unlink(missing_ok=True)
+
+    def _load_archived(self, until: datetime) -> dict[str, Any] | None:
+        """Replay archived segments to rebuild the document at a point in time."""
+        segments: list[list[dict[str, Any]]] = []
+        for path in reversed(self._archives()):
+            records, _ = _parse_lines(path.read_bytes())
+            if not records:
+                continue
+            segments.append(records)
+            base_ts = records[0].get("ts")
+            parsed = dt_util.parse_datetime(base_ts) if base_ts else None
+            if base_ts is None or (parsed is not None and parsed <= until):
+                break
+        else:
+            # Nothing archived starts early enough
+            return None
+
+        header = segments[-1][0]
+        base = header.get(ARCHIVE_BASE_KEY)
+        data = dict(base) if base is not None else None
+        seq = header.get("seq", 0)
+        for records in reversed(segments):
+            data, seq, _, _ = _replay(data, seq, records[1:], until)
+        return data
+
+    def _remove_journal(self) -> None:
+        """Remove the journal file."""
+        self._journal_path.unlink(missing_ok=True)
+
+    def _remove_archives(self) -> None:
+        """Remove every archived journal segment."""
+        for path in self._archives():
+            path.unlink(missing_ok=True)
@@ -0,0 +1,163 @@
+"""Todo platform for School Schedule - each child's items as a to-do list."""
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Any
+
+from homeassistant.components.todo import (
+    TodoItem,
+    TodoItemStatus,
+    TodoListEntity,
+    TodoListEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import SchoolScheduleCoordinator
+from .sensor import child_display_date
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up School Schedule to-do lists from a config entry."""
+    coordinator: SchoolScheduleCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # A list per child, as children come and go
+    coordinator.async_add_child_entities(
+        entry,
+        async_add_entities,
+        lambda child_name: [SchoolScheduleTodoList(coordinator, entry, child_name)],
+    )
+
+
+class SchoolScheduleTodoList(
+    CoordinatorEntity[SchoolScheduleCoordinator], TodoListEntity
+):
+    """A child's items for the displayed date; completing one packs it.
+
+    Each update is diffed against the current list by item ID: unchanged
+    items keep their TodoItem, and an update that changes nothing (most of
+    the once-a-minute refreshes) writes no state at all.
+    """
+
+    _attr_supported_features = TodoListEntityFeature.UPDATE_TODO_ITEM
+
+    def __init__(
+        self,
+        coordinator: SchoolScheduleCoordinator,
+        entry: ConfigEntry,
+        child_name: str,
+    ) -> None:
+        """Initialize the to-do list."""
+        super().__init__(coordinator)
+        self._child_name = child_name
+        self._attr_unique_id = f"{entry.entry_id}_{child_name}_todo"
+        self._attr_name = f"{child_name} Items"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+        self._day: str | None = None
+        # item ID -> its entry in the list, in display order
+        self._items: dict[str, TodoItem] = {}
+        self._was_available = False
+        self._async_diff_items()
+
+    async def async_added_to_hass(self) -> None:
+        """Listen for changes to the child's packing checklist."""
+        await super().async_added_to_hass()
+        self._was_available = self.available
+        self.async_on_remove(
+            self.coordinator.checklist.async_add_listener(
+                self._child_name, self._handle_coordinator_update
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return True while the child exists."""
+        return super().available and self._child_name in (
+            self.coordinator.data or {}
+        ).get("children", {})
+
+    @callback
+    def _async_diff_items(self) -> bool:
+        """Bring the list in line with the displayed date; return True if changed."""
+        data = self.coordinator.data or {}
+        day = child_display_date(data, self._child_name)
+        child_data: dict[str, Any] = data.get("children", {}).get(self._child_name) or {}
+        packed = (
+            self.coordinator.checklist.packed(self._child_name, day) if day else set()
+        )
+
+        changed = day != self._day
+        self._day = day
+        due = date.fromisoformat(day) if day else None
+        items: dict[str, TodoItem] = {}
+        for item in child_data.get("items_today", []):
+            item_id = item["id"]
+            if item_id in items:
+                continue
+            summary = item.get("name") or item_id
+            status = (
+                TodoItemStatus.COMPLETED
+                if item_id in packed
+                else TodoItemStatus.NEEDS_ACTION
+            )
+            todo_item = self._items.get(item_id)
+            if (
+                todo_item is None
+                or todo_item.summary != summary
+                or todo_item.status != status
+                or todo_item.due != due
+            ):
+                todo_item = TodoItem(
+                    summary=summary, uid=item_id, status=status, due=due
+                )
+                changed = True
+            items[item_id] = todo_item
+
+        # Items removed or reordered
+        if not changed and list(items) != list(self._items):
+            changed = True
+        if changed:
+            self._items = items
+            self._attr_todo_items = list(items.values())
+        return changed
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the list or availability changed."""
+        available = self.available
+        if self._async_diff_items() or available != self._was_available:
+            self._was_available = available
+            self.async_write_ha_state()
+
+    async def async_update_todo_item(self, item: TodoItem) -> None:
+        """Pack or unpack an item; the items themselves come from the schedule."""
+        current = self._items.get(item.uid or "")
+        if current is None:
+            raise HomeAssistantError(f"Item '{item.uid}' is not on the list")
+        if item.summary != current.summary:
+            raise HomeAssistantError(
+                "Items are renamed in the schedule, not in the to-do list"
+            )
+        await self.coordinator.async_set_packed(
+            self._child_name,
+            current.uid,
+            date.fromisoformat(self._day) if self._day else None,
+            item.status == TodoItemStatus.COMPLETED,
+        )
+
+    @property
+    def icon(self) -> str:
+        """Return the icon."""
+        return "mdi:bag-personal-outline"
@@ -0,0 +1,346 @@
+"""Import and export of whole School Schedule documents.
+
+Documents can be exchanged as JSON or YAML, which mirror the stored
+document, or as CSV in a long format with one row per fact:
+
+    type,child,when,item_id,name,image
+    switchover,,12:00,,,
+    library,,,hat,Hat,/local/school/hat.png
+    child,Emma,,,,
+    switchover,Emma,15:30,,,
+    time_zone,Emma,Europe/London,,,
+    item,Emma,,formal_uniform,Formal Uniform,/local/school/formal.png
+    ref,Emma,,hat,,
+    weekly,Emma,monday,formal_uniform,,
+    exception,Emma,2025-03-15,hat,,
+    exception,Emma,2025-03-16,,,
+
+A ref row gives a child a library item; a name or image on it overrides
+the library's for that child. An exception row without an item ID marks a
+day with no items. A switchover row with a child, and a time_zone row, give
+that child its own.
+"""
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime
+from typing import Any
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+from homeassistant.util.yaml import dump, parse_yaml
+
+from .const import DAYS_OF_WEEK, DEFAULT_SWITCHOVER_TIME
+from .schedule import ITEM_FIELDS, is_reference
+
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+FORMAT_YAML = "yaml"
+FORMATS = [FORMAT_JSON, FORMAT_CSV, FORMAT_YAML]
+
+CSV_FIELDS = ["type", "child", "when", "item_id", "name", "image"]
+
+
+def export_document(data: dict[str, Any], fmt: str) -> str:
+    """Serialize a schedule document."""
+    document = {
+        "switchover_time": data.get("switchover_time", DEFAULT_SWITCHOVER_TIME),
+        "item_library": data.get("item_library", []),
+        "children": data.get("children", []),
+    }
+    if fmt == FORMAT_JSON:
+        return json_dumps(document)
+    if fmt == FORMAT_YAML:
+        return dump(document)
+    return _export_csv(document)
+
+
+def _export_csv(document: dict[str, Any]) -> str:
+    """Write a document as long-format CSV rows."""
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+    writer.writerow(["switchover", "", document["switchover_time"], "", "", ""])
+    for item in document["item_library"]:
+        writer.writerow(
+            ["library", "", "", item.get("id"), item.get("name"), item.get("image", "")]
+        )
+    for child in document["children"]:
+        name = child.get("name")
+        writer.writerow(["child", name, "", "", "", ""])
+        if child.get("switchover_time"):
+            writer.writerow(["switchover", name, child["switchover_time"], "", "", ""])
+        if child.get("time_zone"):
+            writer.writerow(["time_zone", name, child["time_zone"], "", "", ""])
+        for item in child.get("items", []):
+            writer.writerow(
+                [
+                    "ref" if is_reference(item) else "item",
+                    name,
+                    "",
+                    item.get("id"),
+                    item.get("name", ""),
+                    item.get("image", ""),
+                ]
+            )
+        for day, item_ids in child.get("weekly_schedule", {}).items():
+            for item_id in item_ids:
+                writer.writerow(["weekly", name, day, item_id, "", ""])
+        for date_str, item_ids in child.get("exceptions", {}).items():
+            if not item_ids:
+                writer.writerow(["exception", name, date_str, "", "", ""])
+            for item_id in item_ids:
+                writer.writerow(["exception", name, date_str, item_id, "", ""])
+    return output.getvalue()
+
+
+def parse_document(content: str, fmt: str) -> dict[str, Any]:
+    """Parse and validate a schedule document."""
+    if fmt == FORMAT_CSV:
+        raw = _parse_csv(content)
+    else:
+        try:
+            raw = json_loads(content) if fmt == FORMAT_JSON else parse_yaml(content)
+        except (HomeAssistantError, ValueError) as err:
+            raise HomeAssistantError(f"Could not parse {fmt} document: {err}") from err
+    if not isinstance(raw, dict):
+        raise HomeAssistantError("Document must be a mapping")
+    return validate_document(raw)
+
+
+def _parse_csv(content: str) -> dict[str, Any]:
+    """Build a document from long-format CSV rows."""
+    reader = csv.DictReader(io.StringIO(content))
+    missing = set(CSV_FIELDS) - set(reader.fieldnames or [])
+    if missing:
+        raise HomeAssistantError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+    document: dict[str, Any] = {"item_library": [], "children": []}
+    children: dict[str, dict[str, Any]] = {}
+
+    def child_for(row: dict[str, str], line: int) -> dict[str, Any]:
+        name = (row["child"] or "").strip()
+        if not name:
+            raise HomeAssistantError(f"Line {line}: child is required")
+        if name not in children:
+            children[name] = {
+                "name": name,
+                "items": [],
+                "weekly_schedule": {},
+                "exceptions": {},
+            }
+            document["children"].append(children[name])
+        return children[name]
+
+    for row in reader:
+        line = reader.line_num
+        kind = (row["type"] or "").strip()
+        item_id = (row["item_id"] or "").strip()
+        when = (row["when"] or "").strip()
+        if kind == "switchover" and (row["child"] or "").strip():
+            child_for(row, line)["switchover_time"] = when
+        elif kind == "switchover":
+            document["switchover_time"] = when
+        elif kind == "time_zone":
+            child_for(row, line)["time_zone"] = when
+        elif kind == "library":
+            document["item_library"].append(
+                {"id": item_id, "name": row["name"] or "", "image": row["image"] or ""}
+            )
+        elif kind == "child":
+            child_for(row, line)
+        elif kind == "item":
+            child_for(row, line)["items"].append(
+                {"id": item_id, "name": row["name"] or "", "image": row["image"] or ""}
+            )
+        elif kind == "ref":
+            reference: dict[str, Any] = {"id": item_id, "library": True}
+            for field in ITEM_FIELDS:
+                if row[field]:
+                    reference[field] = row[field]
+            child_for(row, line)["items"].append(reference)
+        elif kind == "weekly":
+            day_items = child_for(row, line)["weekly_schedule"].setdefault(when, [])
+            if item_id:
+                day_items.append(item_id)
+        elif kind == "exception":
+            date_items = child_for(row, line)["exceptions"].setdefault(when, [])
+            if item_id:
+                date_items.append(item_id)
+        else:
+            raise HomeAssistantError(f"Line {line}: unknown row type '{kind}'")
+
+    return document
+
+
+def _validate_items(
+    items: Any, where: str, library: dict[str, dict[str, Any]] | None = None
+) -> list[dict[str, Any]]:
+    """Validate a list of item definitions.
+
+    With a library, items may refer to library items, and copies of library
+    items are turned into references.
+    """
+    if not isinstance(items, list):
+        raise HomeAssistantError(f"{where}: items must be a list")
+    result: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for item in items:
+        if not isinstance(item, dict) or not item.get("id"):
+            raise HomeAssistantError(f"{where}: every item needs an id and a name")
+        item_id = str(item["id"])
+        if item_id in seen:
+            raise HomeAssistantError(f"{where}: duplicate item ID '{item_id}'")
+        seen.add(item_id)
+        if library is not None and is_reference(item):
+            if item_id not in library:
+                raise HomeAssistantError(f"{where}: '{item_id}' is not in the library")
+            reference: dict[str, Any] = {"id": item_id, "library": True}
+            for field in ITEM_FIELDS:
+                if item.get(field) is not None:
+                    reference[field] = str(item[field])
+            result.append(link_library_item(reference, library))
+            continue
+        if not item.get("name"):
+            raise HomeAssistantError(f"{where}: every item needs an id and a name")
+        own = {"id": item_id, "name": str(item["name"]), "image": str(item.get("image") or "")}
+        result.append(own if library is None else link_library_item(own, library))
+    return result
+
+
+def link_library_item(
+    item: dict[str, Any], library: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Return a child's item as a reference if it is a library item.
+
+    Copies made by earlier versions become references that keep only the
+    fields that differ from the library, so the child sees the same item.
+    """
+    base = library.get(item.get("id"))
+    if base is None:
+        return item
+    reference: dict[str, Any] = {"id": item["id"], "library": True}
+    for field in ITEM_FIELDS:
+        if field in item and item[field] != base.get(field, ""):
+            reference[field] = item[field]
+    return reference
+
+
+def link_library_items(document: dict[str, Any]) -> None:
+    """Turn copies of library items in a stored document into references."""
+    library = {item["id"]: item for item in document.get("item_library", [])}
+    if not library:
+        return
+    for child in document.get("children", []):
+        child["items"] = [
+            link_library_item(item, library) for item in child.get("items", [])
+        ]
+
+
+def _validate_ids(item_ids: Any, valid_ids: set[str], where: str) -> list[str]:
+    """Validate a list of item IDs against the items a child can use."""
+    if not isinstance(item_ids, list):
+        raise HomeAssistantError(f"{where}: item IDs must be a list")
+    item_ids = [str(item_id) for item_id in item_ids]
+    invalid_ids = set(item_ids) - valid_ids
+    if invalid_ids:
+        raise HomeAssistantError(
+            f"{where}: invalid item IDs: {', '.join(sorted(invalid_ids))}"
+        )
+    return item_ids
+
+
+def _validate_switchover(value: Any, where: str = "") -> str:
+    """Validate an HH:MM switchover time."""
+    switchover_time = str(value)
+    try:
+        datetime.strptime(switchover_time, "%H:%M")
+    except ValueError as err:
+        raise HomeAssistantError(
+            f"{where}Invalid switchover time '{switchover_time}'. Use HH:MM."
+        ) from err
+    return switchover_time
+
+
+def validate_document(raw: dict[str, Any]) -> dict[str, Any]:
+    """Check a document against the same rules as the services.
+
+    Returns a normalized copy: every child has all days of the week, holds
+    library items as references, and schedules only refer to the child's
+    items or the shared library.
+    Raises HomeAssistantError describing the first problem found.
+    """
+    library = _validate_items(raw.get("item_library", []), "Library")
+    library_items = {item["id"]: item for item in library}
+    library_ids = set(library_items)
+
+    raw_children = raw.get("children", [])
+    if not isinstance(raw_children, list):
+        raise HomeAssistantError("children must be a list")
+
+    children: list[dict[str, Any]] = []
+    names: set[str] = set()
+    for raw_child in raw_children:
+        if not isinstance(raw_child, dict) or not raw_child.get("name"):
+            raise HomeAssistantError("Every child needs a name")
+        name = str(raw_child["name"])
+        if name in names:
+            raise HomeAssistantError(f"Child '{name}' appears more than once")
+        names.add(name)
+
+        items = _validate_items(raw_child.get("items", []), name, library_items)
+        valid_ids = library_ids | {item["id"] for item in items}
+
+        weekly_schedule = raw_child.get("weekly_schedule") or {}
+        invalid_days = set(weekly_schedule) - set(DAYS_OF_WEEK)
+        if invalid_days:
+            raise HomeAssistantError(
+                f"{name}: invalid days: {', '.join(sorted(invalid_days))}"
+            )
+
+        exceptions: dict[str, list[str]] = {}
+        for date_str, item_ids in (raw_child.get("exceptions") or {}).items():
+            date_str = str(date_str)
+            try:
+                datetime.strptime(date_str, "%Y-%m-%d")
+            except ValueError as err:
+                raise HomeAssistantError(
+                    f"{name}: invalid date format '{date_str}'. Use YYYY-MM-DD."
+                ) from err
+            exceptions[date_str] = _validate_ids(
+                item_ids or [], valid_ids, f"{name} on {date_str}"
+            )
+
+        child: dict[str, Any] = {
+            "name": name,
+            "items": items,
+            "weekly_schedule": {
+                day: _validate_ids(
+                    weekly_schedule.get(day) or [], valid_ids, f"{name} on {day}"
+                )
+                for day in DAYS_OF_WEEK
+            },
+            "exceptions": exceptions,
+        }
+        if raw_child.get("switchover_time"):
+            child["switchover_time"] = _validate_switchover(
+                raw_child["switchover_time"], f"{name}: "
+            )
+        if raw_child.get("time_zone"):
+            time_zone = str(raw_child["time_zone"])
+            if dt_util.get_time_zone(time_zone) is None:
+                raise HomeAssistantError(f"{name}: unknown time zone '{time_zone}'")
+            child["time_zone"] = time_zone
+        children.append(child)
+
+    document: dict[str, Any] = {"item_library": library, "children": children}
+
+    # Left out when not given, so a merge keeps the current one
+    if raw.get("switchover_time"):
+        document["switchover_time"] = _validate_switchover(raw["switchover_time"])
+
+    return document
+
@@ -0,0 +1,195 @@
+"""Daily item usage in Home Assistant's long-term statistics.
+
+Once a day the number of items each child needs, and the number of children
+that need each item, are added to the recorder as external statistics
+(``school_schedule:<child>_items`` and ``school_schedule:item_<id>``). Each
+row is one day and its sum is the running total, so statistics graphs can
+show usage over months without the sensor's attributes being recorded.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+from .schedule import CompiledSchedule
+
+if TYPE_CHECKING:
+    from homeassistant.components.recorder.models import StatisticMetaData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Days filled in after Home Assistant was stopped for a while
+MAX_BACKFILL_DAYS = 31
+
+
+def _statistic_slug(text: str) -> str:
+    """Return a slug for a statistic ID, hashed if text has nothing to slug.
+
+    slugify() gives "" or "unknown" for text without letters or digits it
+    can spell out (an all-emoji name, say), which would make an invalid ID
+    or one shared with other such names.
+    """
+    slug = slugify(text)
+    if not slug or (slug == "unknown" and "unknown" not in text.lower()):
+        return hashlib.sha256(text.encode()).hexdigest()[:16]
+    return slug
+
+
+def _child_statistic_id(child_name: str) -> str:
+    return f"{DOMAIN}:{_statistic_slug(child_name)}_items"
+
+
+def _item_statistic_id(item_id: str) -> str:
+    return f"{DOMAIN}:item_{_statistic_slug(item_id)}"
+
+
+def _day_start(day: date) -> datetime:
+    """Return the start of a local day, on the hour as statistics require."""
+    start = dt_util.as_utc(
+        datetime.combine(day, time.min, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    )
+    # Half-hour time zones start the day between hours
+    return start.replace(minute=0, second=0, microsecond=0)
+
+
+def _row_day(start_ts: float) -> date:
+    """Return the local day a row recorded by _day_start belongs to."""
+    return dt_util.as_local(
+        dt_util.utc_from_timestamp(start_ts) + timedelta(hours=1)
+    ).date()
+
+
+def _metadata(statistic_id: str, name: str, unit: str) -> StatisticMetaData:
+    return {
+        "has_mean": False,
+        "has_sum": True,
+        "name": name,
+        "source": DOMAIN,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
+
+
+def _day_counts(schedules: dict[str, CompiledSchedule], day: date) -> Counter[str]:
+    """Count items per child and children per item on a day."""
+    counts: Counter[str] = Counter()
+    for child_name, schedule in schedules.items():
+        items = schedule.items_for(day)
+        counts[_child_statistic_id(child_name)] = len(items)
+        for item_id in {item["id"] for item in items}:
+            counts[_item_statistic_id(item_id)] += 1
+    return counts
+
+
+class UsageStatistics:
+    """Record what was needed each day as long-term statistics."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the recorder of usage statistics."""
+        self._hass = hass
+        self._recorded_through: date | None = None
+        self._recording = False
+        # Statistic IDs the recorder refused, which aren't offered again
+        self._rejected: set[str] = set()
+
+    @callback
+    def async_update(
+        self, schedules: dict[str, CompiledSchedule], today: date
+    ) -> None:
+        """Record the days up to today that haven't been recorded yet."""
+        if (
+            self._recording
+            or self._recorded_through == today
+            or "recorder" not in self._hass.config.components
+        ):
+            return
+        self._recording = True
+        self._hass.async_create_background_task(
+            self._async_record(schedules, today), f"{DOMAIN} usage statistics"
+        )
+
+    async def _async_record(
+        self, schedules: dict[str, CompiledSchedule], today: date
+    ) -> None:
+        """Add a row per statistic for each day since its last one."""
+        # The recorder is optional, so it's only imported once it's loaded
+        from homeassistant.components.recorder import get_instance
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+
+        try:
+            metadata: dict[str, StatisticMetaData] = {}
+            for child_name, schedule in schedules.items():
+                statistic_id = _child_statistic_id(child_name)
+                metadata[statistic_id] = _metadata(
+                    statistic_id, f"{child_name} items needed", "items"
+                )
+                for items in (*schedule.weekly, *schedule.exceptions.values()):
+                    for item in items:
+                        statistic_id = _item_statistic_id(item["id"])
+                        if statistic_id not in metadata:
+                            metadata[statistic_id] = _metadata(
+                                statistic_id,
+                                f"{item.get('name', item['id'])} needed",
+                                "children",
+                            )
+            for statistic_id in self._rejected:
+                metadata.pop(statistic_id, None)
+
+            last = await get_instance(self._hass).async_add_executor_job(
+                self._last_rows, list(metadata)
+            )
+
+            counts: dict[date, Counter[str]] = {}
+            earliest = today - timedelta(days=MAX_BACKFILL_DAYS)
+            for statistic_id, meta in metadata.items():
+                total = 0.0
+                day = today
+                if (row := last.get(statistic_id)) is not None:
+                    total = row.get("sum") or 0.0
+                    day = max(_row_day(row["start"]) + timedelta(days=1), earliest)
+                rows: list[dict[str, Any]] = []
+                while day <= today:
+                    if day not in counts:
+                        counts[day] = _day_counts(schedules, day)
+                    needed = counts[day][statistic_id]
+                    total += needed
+                    rows.append({"start": _day_start(day), "state": needed, "sum": total})
+                    day += timedelta(days=1)
+                if not rows:
+                    continue
+                try:
+                    async_add_external_statistics(self._hass, meta, rows)
+                except HomeAssistantError as err:
+                    self._rejected.add(statistic_id)
+                    _LOGGER.warning(
+                        "Usage statistic %s was refused and won't be recorded: %s",
+                        statistic_id,
+                        err,
+                    )
+
+            self._recorded_through = today
+            _LOGGER.debug("Recorded usage statistics through %s", today)
+        finally:
+            self._recording = False
+
+    def _last_rows(self, statistic_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Return the last recorded row of each statistic."""
+        from homeassistant.components.recorder.statistics import get_last_statistics
+
+        last: dict[str, dict[str, Any]] = {}
+        for statistic_id in statistic_ids:
+            rows = get_last_statistics(self._hass, 1, statistic_id, False, {"sum"})
+            if rows.get(statistic_id):
+                last[statistic_id] = rows[statistic_id][0]
+        return last
@@ -0,0 +1,192 @@
+"""Shared helpers for the local performance harnesses.
+
+The harnesses drive the integration against an in-process Home Assistant
+core with a throwaway config directory. Nothing else is set up (no HTTP,
+no recorder, no frontend), so they only need the ``homeassistant`` package:
+
+    pip install homeassistant
+"""
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timedelta, tzinfo
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.school_schedule.const import (  # noqa: E402
+    DAYS_OF_WEEK,
+    DEFAULT_SWITCHOVER_TIME,
+    DOMAIN,
+)
+from custom_components.school_schedule.store import SchoolScheduleStore  # noqa: E402
+
+TIME_ZONE = "Australia/Sydney"
+
+
+@asynccontextmanager
+async def async_test_home_assistant() -> AsyncIterator[HomeAssistant]:
+    """Yield a bare Home Assistant core backed by a temporary config dir."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        dt_util.set_default_time_zone(dt_util.get_time_zone(TIME_ZONE))
+        hass = HomeAssistant(config_dir)
+        try:
+            yield hass
+            await hass.async_block_till_done()
+        finally:
+            await hass.async_stop(force=True)
+
+
+class FakeClock:
+    """A settable stand-in for ``dt_util.now()`` and ``dt_util.utcnow()``.
+
+    Only code that reads the time through ``dt_util`` sees it; the event
+    loop and its timers keep running on real time.
+    """
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the clock at an aware datetime."""
+        self._utc = dt_util.as_utc(start)
+
+    def now(self, time_zone: tzinfo | None = None) -> datetime:
+        """Return the fake time in a time zone, the default one if None."""
+        return self._utc.astimezone(time_zone or dt_util.DEFAULT_TIME_ZONE)
+
+    def utcnow(self) -> datetime:
+        """Return the fake time in UTC."""
+        return self._utc
+
+    def set(self, when: datetime) -> None:
+        """Move the clock to an aware datetime, forwards or back."""
+        self._utc = dt_util.as_utc(when)
+
+    def advance(self, delta: timedelta) -> None:
+        """Move the clock on by a duration."""
+        self._utc += delta
+
+    @contextmanager
+    def installed(self) -> Iterator[FakeClock]:
+        """Replace the dt_util clock functions while the block runs."""
+        real_now, real_utcnow = dt_util.now, dt_util.utcnow
+        dt_util.now, dt_util.utcnow = self.now, self.utcnow
+        try:
+            yield self
+        finally:
+            dt_util.now, dt_util.utcnow = real_now, real_utcnow
+
+
+def make_entry(entry_id: str = "perf") -> Any:
+    """Return a stand-in for the config entry the coordinator is bound to."""
+    return SimpleNamespace(entry_id=entry_id, data={}, options={}, title="Perf")
+
+
+def install_entry(hass: HomeAssistant, entry: Any, coordinator: Any) -> None:
+    """Make a coordinator the one the integration's services act on."""
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+    hass.config_entries = SimpleNamespace(
+        async_entries=lambda domain=None: [entry]
+    )
+
+
+def generate_household(
+    children: int,
+    items: int,
+    library: int,
+    exceptions: int,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Generate a synthetic stored document.
+
+    Each child gets ``items`` own items, ``exceptions`` date exceptions spread
+    over the coming years and a weekly schedule drawing on both its own
+    items and the ``library`` shared items.
+    """
+    rng = random.Random(seed)
+    item_library = [
+        {
+            "id": f"lib_{i}",
+            "name": f"Library Item {i}",
+            "image": f"/local/school-schedule/lib_{i}.png",
+        }
+        for i in range(library)
+    ]
+
+    start = date(2025, 1, 1)
+    document_children = []
+    for c in range(children):
+        own = [
+            {
+                "id": f"item_{c}_{i}",
+                "name": f"Item {i}",
+                "image": f"/local/school-schedule/item_{c}_{i}.png",
+            }
+            for i in range(items)
+        ]
+        pool = [item["id"] for item in own] + [item["id"] for item in item_library]
+        weekly = {
+            day: rng.sample(pool, min(len(pool), rng.randint(0, 4)))
+            if day not in ("saturday", "sunday")
+            else []
+            for day in DAYS_OF_WEEK
+        }
+        exception_dates = rng.sample(range(5 * 365), min(exceptions, 5 * 365))
+        child_exceptions = {
+            (start + timedelta(days=offset)).isoformat(): rng.sample(
+                pool, min(len(pool), rng.randint(0, 3))
+            )
+            for offset in sorted(exception_dates)
+        }
+        document_children.append(
+            {
+                "name": f"Child {c}",
+                "items": own,
+                "weekly_schedule": weekly,
+                "exceptions": child_exceptions,
+            }
+        )
+
+    return {
+        "children": document_children,
+        "item_library": item_library,
+        "switchover_time": DEFAULT_SWITCHOVER_TIME,
+    }
+
+
+async def async_seed_store(
+    hass: HomeAssistant, entry_id: str, document: dict[str, Any]
+) -> SchoolScheduleStore:
+    """Write a document as the entry's stored snapshot."""
+    store = SchoolScheduleStore(hass, entry_id)
+    await store.async_save(document)
+    return store
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the pct-th percentile of the samples (nearest rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Summarize timing samples in milliseconds."""
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3),
+        "rounds": len(samples),
+    }
@@ -0,0 +1,105 @@
+"""Measure how long the integration takes to become usable at startup.
+
+Reports the import cost of the integration's modules (each in a fresh
+interpreter) and the time from creating the coordinator until entities can
+be created, for a fresh install, a cold start that has to load and compute
+the store, and a warm start from the cached last-known state.
+
+    python scripts/perf/setup_time.py [--children N] [--rounds N]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+
+from harness import (
+    REPO_ROOT,
+    async_seed_store,
+    async_test_home_assistant,
+    generate_household,
+    make_entry,
+    summarize,
+)
+
+from custom_components.school_schedule.coordinator import SchoolScheduleCoordinator
+
+PACKAGE = "custom_components.school_schedule"
+MODULES = ["", ".coordinator", ".services", ".http_api"]
+
+
+def measure_import(module: str, rounds: int) -> dict[str, float]:
+    """Time importing a module in fresh interpreters."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {PACKAGE}{module}; "
+        "print(time.perf_counter() - start)"
+    )
+    samples = [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=REPO_ROOT,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(rounds)
+    ]
+    return summarize(samples)
+
+
+async def async_measure_startup(children: int, rounds: int) -> dict[str, dict]:
+    """Time coordinator startup until entity data is available."""
+    results: dict[str, list[float]] = {"fresh": [], "cold": [], "warm": []}
+    document = generate_household(children, 10, 20, 50)
+
+    for _ in range(rounds):
+        async with async_test_home_assistant() as hass:
+            start = time.perf_counter()
+            coordinator = SchoolScheduleCoordinator(hass, make_entry())
+            if not await coordinator.async_load_cached_state():
+                await coordinator.async_refresh()
+            results["fresh"].append(time.perf_counter() - start)
+
+            await async_seed_store(hass, "perf", document)
+            start = time.perf_counter()
+            coordinator = SchoolScheduleCoordinator(hass, make_entry())
+            await coordinator.async_refresh()
+            results["cold"].append(time.perf_counter() - start)
+
+            # Make sure the cache the cold start scheduled is on disk
+            await coordinator.store._cache.async_save(coordinator._cached_result)
+            start = time.perf_counter()
+            coordinator = SchoolScheduleCoordinator(hass, make_entry())
+            if not await coordinator.async_load_cached_state():
+                raise RuntimeError("Startup cache was not written")
+            results["warm"].append(time.perf_counter() - start)
+            await coordinator.async_refresh()
+
+    return {name: summarize(samples) for name, samples in results.items()}
+
+
+def main() -> None:
+    """Run the measurements and print them as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--children", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    report = {
+        "imports": {
+            (PACKAGE + module): measure_import(module, args.rounds)
+            for module in MODULES
+        },
+        "startup": asyncio.run(async_measure_startup(args.children, args.rounds)),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
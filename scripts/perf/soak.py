@@ -0,0 +1,267 @@
+"""Soak test: years of simulated operation in a few minutes.
+
+A fake clock stands in for ``dt_util.now()`` and walks the coordinator
+through thousands of days. As it passes each day boundary and reminder it
+goes off the timer the coordinator set for it, as production would, since
+nothing is polled. Each day it also adds exceptions and ticks items off
+the packing checklist, now and then moving the switchover time. Every
+``--sample-days`` it records:
+
+- traced memory (tracemalloc, after a garbage collection)
+- stored document size (serialized, as a snapshot would write it)
+- state attribute size of the master sensor
+- median latency of handling a day boundary since the last sample
+- median journal append latency since the last sample
+
+    python scripts/perf/soak.py [--days N] [--sample-days N] [--children N]
+
+Exceptions pile up as the simulated years pass, so sizes are expected to
+grow linearly. The test fails when a series grows super-linearly: when its
+growth over the second half of the run is more than ``--max-growth-ratio``
+times its growth over the first half (with a per-series noise floor, so
+flat but jittery series pass).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from harness import (
+    FakeClock,
+    async_seed_store,
+    async_test_home_assistant,
+    generate_household,
+    make_entry,
+)
+
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+
+from custom_components.school_schedule.const import CONF_REFRESH_COOLDOWN
+from custom_components.school_schedule.coordinator import SchoolScheduleCoordinator
+from custom_components.school_schedule.sensor import build_state_attributes
+
+# The run starts this far ahead of the real date. Boundary and reminder
+# timers run on the event loop's real clock, so they never go off by
+# themselves; the run fires them as the fake clock passes them.
+START_AHEAD = timedelta(days=365)
+
+# Hour of the day at which the day's changes are made
+CHANGE_HOUR = 9
+
+# Switchover times the run moves between
+SWITCHOVER_TIMES = ("12:00", "15:30", "18:00")
+
+# Growth below this over the first half counts as this much, so noise in a
+# series that barely grows doesn't look like a trend
+NOISE_FLOOR = {
+    "traced_memory_bytes": 512 * 1024,
+    "document_bytes": 4096,
+    "attribute_bytes": 4096,
+    "boundary_ms": 2.0,
+    "journal_append_ms": 2.0,
+}
+
+
+def _local(day: date, hour: int) -> datetime:
+    """Return a local time on a day."""
+    return datetime(
+        day.year, day.month, day.day, hour, tzinfo=dt_util.DEFAULT_TIME_ZONE
+    )
+
+
+def _super_linear(
+    name: str, samples: list[dict[str, Any]], ratio: float
+) -> str | None:
+    """Return why a series grew super-linearly, or None if it didn't."""
+    # The first sample is taken before anything has warmed up
+    series = [sample[name] for sample in samples[1:]]
+    if len(series) < 3:
+        return None
+    middle = (len(series) - 1) // 2
+    first = series[middle] - series[0]
+    # Scaled to the first half's span when the halves differ by a sample
+    second = (series[-1] - series[middle]) * middle / (len(series) - 1 - middle)
+    if second > ratio * max(first, NOISE_FLOOR[name]):
+        return (
+            f"{name} grew {second:g} over the second half of the run "
+            f"against {first:g} over the first"
+        )
+    return None
+
+
+async def async_soak(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the soak test and return its report."""
+    rng = random.Random(args.seed)
+    # On a Monday, so the run starts on a school day
+    start_day = dt_util.now().date() + START_AHEAD
+    start_day -= timedelta(days=start_day.weekday())
+    clock = FakeClock(_local(start_day, 0))
+    async with async_test_home_assistant() as hass:
+        with clock.installed():
+            entry = make_entry("soak")
+            # Refresh on every change rather than after a real-time cooldown
+            entry.options = {CONF_REFRESH_COOLDOWN: 0}
+            await async_seed_store(
+                hass, entry.entry_id, generate_household(args.children, 6, 10, 0)
+            )
+            coordinator = SchoolScheduleCoordinator(hass, entry)
+            await coordinator.async_refresh()
+            children = list(coordinator.data["children"])
+            for index, child_name in enumerate(children):
+                await coordinator.async_set_reminder(
+                    {
+                        "id": f"soak_{index}",
+                        "time": "19:00",
+                        "days_before": 1,
+                        "children": [child_name],
+                    }
+                )
+            reminders_fired = 0
+
+            def count_reminder(_event: Any) -> None:
+                nonlocal reminders_fired
+                reminders_fired += 1
+
+            hass.bus.async_listen("school_schedule_reminder", count_reminder)
+
+            boundary_times: list[float] = []
+            samples: list[dict[str, Any]] = []
+
+            async def advance_to(when: datetime) -> None:
+                """Move the clock on, going off each timer passed on the way."""
+                boundaries = coordinator.boundaries
+                reminders = coordinator.reminders
+                while True:
+                    due = [
+                        timer
+                        for timer in (boundaries.next_boundary, reminders.next_fire)
+                        if timer is not None and timer <= when
+                    ]
+                    if not due:
+                        break
+                    clock.set(min(due))
+                    now = dt_util.utcnow()
+                    if (timer := boundaries.next_boundary) and timer <= now:
+                        start = time.perf_counter()
+                        boundaries.async_stop()
+                        boundaries._async_fire_due(now)
+                        await hass.async_block_till_done()
+                        boundary_times.append(time.perf_counter() - start)
+                    if (timer := reminders.next_fire) and timer <= now:
+                        reminders.async_stop()
+                        reminders._async_fire_due(now)
+                clock.set(when)
+
+            async def take_sample(day_number: int) -> None:
+                document = await coordinator.async_get_document()
+                gc.collect()
+                appends = coordinator.metrics.timing("journal_append")
+                samples.append(
+                    {
+                        "day": day_number,
+                        "traced_memory_bytes": tracemalloc.get_traced_memory()[0],
+                        "document_bytes": len(json_dumps(document)),
+                        "attribute_bytes": len(
+                            json_dumps(build_state_attributes(coordinator.data))
+                        ),
+                        "boundary_ms": round(
+                            statistics.median(boundary_times or [0]) * 1000, 3
+                        ),
+                        "journal_append_ms": round(appends.percentile(50), 3),
+                        "exceptions": sum(
+                            len(child["exceptions"])
+                            for child in coordinator.data["children"].values()
+                        ),
+                    }
+                )
+                boundary_times.clear()
+
+            tracemalloc.start()
+            first_snapshot = tracemalloc.take_snapshot()
+            await take_sample(0)
+            run_start = time.perf_counter()
+            for day_number in range(1, args.days + 1):
+                day = start_day + timedelta(days=day_number)
+                await advance_to(_local(day, CHANGE_HOUR))
+                child_name = rng.choice(children)
+                child_items = [
+                    item["id"]
+                    for item in coordinator.data["children"][child_name]["items"]
+                ]
+                for _ in range(args.exceptions_per_day):
+                    when = day + timedelta(days=rng.randint(1, 120))
+                    await coordinator.async_add_exception(
+                        child_name,
+                        when.isoformat(),
+                        rng.sample(child_items, rng.randint(0, 3)),
+                    )
+                for item in coordinator.data["children"][child_name]["items_today"]:
+                    await coordinator.async_set_packed(child_name, item["id"])
+                if day_number % 91 == 0:
+                    await coordinator.async_set_switchover_time(
+                        rng.choice(SWITCHOVER_TIMES)
+                    )
+
+                await hass.async_block_till_done()
+                if day_number % args.sample_days == 0:
+                    await take_sample(day_number)
+
+            elapsed = time.perf_counter() - run_start
+            growth = [
+                str(stat)
+                for stat in tracemalloc.take_snapshot().compare_to(
+                    first_snapshot, "lineno"
+                )[:5]
+            ]
+            tracemalloc.stop()
+            coordinator.boundaries.async_stop()
+            coordinator.reminders.async_stop()
+
+    failures = [
+        failure
+        for name in NOISE_FLOOR
+        if (failure := _super_linear(name, samples, args.max_growth_ratio))
+    ]
+    return {
+        "days": args.days,
+        "children": len(children),
+        "seconds": round(elapsed, 1),
+        "reminders_fired": reminders_fired,
+        "samples": samples,
+        "top_memory_growth": growth,
+        "failures": failures,
+    }
+
+
+def main() -> None:
+    """Run the soak test and report super-linear growth."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=3 * 365)
+    parser.add_argument("--sample-days", type=int, default=30)
+    parser.add_argument("--children", type=int, default=3)
+    parser.add_argument("--exceptions-per-day", type=int, default=1)
+    parser.add_argument("--max-growth-ratio", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = asyncio.run(async_soak(args))
+    print(json.dumps(report, indent=2))
+    if report["failures"]:
+        print("\nSuper-linear growth:")
+        for failure in report["failures"]:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Concurrency stress test for service calls against the coordinator.
+
+Fires thousands of mixed service calls at once (as several people editing
+from the panel, automations and the display card would) through the
+integration's real service handlers, then reports throughput, latency and
+scope-lock wait percentiles, and checks the result for anomalies:
+
+- lost updates: an exception or library item whose call succeeded is
+  missing from the document, in memory or reloaded from disk
+- ordering: the last value written to a child's item, or to the switchover
+  time, isn't the one from the last call issued for it
+- replay: the document reloaded from the journal differs from memory
+
+    python scripts/perf/stress.py [--calls N] [--concurrency N] [--children N]
+
+Exits non-zero on any anomaly or unexpected error, or when throughput or
+lock wait miss the --min-throughput / --max-lock-wait-p95-ms gates. The
+timing gates are off unless given (0 disables one), so a plain run fails
+only on correctness; CI runs the gates separately as advisory.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from harness import (
+    async_seed_store,
+    async_test_home_assistant,
+    generate_household,
+    install_entry,
+    make_entry,
+    percentile,
+)
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.school_schedule.const import DAYS_OF_WEEK, DOMAIN
+from custom_components.school_schedule.coordinator import SchoolScheduleCoordinator
+from custom_components.school_schedule.services import async_setup_services
+from custom_components.school_schedule.store import SchoolScheduleStore
+
+# Share of calls per service; the rest are get_items reads
+MIX = {
+    "add_exception": 0.35,
+    "update_item": 0.15,
+    "set_weekly_schedule": 0.10,
+    "add_library_item": 0.10,
+    "set_packed": 0.10,
+    "set_switchover_time": 0.05,
+}
+
+# Exceptions added by the stress test are dated from here, one per call
+EXCEPTION_START = date(2030, 1, 1)
+
+STRESS_ITEM = "stress_item"
+
+
+def _ms(samples: list[float]) -> dict[str, float]:
+    """Summarize samples as millisecond percentiles."""
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples, default=0) * 1000, 3),
+    }
+
+
+def _switchover_times(now: datetime, rng: random.Random, count: int) -> list[str]:
+    """Return switchover times that keep showing the same day as now.
+
+    Changing which day is shown mid-run would change the items set_packed
+    may tick, which is a legitimate rejection rather than what is measured.
+    """
+    minute = now.hour * 60 + now.minute
+    # The default 12:00 decides the side of the day we're on
+    if minute >= 12 * 60:
+        choices = range(0, max(1, minute - 5))
+    else:
+        choices = range(min(minute + 5, 24 * 60 - 1), 24 * 60)
+    return [
+        f"{value // 60:02d}:{value % 60:02d}"
+        for value in (rng.choice(choices) for _ in range(count))
+    ]
+
+
+async def async_stress(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the stress test and return its report."""
+    rng = random.Random(args.seed)
+    async with async_test_home_assistant() as hass:
+        entry = make_entry("stress")
+        await async_seed_store(
+            hass, entry.entry_id, generate_household(args.children, 6, 10, 20)
+        )
+        coordinator = SchoolScheduleCoordinator(hass, entry)
+        await coordinator.async_refresh()
+        install_entry(hass, entry, coordinator)
+        await async_setup_services(hass)
+
+        # Every scope lock wait, not just the metrics' recent window
+        lock_waits: list[float] = []
+        record = coordinator.metrics.record
+
+        def record_all(name: str, seconds: float) -> None:
+            if name == "lock_wait":
+                lock_waits.append(seconds)
+            record(name, seconds)
+
+        coordinator.metrics.record = record_all
+
+        children = list(coordinator.data["children"])
+        for child_name in children:
+            await hass.services.async_call(
+                DOMAIN,
+                "add_item",
+                {
+                    "child_name": child_name,
+                    "item_id": STRESS_ITEM,
+                    "item_name": "v0",
+                    "image": "",
+                },
+                blocking=True,
+            )
+        refreshes_before = coordinator.metrics.timing("update_data").count
+        requests_before = coordinator.metrics.counter("refresh_requests")
+
+        display = coordinator.data["display_date"].date()
+        packable = {
+            child_name: [item["id"] for item in data["items_today"]]
+            for child_name, data in coordinator.data["children"].items()
+        }
+        other_days = [
+            day for index, day in enumerate(DAYS_OF_WEEK) if index != display.weekday()
+        ]
+        child_items = {
+            child_name: [item["id"] for item in data["items"]]
+            for child_name, data in coordinator.data["children"].items()
+        }
+        switchover_times = iter(_switchover_times(dt_util.now(), rng, args.calls))
+
+        services = list(MIX)
+        weights = list(MIX.values())
+        reads = 1 - sum(weights)
+        calls = rng.choices([*services, "get_items"], [*weights, reads], k=args.calls)
+
+        expected_exceptions: set[tuple[str, str]] = set()
+        expected_library: set[str] = set()
+        last_version: dict[str, int] = {}
+        last_switchover: str | None = None
+        versions = Counter[str]()
+        latencies: dict[str, list[float]] = {name: [] for name in [*services, "get_items"]}
+        rejected = Counter[str]()
+        errors: list[str] = []
+        slots = asyncio.Semaphore(args.concurrency)
+
+        async def one_call(index: int, service: str) -> None:
+            nonlocal last_switchover
+            child_name = rng.choice(children)
+            data: dict[str, Any]
+            async with slots:
+                # Arguments are chosen when the call is issued, so "last
+                # issued" below matches the order calls reach the locks
+                if service == "add_exception":
+                    day = (EXCEPTION_START + timedelta(days=index)).isoformat()
+                    data = {
+                        "child_name": child_name,
+                        "date": day,
+                        "item_ids": rng.sample(child_items[child_name], 2),
+                    }
+                elif service == "update_item":
+                    versions[child_name] += 1
+                    data = {
+                        "child_name": child_name,
+                        "item_id": STRESS_ITEM,
+                        "item_name": f"v{versions[child_name]}",
+                    }
+                elif service == "set_weekly_schedule":
+                    data = {
+                        "child_name": child_name,
+                        "day": rng.choice(other_days),
+                        "item_ids": rng.sample(child_items[child_name], 3),
+                    }
+                elif service == "add_library_item":
+                    data = {
+                        "item_id": f"stress_lib_{index}",
+                        "item_name": f"Stress {index}",
+                        "image": "",
+                    }
+                elif service == "set_packed":
+                    if not packable[child_name]:
+                        service, data = "get_items", {"start_date": display}
+                    else:
+                        data = {
+                            "child_name": child_name,
+                            "item_id": rng.choice(packable[child_name]),
+                            "packed": rng.random() < 0.5,
+                        }
+                elif service == "set_switchover_time":
+                    data = {"time": next(switchover_times)}
+                else:
+                    data = {"start_date": display, "end_date": display + timedelta(days=6)}
+
+                start = time.perf_counter()
+                try:
+                    await hass.services.async_call(
+                        DOMAIN,
+                        service,
+                        data,
+                        blocking=True,
+                        return_response=service == "get_items",
+                    )
+                except HomeAssistantError:
+                    rejected[service] += 1
+                    return
+                except Exception as err:  # noqa: BLE001
+                    errors.append(f"{service}: {err!r}")
+                    return
+                finally:
+                    latencies[service].append(time.perf_counter() - start)
+
+                if service == "add_exception":
+                    expected_exceptions.add((child_name, data["date"]))
+                elif service == "update_item":
+                    version = int(data["item_name"][1:])
+                    last_version[child_name] = max(
+                        last_version.get(child_name, 0), version
+                    )
+                elif service == "add_library_item":
+                    expected_library.add(data["item_id"])
+                elif service == "set_switchover_time":
+                    last_switchover = data["time"]
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(one_call(index, service) for index, service in enumerate(calls))
+        )
+        elapsed = time.perf_counter() - start
+        # Let the refresh held back until the end of the cooldown run
+        await asyncio.sleep(coordinator._debounced_refresh.cooldown + 0.1)
+        await hass.async_block_till_done()
+
+        # Check the outcome in memory and as reloaded from disk
+        memory = await coordinator.async_get_document()
+        disk = await SchoolScheduleStore(hass, entry.entry_id).async_load() or {}
+        anomalies: list[str] = []
+        for label, document in (("memory", memory), ("disk", disk)):
+            by_name = {child["name"]: child for child in document.get("children", [])}
+            lost = [
+                f"{child_name} {day}"
+                for child_name, day in sorted(expected_exceptions)
+                if day not in by_name.get(child_name, {}).get("exceptions", {})
+            ]
+            library = {item["id"] for item in document.get("item_library", [])}
+            lost += sorted(expected_library - library)
+            if lost:
+                anomalies.append(f"{label}: {len(lost)} lost updates, e.g. {lost[:3]}")
+
+            for child_name, version in last_version.items():
+                names = [
+                    item.get("name")
+                    for item in by_name.get(child_name, {}).get("items", [])
+                    if item["id"] == STRESS_ITEM
+                ]
+                if names != [f"v{version}"]:
+                    anomalies.append(
+                        f"{label}: {child_name} ended with {names}, last write v{version}"
+                    )
+            if last_switchover and document.get("switchover_time") != last_switchover:
+                anomalies.append(
+                    f"{label}: switchover {document.get('switchover_time')}, "
+                    f"last write {last_switchover}"
+                )
+        if disk != memory:
+            anomalies.append("replay: document reloaded from disk differs from memory")
+
+        completed = sum(len(samples) for samples in latencies.values())
+        return {
+            "calls": args.calls,
+            "concurrency": args.concurrency,
+            "children": len(children),
+            "seconds": round(elapsed, 3),
+            "throughput_per_s": round(completed / elapsed, 1),
+            "latency": {
+                service: {"calls": len(samples), **_ms(samples)}
+                for service, samples in latencies.items()
+                if samples
+            },
+            "lock_wait": {"samples": len(lock_waits), **_ms(lock_waits)},
+            # Changes share debounced refreshes rather than one each
+            "refresh_requests": coordinator.metrics.counter("refresh_requests")
+            - requests_before,
+            "refreshes": coordinator.metrics.timing("update_data").count
+            - refreshes_before,
+            "journal_seq": coordinator.store.seq,
+            "rejected": dict(rejected),
+            "errors": errors[:10],
+            "anomalies": anomalies,
+        }
+
+
+def main() -> None:
+    """Run the stress test and apply the gates."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--children", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-throughput", type=float, default=0)
+    parser.add_argument("--max-lock-wait-p95-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    report = asyncio.run(async_stress(args))
+    print(json.dumps(report, indent=2))
+
+    failures = [*report["anomalies"], *report["errors"]]
+    if args.min_throughput and report["throughput_per_s"] < args.min_throughput:
+        failures.append(
+            f"throughput {report['throughput_per_s']}/s below {args.min_throughput}/s"
+        )
+    lock_wait_p95 = report["lock_wait"]["p95_ms"]
+    if args.max_lock_wait_p95_ms and lock_wait_p95 > args.max_lock_wait_p95_ms:
+        failures.append(
+            f"lock wait p95 {lock_wait_p95} ms above {args.max_lock_wait_p95_ms} ms"
+        )
+    if failures:
+        print("\nStress test failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""Fixtures for the School Schedule tests.
+
+The tests run against a bare Home Assistant core with a throwaway config
+directory, so they only need the packages in requirements_test.txt.
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest_asyncio
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path: Path) -> AsyncIterator[HomeAssistant]:
+    """Yield a Home Assistant core whose config directory is tmp_path."""
+    hass = HomeAssistant(str(tmp_path))
+    try:
+        yield hass
+        await hass.async_block_till_done()
+    finally:
+        await hass.async_stop(force=True)
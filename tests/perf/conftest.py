@@ -0,0 +1,88 @@
+"""Fixtures for the benchmarks.
+
+pytest-benchmark times plain callables, so each synthetic household gets a
+Home Assistant core on an event loop of its own, and the benchmarks run
+coroutines to completion on it. The households are generated by the
+harness in scripts/perf, which the soak and stress tests share.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+import pytest
+
+PERF_DIR = Path(__file__).resolve().parents[2] / "scripts" / "perf"
+if str(PERF_DIR) not in sys.path:
+    sys.path.insert(0, str(PERF_DIR))
+
+from harness import (  # noqa: E402
+    TIME_ZONE,
+    async_seed_store,
+    generate_household,
+    make_entry,
+)
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.school_schedule.coordinator import (  # noqa: E402
+    SchoolScheduleCoordinator,
+)
+
+_T = TypeVar("_T")
+
+# name: (children, items per child, library items, exceptions per child)
+HOUSEHOLDS = {
+    "small": (3, 8, 10, 20),
+    "large": (30, 20, 100, 300),
+}
+
+
+@dataclass
+class Household:
+    """A synthetic household loaded into a running coordinator."""
+
+    name: str
+    loop: asyncio.AbstractEventLoop
+    hass: HomeAssistant
+    entry: Any
+    document: dict[str, Any]
+    coordinator: SchoolScheduleCoordinator
+
+    def run(self, func: Callable[[], Awaitable[_T]]) -> _T:
+        """Run a coroutine function to completion on the household's loop."""
+        return self.loop.run_until_complete(func())
+
+
+@pytest.fixture(scope="module", params=list(HOUSEHOLDS))
+def household(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Iterator[Household]:
+    """Yield each synthetic household, set up once per benchmark module."""
+    name = request.param
+    document = generate_household(*HOUSEHOLDS[name])
+    config_dir = tmp_path_factory.mktemp(name)
+    loop = asyncio.new_event_loop()
+
+    async def _async_setup() -> Household:
+        dt_util.set_default_time_zone(dt_util.get_time_zone(TIME_ZONE))
+        hass = HomeAssistant(str(config_dir))
+        entry = make_entry(name)
+        await async_seed_store(hass, entry.entry_id, document)
+        coordinator = SchoolScheduleCoordinator(hass, entry)
+        await coordinator.async_refresh()
+        return Household(name, loop, hass, entry, document, coordinator)
+
+    household = loop.run_until_complete(_async_setup())
+    try:
+        yield household
+    finally:
+        household.coordinator.boundaries.async_stop()
+        loop.run_until_complete(household.hass.async_stop(force=True))
+        loop.close()
+        dt_util.set_default_time_zone(dt_util.UTC)
@@ -0,0 +1,117 @@
+"""Benchmarks for coordinator refresh, calendar expansion and storage.
+
+CI's test job skips them with --benchmark-skip. Run them and compare with
+a saved run (stored per machine, as timings are machine specific):
+
+    python -m pytest tests/perf --benchmark-only --benchmark-save=baseline
+    python -m pytest tests/perf --benchmark-only --benchmark-compare \\
+        --benchmark-compare-fail=median:50%
+"""
+from __future__ import annotations
+
+import copy
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+
+from custom_components.school_schedule.calendar import SchoolScheduleCalendar
+from custom_components.school_schedule.matrix import ScheduleMatrix
+from custom_components.school_schedule.sensor import SchoolScheduleMasterSensor
+from custom_components.school_schedule.store import SchoolScheduleStore
+
+if TYPE_CHECKING:
+    from .conftest import Household
+
+CALENDAR_RANGES = {
+    "1_month": timedelta(days=31),
+    "1_year": timedelta(days=365),
+    "5_years": timedelta(days=5 * 365),
+}
+
+
+def test_update_data(benchmark: BenchmarkFixture, household: Household) -> None:
+    """Recompute every child's items."""
+    benchmark(household.run, household.coordinator._async_update_data)
+
+
+@pytest.mark.parametrize("span", list(CALENDAR_RANGES))
+def test_get_events(
+    benchmark: BenchmarkFixture, household: Household, span: str
+) -> None:
+    """Expand one child's calendar over a range."""
+    calendar = SchoolScheduleCalendar(
+        household.coordinator,
+        household.entry,
+        household.document["children"][0]["name"],
+    )
+    start = dt_util.start_of_local_day()
+    end = start + CALENDAR_RANGES[span]
+    benchmark(
+        household.run,
+        lambda: calendar.async_get_events(household.hass, start, end),
+    )
+
+
+def test_stats_5_years(benchmark: BenchmarkFixture, household: Household) -> None:
+    """Build fresh matrices, as after every child has changed, and count."""
+    schedules = household.run(household.coordinator.async_get_schedules)
+    today = dt_util.now().date()
+    end = today + CALENDAR_RANGES["5_years"]
+
+    def stats() -> None:
+        for schedule in schedules.values():
+            ScheduleMatrix(schedule, today, end).stats()
+
+    benchmark(stats)
+
+
+def test_state_attributes(
+    benchmark: BenchmarkFixture, household: Household
+) -> None:
+    """Build the master sensor's state attributes."""
+    sensor = SchoolScheduleMasterSensor(household.coordinator, household.entry)
+    attributes = benchmark(lambda: sensor.extra_state_attributes)
+    benchmark.extra_info["bytes"] = len(json_dumps(attributes))
+
+
+def _store(household: Household) -> SchoolScheduleStore:
+    """Return a store of its own for the household's document."""
+    return SchoolScheduleStore(household.hass, f"{household.name}_roundtrip")
+
+
+def test_store_save(benchmark: BenchmarkFixture, household: Household) -> None:
+    """Write the whole document as a snapshot."""
+    store = _store(household)
+    benchmark(household.run, lambda: store.async_save(household.document))
+
+
+def test_store_load(benchmark: BenchmarkFixture, household: Household) -> None:
+    """Load the snapshot and replay the journal."""
+    store = _store(household)
+    household.run(lambda: store.async_save(household.document))
+    benchmark(household.run, store.async_load)
+
+
+def test_store_append(benchmark: BenchmarkFixture, household: Household) -> None:
+    """Journal a change to a single exception."""
+    store = _store(household)
+    household.run(lambda: store.async_save(household.document))
+    document = household.document
+    changed_child = copy.deepcopy(document["children"][0])
+    changed_child["exceptions"]["2030-01-01"] = []
+    changed = {**document, "children": [changed_child, *document["children"][1:]]}
+    # Alternate between the two documents so every round is a change
+    documents = [document, changed]
+
+    def append_one() -> None:
+        household.run(
+            lambda: store.async_append("bench", documents[0], documents[1])
+        )
+        documents.reverse()
+
+    benchmark(append_one)
@@ -0,0 +1,68 @@
+"""Tests for the School Schedule options flow."""
+from __future__ import annotations
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.school_schedule.config_flow import (
+    SchoolScheduleOptionsFlowHandler,
+)
+from custom_components.school_schedule.const import (
+    CONF_FEED_TOKEN,
+    CONF_FEED_TOKEN_ENABLED,
+    CONF_REGENERATE_FEED_TOKEN,
+    DOMAIN,
+)
+
+OLD_TOKEN = "x" * 43
+
+
+def _flow(options: dict[str, str]) -> SchoolScheduleOptionsFlowHandler:
+    """Return an options flow for an entry with the given options."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="School Schedule",
+        data={},
+        source="user",
+        options=options,
+    )
+    flow = SchoolScheduleOptionsFlowHandler(entry)
+    flow.flow_id = "test"
+    flow.handler = DOMAIN
+    return flow
+
+
+@pytest.mark.asyncio
+async def test_regenerated_token_is_shown_before_saving() -> None:
+    """A new token is shown in a confirmation step and saved on submit."""
+    flow = _flow({CONF_FEED_TOKEN: OLD_TOKEN})
+    form = await flow.async_step_init()
+    assert form["description_placeholders"]["feed_token"] == OLD_TOKEN
+
+    shown = await flow.async_step_init(
+        {CONF_FEED_TOKEN_ENABLED: True, CONF_REGENERATE_FEED_TOKEN: True}
+    )
+    assert shown["type"] == FlowResultType.FORM
+    assert shown["step_id"] == "feed_token"
+    token = shown["description_placeholders"]["feed_token"]
+    assert token != OLD_TOKEN
+    assert len(token) >= 32
+
+    saved = await flow.async_step_feed_token({})
+    assert saved["type"] == FlowResultType.CREATE_ENTRY
+    assert saved["data"][CONF_FEED_TOKEN] == token
+
+
+@pytest.mark.asyncio
+async def test_kept_token_saves_straight_away() -> None:
+    """Without a new token there is nothing to show, so the options save."""
+    flow = _flow({CONF_FEED_TOKEN: OLD_TOKEN})
+    saved = await flow.async_step_init(
+        {CONF_FEED_TOKEN_ENABLED: True, CONF_REGENERATE_FEED_TOKEN: False}
+    )
+    assert saved["type"] == FlowResultType.CREATE_ENTRY
+    assert saved["data"][CONF_FEED_TOKEN] == OLD_TOKEN
@@ -0,0 +1,169 @@
+"""Tests for how the coordinator applies and persists changes."""
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+
+import pytest
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.school_schedule.calendar import SchoolScheduleCalendar
+from custom_components.school_schedule.const import CONF_REFRESH_COOLDOWN, DOMAIN
+from custom_components.school_schedule.coordinator import SchoolScheduleCoordinator
+from custom_components.school_schedule.store import SchoolScheduleStore
+from custom_components.school_schedule.transfer import validate_document
+
+ENTRY_ID = "test"
+
+
+def _entry() -> ConfigEntry:
+    """Return a config entry for the coordinator to belong to."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="School Schedule",
+        data={},
+        source="user",
+        options={CONF_REFRESH_COOLDOWN: 0},
+        entry_id=ENTRY_ID,
+    )
+
+
+async def _async_coordinator(hass: HomeAssistant) -> SchoolScheduleCoordinator:
+    """Return a coordinator that has loaded and computed its document."""
+    coordinator = SchoolScheduleCoordinator(hass, _entry())
+    await coordinator.async_refresh()
+    return coordinator
+
+
+def _child_names(document: dict[str, Any]) -> list[str]:
+    """Return the names of the children in a document."""
+    return [child["name"] for child in document["children"]]
+
+
+@pytest.mark.asyncio
+async def test_failed_append_is_taken_back(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A change that can't be journaled is reverted in memory and the store."""
+    coordinator = await _async_coordinator(hass)
+    await coordinator.async_add_child("Alice")
+    seq = coordinator.store.seq
+
+    def failing(*_args: Any) -> int:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(SchoolScheduleStore, "_append_lines", failing)
+    with pytest.raises(OSError):
+        await coordinator.async_add_child("Bob")
+    monkeypatch.undo()
+
+    assert _child_names(await coordinator.async_get_document()) == ["Alice"]
+    # The feed's cache and ETag are keyed on seq, so it must not stay put
+    assert coordinator.store.seq > seq + 1
+
+    await coordinator.async_add_child("Carol")
+    reloaded = SchoolScheduleStore(hass, ENTRY_ID)
+    assert _child_names(await reloaded.async_load()) == ["Alice", "Carol"]
+
+
+
+@pytest.mark.asyncio
+async def test_day_boundary_refreshes_without_polling(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The displayed date moves on at the switchover, from the boundary timer."""
+    morning = datetime(2030, 1, 7, 9, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    now = morning
+    monkeypatch.setattr(dt_util, "now", lambda time_zone=None: now)
+    monkeypatch.setattr(dt_util, "utcnow", lambda: dt_util.as_utc(now))
+
+    coordinator = await _async_coordinator(hass)
+    await coordinator.async_add_child("Alice")
+    await hass.async_block_till_done()
+    assert coordinator.update_interval is None
+    assert coordinator.data["children"]["Alice"]["display_date"] == "2030-01-07"
+
+    boundary = coordinator.boundaries.next_boundary
+    assert boundary == morning.replace(hour=12)
+    now = boundary
+    # The timer runs on the loop's real clock, so it is fired by hand
+    coordinator.boundaries.async_stop()
+    coordinator.boundaries._async_fire_due(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert coordinator.data["children"]["Alice"]["display_date"] == "2030-01-08"
+    coordinator.boundaries.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_replace_import_keeps_switchover_time(hass: HomeAssistant) -> None:
+    """A replace import without a switchover time keeps the current one."""
+    coordinator = await _async_coordinator(hass)
+    await coordinator.async_set_switchover_time("15:30")
+    await coordinator.async_import(
+        validate_document({"children": [{"name": "Alice"}]})
+    )
+
+    document = await coordinator.async_get_document()
+    assert _child_names(document) == ["Alice"]
+    assert document["switchover_time"] == "15:30"
+    reloaded = SchoolScheduleStore(hass, ENTRY_ID)
+    assert (await reloaded.async_load())["switchover_time"] == "15:30"
+
+
+@pytest.mark.asyncio
+async def test_reminder_with_unknown_item_is_refused(hass: HomeAssistant) -> None:
+    """Reminders may only name library items or the reminded children's."""
+    coordinator = await _async_coordinator(hass)
+    await coordinator.async_add_child("Alice")
+    await coordinator.async_add_child("Bob")
+    await coordinator.async_add_item("Alice", "hat", "Hat", "")
+    await coordinator.async_add_library_item("bag", "Bag", "")
+
+    reminder = {"id": "evening", "time": "19:00", "days_before": 1}
+    with pytest.raises(ServiceValidationError):
+        await coordinator.async_set_reminder({**reminder, "items": ["coat"]})
+    with pytest.raises(ServiceValidationError):
+        await coordinator.async_set_reminder(
+            {**reminder, "children": ["Bob"], "items": ["hat"]}
+        )
+    assert "reminders" not in await coordinator.async_get_document()
+
+    await coordinator.async_set_reminder({**reminder, "items": ["hat", "bag"]})
+    document = await coordinator.async_get_document()
+    assert document["reminders"][0]["items"] == ["hat", "bag"]
+
+
+@pytest.mark.asyncio
+async def test_calendar_event_is_for_the_computed_day(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The calendar's event is for the day the sensors show, not the clock's."""
+    evening = datetime(2030, 1, 7, 14, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+    monkeypatch.setattr(dt_util, "now", lambda time_zone=None: evening)
+    monkeypatch.setattr(dt_util, "utcnow", lambda: dt_util.as_utc(evening))
+
+    coordinator = await _async_coordinator(hass)
+    await coordinator.async_set_switchover_time("15:30")
+    await coordinator.async_add_child("Alice")
+    await coordinator.async_add_item("Alice", "hat", "Hat", "")
+    await coordinator.async_add_exception("Alice", "2030-01-07", ["hat"])
+    await hass.async_block_till_done()
+    coordinator.boundaries.async_stop()
+    # Write the computed state out for the next start, as shutdown would
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+
+    # After a restart, entities start from the cached state before the
+    # first refresh has set the clocks up
+    restarted = SchoolScheduleCoordinator(hass, _entry())
+    assert await restarted.async_load_cached_state()
+    calendar = SchoolScheduleCalendar(restarted, _entry(), "Alice")
+    assert calendar.event is not None
+    assert calendar.event.start == date(2030, 1, 7)
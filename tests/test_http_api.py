@@ -0,0 +1,38 @@
+"""Tests for setting up and unloading the HTTP endpoints."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.school_schedule.http_api import (
+    DATA_UPLOAD_EXECUTOR,
+    async_setup_http,
+    async_unload_http,
+)
+
+
+@pytest.mark.asyncio
+async def test_reload_reuses_views_and_stops_the_pool(hass: HomeAssistant) -> None:
+    """Views are registered once; the upload pool stops on every unload."""
+    views: list[object] = []
+    hass.http = SimpleNamespace(register_view=views.append)
+
+    await async_setup_http(hass)
+    executor = hass.data[DATA_UPLOAD_EXECUTOR]
+    await async_setup_http(hass)
+    assert hass.data[DATA_UPLOAD_EXECUTOR] is executor
+    assert len(views) == 2
+
+    async_unload_http(hass)
+    assert DATA_UPLOAD_EXECUTOR not in hass.data
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
+
+    # A reload starts a new pool for the views already registered
+    await async_setup_http(hass)
+    assert hass.data[DATA_UPLOAD_EXECUTOR] is not executor
+    assert len(views) == 2
+    async_unload_http(hass)
@@ -0,0 +1,200 @@
+"""Crash recovery and history tests for the journaled store."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.school_schedule import store as store_module
+from custom_components.school_schedule.store import SchoolScheduleStore
+
+ENTRY_ID = "test"
+
+
+def _document(**children: list[str]) -> dict[str, Any]:
+    """Return a document with children holding the given item IDs."""
+    return {
+        "children": [
+            {"name": name, "items": [{"id": item_id} for item_id in items]}
+            for name, items in children.items()
+        ],
+        "item_library": [],
+        "switchover_time": "12:00",
+    }
+
+
+async def _async_seed(hass: HomeAssistant) -> tuple[SchoolScheduleStore, dict[str, Any]]:
+    """Return a loaded store with a snapshot, and the document in it."""
+    store = SchoolScheduleStore(hass, ENTRY_ID)
+    await store.async_load()
+    document = _document()
+    await store.async_save(document)
+    return store, document
+
+
+async def _async_reload(hass: HomeAssistant) -> tuple[SchoolScheduleStore, Any]:
+    """Load the stored document with a new store, as a restart would."""
+    store = SchoolScheduleStore(hass, ENTRY_ID)
+    return store, await store.async_load()
+
+
+@pytest.mark.asyncio
+async def test_torn_final_line_is_truncated(hass: HomeAssistant) -> None:
+    """A record cut short by a crash is dropped; earlier ones are replayed."""
+    store, before = await _async_seed(hass)
+    for version in range(1, 4):
+        after = _document(Alice=[f"v{version}"])
+        await store.async_append("update_child", before, after)
+        before = after
+
+    journal = store._journal_path
+    intact = journal.read_bytes()
+    with journal.open("ab") as file:
+        file.write(b'{"seq": 4, "ts": "2030-01-01T00:00:00+00:00", "chi')
+
+    reloaded, data = await _async_reload(hass)
+    assert data == before
+    assert reloaded.seq == 3
+    assert journal.read_bytes() == intact
+
+    # Appends after recovery carry on from the last intact record
+    after = _document(Alice=["v4"])
+    await reloaded.async_append("update_child", data, after)
+    _, data = await _async_reload(hass)
+    assert data == after
+
+
+@pytest.mark.asyncio
+async def test_crash_before_journal_removal_does_not_replay(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Records already in the snapshot are skipped when the journal survives."""
+    store, before = await _async_seed(hass)
+    for version in ("x", "y"):
+        after = _document(Alice=[version])
+        await store.async_append("update_child", before, after)
+        before = after
+
+    # The process dies after the snapshot is written, before the journal
+    # it covers is archived and removed
+    def crash(*_args: Any) -> int:
+        raise OSError("killed")
+
+    monkeypatch.setattr(SchoolScheduleStore, "_compact_journal", crash)
+    snapshot = _document(Alice=["z"])
+    with pytest.raises(OSError):
+        await store.async_save(snapshot)
+    monkeypatch.undo()
+    assert store._journal_path.exists()
+
+    # Replaying the leftover records would bring back Alice's "y"
+    reloaded, data = await _async_reload(hass)
+    assert data == snapshot
+    assert reloaded.seq == 2
+
+
+@pytest.mark.asyncio
+async def test_kill_during_append_loses_at_most_the_batch(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A write killed part way loses only records from the batch in flight."""
+    store, before = await _async_seed(hass)
+    states = {0: before}
+    for version in range(1, 4):
+        after = _document(Alice=[f"v{version}"])
+        await store.async_append("update_child", before, after)
+        states[store.seq] = before = after
+    durable = store.seq
+
+    real_append = SchoolScheduleStore._append_lines
+
+    def killed(self: SchoolScheduleStore, lines: list[str]) -> int:
+        """Write half of the batch's bytes, then die."""
+        payload = "".join(f"{line}\n" for line in lines).encode()
+        with self._journal_path.open("ab") as journal:
+            journal.write(payload[: len(payload) // 2])
+        raise OSError("killed")
+
+    # Changes made together are written as one batch; the first append of
+    # the burst starts the writer, the rest join the next batch
+    monkeypatch.setattr(SchoolScheduleStore, "_append_lines", killed)
+    appends = []
+    for seq, version in enumerate(range(4, 9), durable + 1):
+        after = _document(Alice=[f"v{version}"], Bob=[f"v{version}"])
+        appends.append(store.async_append("update_child", before, after))
+        states[seq] = before = after
+    results = await asyncio.gather(*appends, return_exceptions=True)
+    monkeypatch.setattr(SchoolScheduleStore, "_append_lines", real_append)
+    assert all(isinstance(result, OSError) for result in results)
+
+    reloaded, data = await _async_reload(hass)
+    assert durable <= reloaded.seq <= max(states)
+    assert data == states[reloaded.seq]
+
+
+@pytest.mark.asyncio
+async def test_restore_reaches_past_compaction(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Folded journals are archived, so older states can still be restored."""
+    monkeypatch.setattr(store_module, "JOURNAL_COMPACT_THRESHOLD", 5)
+    start = datetime(2030, 1, 1, tzinfo=dt_util.UTC)
+    now = start
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now)
+
+    store, before = await _async_seed(hass)
+    states: list[tuple[datetime, dict[str, Any]]] = []
+    for version in range(1, 21):
+        now += timedelta(minutes=1)
+        after = _document(Alice=[f"v{version}"])
+        await store.async_append("update_child", before, after)
+        states.append((now, after))
+        before = after
+    assert store._archives()
+
+    for when, expected in states:
+        assert await store.async_load_at(when + timedelta(seconds=1)) == expected
+    assert await store.async_load_at(start - timedelta(days=1)) is None
+
+    await store.async_remove()
+    assert not store._archives()
+
+
+@pytest.mark.asyncio
+async def test_removed_key_stays_removed(hass: HomeAssistant) -> None:
+    """A top-level key dropped by a change is not brought back on restart."""
+    store, before = await _async_seed(hass)
+    after = {**before, "reminders": [{"item_ids": ["a"]}]}
+    await store.async_append("set_reminder", before, after)
+    before, after = after, dict(after)
+    del after["reminders"]
+    del after["switchover_time"]
+    await store.async_append("restore", before, after)
+
+    _, data = await _async_reload(hass)
+    assert data == after
+    assert "reminders" not in data
+    assert "switchover_time" not in data
+
+
+@pytest.mark.asyncio
+async def test_restore_leaves_batch_in_flight_alone(hass: HomeAssistant) -> None:
+    """A point-in-time read racing an append does not cut the journal."""
+    store, before = await _async_seed(hass)
+    after = _document(Alice=["v1"])
+    await store.async_append("update_child", before, after)
+
+    # The writer has only got part way through its next batch
+    journal = store._journal_path
+    partial = b'{"seq": 2, "ts": "2030-01-01T00:00:00+00:00", "chi'
+    with journal.open("ab") as file:
+        file.write(partial)
+    written = journal.read_bytes()
+
+    assert await store.async_load_at(dt_util.utcnow()) == after
+    assert journal.read_bytes() == written
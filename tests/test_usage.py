@@ -0,0 +1,28 @@
+"""Tests for the usage statistic IDs."""
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from custom_components.school_schedule.usage import (
+    _child_statistic_id,
+    _item_statistic_id,
+)
+
+# The recorder's rule for statistic IDs
+VALID_STATISTIC_ID = re.compile(r"^(?!.+__)(?!_)[\da-z_]+(?<!_):(?!_)[\da-z_]+(?<!_)$")
+
+
+@pytest.mark.parametrize("text", ["Emma", "Émile", "Unknown", "🎒", "🎒🎒", "__", ""])
+def test_statistic_ids_are_valid(text: str) -> None:
+    """Every name and item ID gives a statistic ID the recorder accepts."""
+    assert VALID_STATISTIC_ID.match(_child_statistic_id(text))
+    assert VALID_STATISTIC_ID.match(_item_statistic_id(text))
+
+
+def test_names_without_letters_get_ids_of_their_own() -> None:
+    """Names slugify() can't spell out don't share one statistic."""
+    assert _child_statistic_id("🎒") != _child_statistic_id("🎒🎒")
+    assert _child_statistic_id("🎒") == _child_statistic_id("🎒")
+    assert _child_statistic_id("Emma") == "school_schedule:emma_items"
@@ -7,6 +7,29 @@ class SchoolScheduleCard extends HTMLElement {
   constructor() {
     super();
     this.attachShadow({ mode: 'open' });
+    this._shell = null; // null = not rendered, 'error' or 'card'
+    this._lastState = undefined;
+    this._tiles = new Map(); // child name -> { el, key, items }
+    this._packingIds = new Map(); // child name -> packing sensor entity ID
+    this._lastPacking = [];
+
+    // Image errors don't bubble, but they can be caught on the way down
+    this.shadowRoot.addEventListener('error', (ev) => {
+      const img = ev.target;
+      if (!img.classList || !img.classList.contains('item-image')) return;
+      img.style.display = 'none';
+      const placeholder = img.nextElementSibling;
+      if (placeholder) placeholder.style.display = 'flex';
+    }, true);
+
+    // Tapping an item ticks it off the child's packing checklist
+    this.shadowRoot.addEventListener('click', (ev) => {
+      if (!this._config || !this._config.tap_to_pack) return;
+      const itemEl = ev.target.closest('.item[data-item-id]');
+      const column = itemEl && itemEl.closest('.child-column');
+      if (!column) return;
+      this._togglePacked(column.dataset.child, itemEl);
+    });
   }
 
   /**
@@ -34,9 +57,59 @@ class SchoolScheduleCard extends HTMLElement {
 
   set hass(hass) {
     this._hass = hass;
+    // HA passes a new hass object whenever any entity in the house changes,
+    // but the tracked entities' state objects are only replaced when they do.
+    const state = this._config ? hass.states[this._config.entity] : undefined;
+    if (this._shell && state === this._lastState && !this._packingChanged()) return;
     this._updateContent();
   }
 
+  /**
+   * Packing sensors are found by their child attribute, once per change of
+   * the main entity rather than on every hass update
+   */
+  _findPackingEntities() {
+    this._packingIds.clear();
+    if (!this._config.tap_to_pack) return;
+    for (const [entityId, state] of Object.entries(this._hass.states)) {
+      const attrs = state.attributes;
+      if (entityId.startsWith('sensor.') && attrs.child !== undefined && Array.isArray(attrs.packed)) {
+        this._packingIds.set(attrs.child, entityId);
+      }
+    }
+  }
+
+  _packingChanged() {
+    const states = this._hass.states;
+    let index = 0;
+    for (const entityId of this._packingIds.values()) {
+      if (states[entityId] !== this._lastPacking[index++]) return true;
+    }
+    return false;
+  }
+
+  _packedFor(name, displayDate) {
+    const entityId = this._packingIds.get(name);
+    const state = entityId && this._hass.states[entityId];
+    if (!state || state.attributes.date !== displayDate) return new Set();
+    return new Set(state.attributes.packed);
+  }
+
+  async _togglePacked(name, itemEl) {
+    // Show the tick straight away; the packing sensor confirms it
+    const packed = itemEl.classList.toggle('packed');
+    try {
+      await this._hass.callService('school_schedule', 'set_packed', {
+        child_name: name,
+        item_id: itemEl.dataset.itemId,
+        packed,
+      });
+    } catch (error) {
+      console.error('Packing error:', error);
+      itemEl.classList.toggle('packed', !packed);
+    }
+  }
+
   setConfig(config) {
     if (!config.entity) {
       throw new Error('You need to define an entity');
@@ -50,8 +123,10 @@ class SchoolScheduleCard extends HTMLElement {
       columns: config.columns || 'auto',
       image_size: config.image_size || 80,
       children: config.children || [],
+      tap_to_pack: config.tap_to_pack !== false,
       ...config
     };
+    this._shell = null;
     this._updateContent();
   }
 
@@ -60,8 +135,13 @@ class SchoolScheduleCard extends HTMLElement {
 
     const entityId = this._config.entity;
     const state = this._hass.states[entityId];
+    if (state !== this._lastState || this._shell !== 'card') this._findPackingEntities();
+    this._lastState = state;
+    this._lastPacking = [...this._packingIds.values()].map(id => this._hass.states[id]);
 
     if (!state) {
+      this._shell = 'error';
+      this._tiles.clear();
       this.shadowRoot.innerHTML = `
         <ha-card>
           <div class="error">Entity not found: ${this._escapeHtml(entityId)}</div>
@@ -70,10 +150,12 @@ class SchoolScheduleCard extends HTMLElement {
       return;
     }
 
+    if (this._shell !== 'card') {
+      this._renderShell();
+    }
+
     const attrs = state.attributes;
     const children = attrs.children || {};
-    const displayDate = attrs.display_date;
-    const isTomorrow = attrs.is_tomorrow;
 
     // Filter children if specified
     let childrenToShow = Object.entries(children);
@@ -83,10 +165,23 @@ class SchoolScheduleCard extends HTMLElement {
       );
     }
 
+    this._updateHeader(attrs.display_date, attrs.is_tomorrow);
+
     const numColumns = this._config.columns === 'auto'
       ? Math.max(1, childrenToShow.length)
       : this._config.columns;
+    const grid = this.shadowRoot.querySelector('.children-grid');
+    grid.style.gridTemplateColumns = `repeat(${numColumns}, 1fr)`;
+    grid.hidden = childrenToShow.length === 0;
+    this.shadowRoot.querySelector('.no-children').hidden = childrenToShow.length > 0;
+
+    this._patchChildren(grid, childrenToShow, attrs.display_date);
+  }
 
+  /**
+   * Build the static parts of the card; tiles are patched in afterwards
+   */
+  _renderShell() {
     const imageSize = parseInt(this._config.image_size) || 80;
     const mobileImageSize = Math.min(imageSize, 60);
 
@@ -101,6 +196,9 @@ class SchoolScheduleCard extends HTMLElement {
         ha-card {
           padding: var(--card-padding);
         }
+        [hidden] {
+          display: none !important;
+        }
         .header {
           display: flex;
           justify-content: space-between;
@@ -124,7 +222,6 @@ class SchoolScheduleCard extends HTMLElement {
         }
         .children-grid {
           display: grid;
-          grid-template-columns: repeat(${numColumns}, 1fr);
           gap: var(--column-gap);
         }
         .child-column {
@@ -139,6 +236,11 @@ class SchoolScheduleCard extends HTMLElement {
           text-align: center;
           color: var(--primary-text-color);
         }
+        .child-day {
+          margin: -8px 0 12px;
+          font-size: 0.85em;
+          color: var(--secondary-text-color);
+        }
         .items-container {
           display: flex;
           flex-direction: column;
@@ -147,11 +249,32 @@ class SchoolScheduleCard extends HTMLElement {
           width: 100%;
         }
         .item {
+          position: relative;
           display: flex;
           flex-direction: column;
           align-items: center;
           text-align: center;
         }
+        ha-card.tap-to-pack .item {
+          cursor: pointer;
+        }
+        .item.packed .item-image,
+        .item.packed .item-image-placeholder {
+          opacity: 0.35;
+        }
+        .item.packed::after {
+          content: '✓';
+          position: absolute;
+          top: 4px;
+          right: 4px;
+          width: 24px;
+          height: 24px;
+          line-height: 24px;
+          border-radius: 50%;
+          background: var(--success-color, #4caf50);
+          color: #fff;
+          font-weight: 700;
+        }
         .item-image {
           width: var(--image-size);
           height: var(--image-size);
@@ -205,49 +328,122 @@ class SchoolScheduleCard extends HTMLElement {
         }
       </style>
 
-      <ha-card>
+      <ha-card class="${this._config.tap_to_pack ? 'tap-to-pack' : ''}">
         ${this._config.show_header ? `
           <div class="header">
             <span class="title">${this._escapeHtml(this._config.title)}</span>
-            ${this._config.show_date && displayDate ? `
-              <span class="date-badge ${isTomorrow ? 'tomorrow' : ''}">
-                ${isTomorrow ? 'Tomorrow' : 'Today'} - ${this._escapeHtml(this._formatDate(displayDate))}
-              </span>
-            ` : ''}
+            <span class="date-badge" hidden></span>
           </div>
         ` : ''}
-
-        ${childrenToShow.length === 0 ? `
-          <div class="no-items">No children configured</div>
-        ` : `
-          <div class="children-grid">
-            ${childrenToShow.map(([name, data]) => this._renderChild(name, data)).join('')}
-          </div>
-        `}
+        <div class="no-items no-children" hidden>No children configured</div>
+        <div class="children-grid"></div>
       </ha-card>
     `;
+    this._shell = 'card';
+    this._tiles.clear();
+  }
 
-    // Add error handlers for images after DOM is built
-    this.shadowRoot.querySelectorAll('.item-image').forEach(img => {
-      img.addEventListener('error', () => {
-        img.style.display = 'none';
-        const placeholder = img.nextElementSibling;
-        if (placeholder) placeholder.style.display = 'flex';
-      });
+  _updateHeader(displayDate, isTomorrow) {
+    const badge = this.shadowRoot.querySelector('.date-badge');
+    if (!badge) return;
+    const show = this._config.show_date && displayDate;
+    badge.hidden = !show;
+    if (!show) return;
+    badge.classList.toggle('tomorrow', !!isTomorrow);
+    badge.textContent = `${isTomorrow ? 'Tomorrow' : 'Today'} - ${this._formatDate(displayDate)}`;
+  }
+
+  _createElement(html) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    return template.content.firstElementChild;
+  }
+
+  /**
+   * Keep one tile per child, only touching tiles whose items changed
+   */
+  _patchChildren(grid, childrenToShow, displayDate) {
+    const seen = new Set();
+    childrenToShow.forEach(([name, data], index) => {
+      seen.add(name);
+      let tile = this._tiles.get(name);
+      if (!tile) {
+        tile = { el: this._createElement(this._renderChild(name)), key: null, items: new Map() };
+        this._tiles.set(name, tile);
+      }
+      const items = data.items_today || [];
+      const key = JSON.stringify(items);
+      if (tile.key !== key) {
+        this._patchItems(tile, items);
+        tile.key = key;
+      }
+      // Children with their own switchover time or time zone can be on
+      // another day than the header
+      const childDate = data.display_date || displayDate;
+      const day = tile.el.querySelector('.child-day');
+      day.hidden = childDate === displayDate;
+      if (!day.hidden) {
+        day.textContent = `${data.is_tomorrow ? 'Tomorrow' : 'Today'} - ${this._formatDate(childDate)}`;
+      }
+      const packed = this._packedFor(name, childDate);
+      for (const el of tile.items.values()) {
+        el.classList.toggle('packed', packed.has(el.dataset.itemId));
+      }
+      if (grid.children[index] !== tile.el) {
+        grid.insertBefore(tile.el, grid.children[index] || null);
+      }
     });
+
+    for (const [name, tile] of this._tiles) {
+      if (!seen.has(name)) {
+        tile.el.remove();
+        this._tiles.delete(name);
+      }
+    }
   }
 
-  _renderChild(name, data) {
-    const items = data.items_today || [];
+  /**
+   * Reuse item elements (and their decoded images) keyed by item content
+   */
+  _patchItems(tile, items) {
+    const container = tile.el.querySelector('.items-container');
+    const empty = container.querySelector('.no-items');
+
+    if (items.length === 0) {
+      tile.items.clear();
+      container.innerHTML = '<div class="no-items">No items today</div>';
+      return;
+    }
+    if (empty) empty.remove();
+
+    const seen = new Set();
+    items.forEach((item, index) => {
+      const key = `${item.id}|${item.name}|${item.image}`;
+      seen.add(key);
+      let el = tile.items.get(key);
+      if (!el) {
+        el = this._createElement(this._renderItem(item));
+        tile.items.set(key, el);
+      }
+      if (container.children[index] !== el) {
+        container.insertBefore(el, container.children[index] || null);
+      }
+    });
+
+    for (const [key, el] of tile.items) {
+      if (!seen.has(key)) {
+        el.remove();
+        tile.items.delete(key);
+      }
+    }
+  }
 
+  _renderChild(name) {
     return `
-      <div class="child-column">
+      <div class="child-column" data-child="${this._escapeAttr(name)}">
         <div class="child-name">${this._escapeHtml(name)}</div>
-        <div class="items-container">
-          ${items.length === 0 ? `
-            <div class="no-items">No items today</div>
-          ` : items.map(item => this._renderItem(item)).join('')}
-        </div>
+        <div class="child-day" hidden></div>
+        <div class="items-container"></div>
       </div>
     `;
   }
@@ -259,7 +455,7 @@ class SchoolScheduleCard extends HTMLElement {
     const safeImageSrc = this._escapeAttr(imageSrc);
 
     return `
-      <div class="item">
+      <div class="item" data-item-id="${this._escapeAttr(item.id)}">
         ${hasImage ? `
           <img class="item-image" src="${safeImageSrc}" alt="${itemName}">
           <div class="item-image-placeholder" style="display:none;">
@@ -304,7 +500,8 @@ class SchoolScheduleCard extends HTMLElement {
       show_date: true,
       show_item_names: true,
       columns: 'auto',
-      image_size: 80
+      image_size: 80,
+      tap_to_pack: true
     };
   }
 }
@@ -425,10 +622,15 @@ class SchoolScheduleCardEditor extends HTMLElement {
         <input type="checkbox" id="show_item_names" ${this._config.show_item_names !== false ? 'checked' : ''}>
         <label for="show_item_names">Show Item Names</label>
       </div>
+
+      <div class="form-row checkbox-row">
+        <input type="checkbox" id="tap_to_pack" ${this._config.tap_to_pack !== false ? 'checked' : ''}>
+        <label for="tap_to_pack">Tap Items to Mark Packed</label>
+      </div>
     `;
 
     // Add event listeners
-    ['entity', 'title', 'image_size', 'columns', 'show_header', 'show_date', 'show_item_names'].forEach(id => {
+    ['entity', 'title', 'image_size', 'columns', 'show_header', 'show_date', 'show_item_names', 'tap_to_pack'].forEach(id => {
       const el = this.shadowRoot.getElementById(id);
       if (el) {
         el.addEventListener('change', () => this._valueChanged());
@@ -467,6 +669,7 @@ class SchoolScheduleCardEditor extends HTMLElement {
       show_header: this.shadowRoot.getElementById('show_header').checked,
       show_date: this.shadowRoot.getElementById('show_date').checked,
       show_item_names: this.shadowRoot.getElementById('show_item_names').checked,
+      tap_to_pack: this.shadowRoot.getElementById('tap_to_pack').checked,
     };
 
     const event = new CustomEvent('config-changed', {
@@ -1,9 +1,18 @@
 /**
  * School Schedule Management Panel
  * Provides a full UI for managing children, items, and schedules
- * Version: 1.0.13 - Defer DOM updates during user interaction
+ * Version: 1.0.17 - Uploads wait and retry when the server is busy
  */
 
+// Item lists longer than this are rendered as a scrolling window
+const VIRTUAL_LIST_THRESHOLD = 40;
+const VIRTUAL_ROW_HEIGHT = 73; // 48px image + 24px padding + 1px border
+const VIRTUAL_VIEWPORT_HEIGHT = 480;
+const VIRTUAL_OVERSCAN = 5;
+
+// Schedule edits made within this window are sent as one service call
+const EDIT_FLUSH_DELAY = 500;
+
 class SchoolSchedulePanel extends HTMLElement {
   constructor() {
     super();
@@ -14,11 +23,17 @@ class SchoolSchedulePanel extends HTMLElement {
     this._selectedExceptionDate = null;
     this._exceptionItemIds = null; // null = not editing, array = editing
     this._initialized = false;
-    this._boundHandlers = new Map();
     this._userInteracting = false;
     this._pendingUpdate = false;
     this._interactionTimeout = null;
     this._filePickerOpen = false;
+    this._virtualLists = new Map(); // list key -> { items, rowFn }
+    this._scrollPositions = new Map(); // list key -> scrollTop
+    this._pendingEdits = new Map(); // child -> { weekly_schedule, exceptions }
+    this._inflightEdits = []; // sent edits shown until the new state arrives
+    this._flushTimer = null;
+    this._attachEventListeners();
+    this._attachInteractionListeners();
   }
 
   // XSS prevention helpers
@@ -41,6 +56,7 @@ class SchoolSchedulePanel extends HTMLElement {
 
   set hass(hass) {
     this._hass = hass;
+    this._settleEdits();
     if (!this._initialized) {
       this._initialized = true;
       this._render();
@@ -56,10 +72,123 @@ class SchoolSchedulePanel extends HTMLElement {
     };
   }
 
-  _getData() {
+  disconnectedCallback() {
+    // Don't lose edits still waiting for the flush timer
+    if (this._flushTimer) {
+      clearTimeout(this._flushTimer);
+      this._flushEdits();
+    }
+  }
+
+  _getState() {
     if (!this._hass || !this._config) return null;
-    const state = this._hass.states[this._config.entity];
-    return state?.attributes || null;
+    return this._hass.states[this._config.entity] || null;
+  }
+
+  _getData() {
+    const data = this._getState()?.attributes || null;
+    if (!data || (!this._pendingEdits.size && !this._inflightEdits.length)) {
+      return data;
+    }
+
+    // Overlay edits the backend hasn't confirmed yet
+    const children = { ...data.children };
+    const apply = (childName, edits) => {
+      const child = children[childName];
+      if (!child) return;
+      const exceptions = { ...child.exceptions };
+      for (const [date, itemIds] of Object.entries(edits.exceptions)) {
+        if (itemIds === null) delete exceptions[date];
+        else exceptions[date] = itemIds;
+      }
+      children[childName] = {
+        ...child,
+        weekly_schedule: { ...child.weekly_schedule, ...edits.weekly_schedule },
+        exceptions
+      };
+    };
+    this._inflightEdits.forEach(batch => apply(batch.child, batch.edits));
+    this._pendingEdits.forEach((edits, childName) => apply(childName, edits));
+    return { ...data, children };
+  }
+
+  /**
+   * Resolve a child's items. Library items arrive as references
+   * ({id, library: true}) carrying only the fields the child overrides.
+   */
+  _childItems(data, childData) {
+    const library = new Map((data?.item_library || []).map(item => [item.id, item]));
+    return (childData?.all_items || [])
+      .map(item => item.library ? (library.has(item.id) ? { ...library.get(item.id), ...item } : null) : item)
+      .filter(item => item);
+  }
+
+  // A child's items followed by the library items it doesn't have
+  _availableItems(data, childData) {
+    const childItems = this._childItems(data, childData);
+    const ids = new Set(childItems.map(item => item.id));
+    return [...childItems, ...(data?.item_library || []).filter(item => !ids.has(item.id))];
+  }
+
+  /**
+   * Apply a schedule edit locally and queue it for the backend.
+   * kind is 'weekly_schedule' (key = day) or 'exceptions' (key = date,
+   * value null to remove).
+   */
+  _queueEdit(childName, kind, key, value) {
+    if (!this._pendingEdits.has(childName)) {
+      this._pendingEdits.set(childName, { weekly_schedule: {}, exceptions: {} });
+    }
+    this._pendingEdits.get(childName)[kind][key] = value;
+    this._update();
+
+    clearTimeout(this._flushTimer);
+    this._flushTimer = setTimeout(() => this._flushEdits(), EDIT_FLUSH_DELAY);
+  }
+
+  _flushEdits() {
+    this._flushTimer = null;
+    const state = this._getState();
+    const batches = Array.from(this._pendingEdits, ([child, edits]) => ({
+      child, edits, state, done: false
+    }));
+    this._pendingEdits.clear();
+    this._inflightEdits.push(...batches);
+
+    // One set_schedules call per child, all sent without waiting on each other
+    return Promise.all(batches.map(async batch => {
+      const data = { child_name: batch.child };
+      if (Object.keys(batch.edits.weekly_schedule).length) {
+        data.weekly_schedule = batch.edits.weekly_schedule;
+      }
+      if (Object.keys(batch.edits.exceptions).length) {
+        data.exceptions = batch.edits.exceptions;
+      }
+      try {
+        await this._hass.callService('school_schedule', 'set_schedules', data);
+        batch.done = true;
+        this._settleEdits();
+      } catch (error) {
+        console.error('Service call failed:', error);
+        // Roll back by dropping the overlay
+        this._inflightEdits = this._inflightEdits.filter(b => b !== batch);
+        this._update();
+        this._showMessage(
+          `Error: ${error.message || 'Service call failed'}. Changes for ${batch.child} were undone.`,
+          'error', 5000
+        );
+      }
+    }));
+  }
+
+  _settleEdits() {
+    // A confirmed edit is kept until the state that includes it arrives
+    const state = this._getState();
+    const remaining = this._inflightEdits.filter(b => !b.done || b.state === state);
+    if (remaining.length !== this._inflightEdits.length) {
+      this._inflightEdits = remaining;
+      if (this._initialized) this._updateData();
+    }
   }
 
   _render() {
@@ -174,6 +303,8 @@ class SchoolSchedulePanel extends HTMLElement {
           padding: 12px; border-bottom: 1px solid var(--divider-color, #e0e0e0);
         }
         .item-list li:last-child { border-bottom: none; }
+        .virtual-list { overflow-y: auto; }
+        .virtual-list .item-list li { height: ${VIRTUAL_ROW_HEIGHT}px; box-sizing: border-box; }
         .item-list .item-info { display: flex; align-items: center; gap: 12px; }
         .item-list .item-image {
           width: 48px; height: 48px; object-fit: contain;
@@ -323,8 +454,11 @@ class SchoolSchedulePanel extends HTMLElement {
           <button class="tab ${this._activeTab === 'schedule' ? 'active' : ''}" data-tab="schedule">Schedule</button>
           <button class="tab ${this._activeTab === 'exceptions' ? 'active' : ''}" data-tab="exceptions">Exceptions</button>
         </div>
-        <div class="content" id="content">
-          ${this._renderTabContent()}
+        <div class="content">
+          <div id="messages"></div>
+          <div id="content">
+            ${this._renderTabContent()}
+          </div>
         </div>
       </ha-card>
 
@@ -343,9 +477,123 @@ class SchoolSchedulePanel extends HTMLElement {
         </div>
       </div>
     `;
+  }
 
-    this._attachEventListeners();
-    this._attachInteractionListeners();
+  /**
+   * Bring the rendered tab in line with the current state, reusing every
+   * element (and its loaded image) that has not changed.
+   */
+  _update() {
+    const contentEl = this.shadowRoot.getElementById('content');
+    if (!contentEl) {
+      this._render();
+      return;
+    }
+    this.shadowRoot.querySelectorAll('.tab').forEach(tab => {
+      tab.classList.toggle('active', tab.dataset.tab === this._activeTab);
+    });
+    const next = document.createElement('div');
+    next.innerHTML = this._renderTabContent();
+    this._morphChildren(contentEl, next);
+  }
+
+  /**
+   * Reconcile the children of a live element with freshly rendered ones.
+   * Elements with a data-key are matched by key, others by position.
+   */
+  _morphChildren(target, source) {
+    const keyed = new Map();
+    for (const child of target.children) {
+      if (child.dataset.key) keyed.set(child.dataset.key, child);
+    }
+
+    const newNodes = Array.from(source.childNodes);
+    newNodes.forEach((newNode, index) => {
+      const current = target.childNodes[index] || null;
+      let match = null;
+      if (newNode.nodeType === Node.ELEMENT_NODE && newNode.dataset.key) {
+        match = keyed.get(newNode.dataset.key) || null;
+        keyed.delete(newNode.dataset.key);
+      } else if (current && current.nodeType === newNode.nodeType &&
+          current.nodeName === newNode.nodeName &&
+          !(current.dataset && current.dataset.key)) {
+        match = current;
+      }
+
+      if (!match) {
+        target.insertBefore(newNode, current);
+        return;
+      }
+      if (match !== current) {
+        target.insertBefore(match, current);
+      }
+      if (!match.isEqualNode(newNode)) {
+        this._morph(match, newNode);
+      }
+    });
+
+    while (target.childNodes.length > newNodes.length) {
+      target.lastChild.remove();
+    }
+  }
+
+  _morph(target, source) {
+    if (target.nodeType !== Node.ELEMENT_NODE) {
+      target.nodeValue = source.nodeValue;
+      return;
+    }
+    for (const { name } of Array.from(target.attributes)) {
+      if (!source.hasAttribute(name)) target.removeAttribute(name);
+    }
+    for (const { name, value } of Array.from(source.attributes)) {
+      if (target.getAttribute(name) !== value) target.setAttribute(name, value);
+    }
+    // Upload status and preview are filled in by script, not by render
+    if (target.hasAttribute('data-preserve')) return;
+    this._morphChildren(target, source);
+  }
+
+  /**
+   * Render a list of item rows, windowing long lists to the visible rows
+   */
+  _renderItemList(listKey, items, rowFn) {
+    if (items.length <= VIRTUAL_LIST_THRESHOLD) {
+      this._virtualLists.delete(listKey);
+      return `<ul class="item-list">${items.map(rowFn).join('')}</ul>`;
+    }
+    this._virtualLists.set(listKey, { items, rowFn });
+    return `
+      <div class="virtual-list" data-key="list-${this._escapeAttr(listKey)}" data-list="${this._escapeAttr(listKey)}" style="height: ${VIRTUAL_VIEWPORT_HEIGHT}px;">
+        ${this._renderVirtualWindow(listKey)}
+      </div>
+    `;
+  }
+
+  _renderVirtualWindow(listKey) {
+    const { items, rowFn } = this._virtualLists.get(listKey);
+    const scrollTop = this._scrollPositions.get(listKey) || 0;
+    const visible = Math.ceil(VIRTUAL_VIEWPORT_HEIGHT / VIRTUAL_ROW_HEIGHT);
+    const first = Math.max(0, Math.floor(scrollTop / VIRTUAL_ROW_HEIGHT) - VIRTUAL_OVERSCAN);
+    const last = Math.min(items.length, first + visible + 2 * VIRTUAL_OVERSCAN);
+    return `
+      <ul class="item-list" style="padding-top: ${first * VIRTUAL_ROW_HEIGHT}px; padding-bottom: ${(items.length - last) * VIRTUAL_ROW_HEIGHT}px;">
+        ${items.slice(first, last).map(rowFn).join('')}
+      </ul>
+    `;
+  }
+
+  _onVirtualScroll(listEl) {
+    const listKey = listEl.dataset.list;
+    if (!this._virtualLists.has(listKey)) return;
+    this._scrollPositions.set(listKey, listEl.scrollTop);
+    if (this._scrollFrame) return;
+    this._scrollFrame = requestAnimationFrame(() => {
+      this._scrollFrame = null;
+      if (!this._virtualLists.has(listKey) || !listEl.isConnected) return;
+      const next = document.createElement('div');
+      next.innerHTML = this._renderVirtualWindow(listKey);
+      this._morphChildren(listEl, next);
+    });
   }
 
   _markUserInteracting() {
@@ -362,6 +610,12 @@ class SchoolSchedulePanel extends HTMLElement {
 
   _attachInteractionListeners() {
     const root = this.shadowRoot;
+    // Scroll doesn't bubble, so windowed lists are watched during capture
+    root.addEventListener('scroll', (e) => {
+      if (e.target.classList && e.target.classList.contains('virtual-list')) {
+        this._onVirtualScroll(e.target);
+      }
+    }, true);
     root.addEventListener('focusin', () => this._markUserInteracting());
     root.addEventListener('keydown', () => this._markUserInteracting());
     root.addEventListener('mousedown', () => this._markUserInteracting());
@@ -455,7 +709,7 @@ class SchoolSchedulePanel extends HTMLElement {
         ` : `
           <ul class="item-list">
             ${childNames.map(name => `
-              <li>
+              <li data-key="child-${this._escapeAttr(name)}">
                 <div class="item-info">
                   <ha-icon icon="mdi:account-child"></ha-icon>
                   <span class="item-name">${this._escapeHtml(name)}</span>
@@ -506,7 +760,7 @@ class SchoolSchedulePanel extends HTMLElement {
     }
 
     const isShared = this._selectedChild === 'Shared';
-    const items = isShared ? library : (children[this._selectedChild]?.all_items || []);
+    const items = isShared ? library : this._childItems(data, children[this._selectedChild]);
     const sectionTitle = isShared ? 'Shared Items' : `${this._escapeHtml(this._selectedChild)}'s Items`;
     const emptyMessage = isShared
       ? 'No shared items yet. Add items here to assign to multiple children.'
@@ -517,7 +771,7 @@ class SchoolSchedulePanel extends HTMLElement {
         <div class="section-header"><span class="section-title">Select</span></div>
         <div class="child-selector">
           ${allOptions.map(name => `
-            <div class="child-chip ${name === this._selectedChild ? 'active' : ''} ${name === 'Shared' ? 'shared-chip' : ''}" data-child="${this._escapeAttr(name)}">${this._escapeHtml(name)}</div>
+            <div class="child-chip ${name === this._selectedChild ? 'active' : ''} ${name === 'Shared' ? 'shared-chip' : ''}" data-key="chip-${this._escapeAttr(name)}" data-child="${this._escapeAttr(name)}">${this._escapeHtml(name)}</div>
           `).join('')}
         </div>
       </div>
@@ -529,22 +783,20 @@ class SchoolSchedulePanel extends HTMLElement {
         ${items.length === 0 ? `
           <div class="empty-state"><ha-icon icon="mdi:${isShared ? 'package-variant' : 'bag-personal'}"></ha-icon><p>${emptyMessage}</p></div>
         ` : `
-          <ul class="item-list">
-            ${items.map(item => `
-              <li>
-                <div class="item-info">
-                  ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
-                  <div class="item-details">
-                    <span class="item-name">${this._escapeHtml(item.name)}</span>
-                    <span class="item-id">ID: ${this._escapeHtml(item.id)}</span>
-                  </div>
-                </div>
-                <div class="item-actions">
-                  <button class="btn btn-danger btn-sm" data-action="${isShared ? 'remove-library-item' : 'remove-item'}" data-id="${this._escapeAttr(item.id)}">Remove</button>
+          ${this._renderItemList(isShared ? 'library' : `items-${this._selectedChild}`, items, item => `
+            <li data-key="item-${this._escapeAttr(item.id)}">
+              <div class="item-info">
+                ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
+                <div class="item-details">
+                  <span class="item-name">${this._escapeHtml(item.name)}</span>
+                  <span class="item-id">ID: ${this._escapeHtml(item.id)}</span>
                 </div>
-              </li>
-            `).join('')}
-          </ul>
+              </div>
+              <div class="item-actions">
+                <button class="btn btn-danger btn-sm" data-action="${isShared ? 'remove-library-item' : 'remove-item'}" data-id="${this._escapeAttr(item.id)}">Remove</button>
+              </div>
+            </li>
+          `)}
         `}
       </div>
 
@@ -561,8 +813,8 @@ class SchoolSchedulePanel extends HTMLElement {
             <button class="btn btn-secondary" id="upload-image-btn" type="button">Upload Image</button>
           </div>
           <input type="file" id="image-file-input" accept="image/png,image/jpeg,image/gif,image/svg+xml,image/webp" style="display: none;">
-          <div id="upload-status" class="upload-status"></div>
-          <div id="image-preview" class="image-preview"></div>
+          <div id="upload-status" class="upload-status" data-preserve></div>
+          <div id="image-preview" class="image-preview" data-preserve></div>
         </div>
         <button class="btn btn-primary" id="add-item-btn">Add Item</button>
       </div>
@@ -573,7 +825,6 @@ class SchoolSchedulePanel extends HTMLElement {
     const data = this._getData();
     const children = data?.children || {};
     const childNames = Object.keys(children);
-    const library = data?.item_library || [];
     const days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'];
 
     if (childNames.length === 0) {
@@ -585,9 +836,8 @@ class SchoolSchedulePanel extends HTMLElement {
     }
 
     const childData = children[this._selectedChild] || {};
-    const childItems = childData.all_items || [];
     // Combine child's own items with shared library items
-    const allItems = [...childItems, ...library];
+    const allItems = this._availableItems(data, childData);
     const weeklySchedule = childData.weekly_schedule || {};
     const scheduledItemIds = weeklySchedule[this._selectedDay] || [];
 
@@ -604,7 +854,7 @@ class SchoolSchedulePanel extends HTMLElement {
         <div class="section-header"><span class="section-title">Select Child</span></div>
         <div class="child-selector">
           ${childNames.map(name => `
-            <div class="child-chip ${name === this._selectedChild ? 'active' : ''}" data-child="${this._escapeAttr(name)}">${this._escapeHtml(name)}</div>
+            <div class="child-chip ${name === this._selectedChild ? 'active' : ''}" data-key="chip-${this._escapeAttr(name)}" data-child="${this._escapeAttr(name)}">${this._escapeHtml(name)}</div>
           `).join('')}
         </div>
       </div>
@@ -613,7 +863,7 @@ class SchoolSchedulePanel extends HTMLElement {
         <div class="section-header"><span class="section-title">Day of Week</span></div>
         <div class="schedule-grid">
           ${days.map(day => `
-            <div class="day-btn ${day === this._selectedDay ? 'active' : ''}" data-day="${day}">
+            <div class="day-btn ${day === this._selectedDay ? 'active' : ''}" data-key="day-${day}" data-day="${day}">
               ${day.charAt(0).toUpperCase() + day.slice(1, 3)}
             </div>
           `).join('')}
@@ -627,22 +877,20 @@ class SchoolSchedulePanel extends HTMLElement {
         ${scheduledItems.length === 0 ? `
           <div class="empty-state" style="padding: 20px;"><ha-icon icon="mdi:calendar-blank"></ha-icon><p>No items scheduled for ${dayTitle}</p></div>
         ` : `
-          <ul class="item-list">
-            ${scheduledItems.map(item => `
-              <li>
-                <div class="item-info">
-                  ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
-                  <div class="item-details">
-                    <span class="item-name">${this._escapeHtml(item.name)}</span>
-                    <span class="item-id">ID: ${this._escapeHtml(item.id)}</span>
-                  </div>
-                </div>
-                <div class="item-actions">
-                  <button class="btn btn-danger btn-sm" data-action="unschedule-item" data-id="${this._escapeAttr(item.id)}">Remove</button>
+          ${this._renderItemList(`scheduled-${this._selectedChild}-${this._selectedDay}`, scheduledItems, item => `
+            <li data-key="item-${this._escapeAttr(item.id)}">
+              <div class="item-info">
+                ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
+                <div class="item-details">
+                  <span class="item-name">${this._escapeHtml(item.name)}</span>
+                  <span class="item-id">ID: ${this._escapeHtml(item.id)}</span>
                 </div>
-              </li>
-            `).join('')}
-          </ul>
+              </div>
+              <div class="item-actions">
+                <button class="btn btn-danger btn-sm" data-action="unschedule-item" data-id="${this._escapeAttr(item.id)}">Remove</button>
+              </div>
+            </li>
+          `)}
         `}
       </div>
 
@@ -655,22 +903,20 @@ class SchoolSchedulePanel extends HTMLElement {
         ` : availableItems.length === 0 ? `
           <div class="empty-state" style="padding: 20px;"><ha-icon icon="mdi:check-all"></ha-icon><p>All items are scheduled</p></div>
         ` : `
-          <ul class="item-list">
-            ${availableItems.map(item => `
-              <li>
-                <div class="item-info">
-                  ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
-                  <div class="item-details">
-                    <span class="item-name">${this._escapeHtml(item.name)}</span>
-                    <span class="item-id">ID: ${this._escapeHtml(item.id)}</span>
-                  </div>
+          ${this._renderItemList(`available-${this._selectedChild}-${this._selectedDay}`, availableItems, item => `
+            <li data-key="item-${this._escapeAttr(item.id)}">
+              <div class="item-info">
+                ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
+                <div class="item-details">
+                  <span class="item-name">${this._escapeHtml(item.name)}</span>
+                  <span class="item-id">ID: ${this._escapeHtml(item.id)}</span>
                 </div>
-                <div class="item-actions">
-                  <button class="btn btn-primary btn-sm" data-action="schedule-item" data-id="${this._escapeAttr(item.id)}">Add</button>
-                </div>
-              </li>
-            `).join('')}
-          </ul>
+              </div>
+              <div class="item-actions">
+                <button class="btn btn-primary btn-sm" data-action="schedule-item" data-id="${this._escapeAttr(item.id)}">Add</button>
+              </div>
+            </li>
+          `)}
         `}
       </div>
     `;
@@ -680,7 +926,6 @@ class SchoolSchedulePanel extends HTMLElement {
     const data = this._getData();
     const children = data?.children || {};
     const childNames = Object.keys(children);
-    const library = data?.item_library || [];
     const days = ['sunday', 'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday'];
 
     if (childNames.length === 0) {
@@ -692,8 +937,7 @@ class SchoolSchedulePanel extends HTMLElement {
     }
 
     const childData = children[this._selectedChild] || {};
-    const childItems = childData.all_items || [];
-    const allItems = [...childItems, ...library];
+    const allItems = this._availableItems(data, childData);
     const exceptions = childData.exceptions || {};
     const weeklySchedule = childData.weekly_schedule || {};
 
@@ -721,7 +965,7 @@ class SchoolSchedulePanel extends HTMLElement {
         <div class="section">
           <div class="section-header"><span class="section-title">Exception Date</span></div>
           <div class="form-group">
-            <input type="date" id="exception-date" value="${this._escapeAttr(this._selectedExceptionDate)}" min="${todayStr}">
+            <input type="date" id="exception-date" data-key="exception-date-edit" value="${this._escapeAttr(this._selectedExceptionDate)}" min="${todayStr}">
           </div>
           <p style="color: var(--secondary-text-color); font-size: 0.9em; margin: 0 0 16px;">
             Items selected below will replace the normal schedule for this date.
@@ -735,21 +979,19 @@ class SchoolSchedulePanel extends HTMLElement {
           ${exScheduledItems.length === 0 ? `
             <div class="empty-state" style="padding: 20px;"><ha-icon icon="mdi:calendar-remove"></ha-icon><p>No items (day off)</p></div>
           ` : `
-            <ul class="item-list">
-              ${exScheduledItems.map(item => `
-                <li>
-                  <div class="item-info">
-                    ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
-                    <div class="item-details">
-                      <span class="item-name">${this._escapeHtml(item.name)}</span>
-                    </div>
-                  </div>
-                  <div class="item-actions">
-                    <button class="btn btn-danger btn-sm" data-action="exception-remove-item" data-id="${this._escapeAttr(item.id)}">Remove</button>
+            ${this._renderItemList('ex-scheduled', exScheduledItems, item => `
+              <li data-key="item-${this._escapeAttr(item.id)}">
+                <div class="item-info">
+                  ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
+                  <div class="item-details">
+                    <span class="item-name">${this._escapeHtml(item.name)}</span>
                   </div>
-                </li>
-              `).join('')}
-            </ul>
+                </div>
+                <div class="item-actions">
+                  <button class="btn btn-danger btn-sm" data-action="exception-remove-item" data-id="${this._escapeAttr(item.id)}">Remove</button>
+                </div>
+              </li>
+            `)}
           `}
         </div>
 
@@ -762,21 +1004,19 @@ class SchoolSchedulePanel extends HTMLElement {
           ` : exAvailableItems.length === 0 ? `
             <div class="empty-state" style="padding: 20px;"><ha-icon icon="mdi:check-all"></ha-icon><p>All items are included</p></div>
           ` : `
-            <ul class="item-list">
-              ${exAvailableItems.map(item => `
-                <li>
-                  <div class="item-info">
-                    ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
-                    <div class="item-details">
-                      <span class="item-name">${this._escapeHtml(item.name)}</span>
-                    </div>
-                  </div>
-                  <div class="item-actions">
-                    <button class="btn btn-primary btn-sm" data-action="exception-add-item" data-id="${this._escapeAttr(item.id)}">Add</button>
+            ${this._renderItemList('ex-available', exAvailableItems, item => `
+              <li data-key="item-${this._escapeAttr(item.id)}">
+                <div class="item-info">
+                  ${item.image ? `<img class="item-image" src="${this._escapeAttr(item.image)}" alt="${this._escapeAttr(item.name)}">` : `<ha-icon icon="mdi:image"></ha-icon>`}
+                  <div class="item-details">
+                    <span class="item-name">${this._escapeHtml(item.name)}</span>
                   </div>
-                </li>
-              `).join('')}
-            </ul>
+                </div>
+                <div class="item-actions">
+                  <button class="btn btn-primary btn-sm" data-action="exception-add-item" data-id="${this._escapeAttr(item.id)}">Add</button>
+                </div>
+              </li>
+            `)}
           `}
         </div>
 
@@ -794,7 +1034,7 @@ class SchoolSchedulePanel extends HTMLElement {
           </p>
           <div class="form-group">
             <label for="exception-date">Date</label>
-            <input type="date" id="exception-date" min="${todayStr}">
+            <input type="date" id="exception-date" data-key="exception-date-new" min="${todayStr}">
           </div>
           <button class="btn btn-primary" id="add-exception-btn">Set Up Exception</button>
         </div>
@@ -806,7 +1046,7 @@ class SchoolSchedulePanel extends HTMLElement {
         <div class="section-header"><span class="section-title">Select Child</span></div>
         <div class="child-selector">
           ${childNames.map(name => `
-            <div class="child-chip ${name === this._selectedChild ? 'active' : ''}" data-child="${this._escapeAttr(name)}">${this._escapeHtml(name)}</div>
+            <div class="child-chip ${name === this._selectedChild ? 'active' : ''}" data-key="chip-${this._escapeAttr(name)}" data-child="${this._escapeAttr(name)}">${this._escapeHtml(name)}</div>
           `).join('')}
         </div>
       </div>
@@ -823,7 +1063,7 @@ class SchoolSchedulePanel extends HTMLElement {
               return item ? item.name : id;
             }).join(', ');
             return `
-              <div class="exception-item">
+              <div class="exception-item" data-key="exception-${this._escapeAttr(date)}">
                 <div>
                   <div class="exception-date">${this._escapeHtml(this._formatDate(date))}</div>
                   <div class="exception-items">${this._escapeHtml(itemNames || 'No items (day off)')}</div>
@@ -852,127 +1092,70 @@ class SchoolSchedulePanel extends HTMLElement {
   }
 
   _attachEventListeners() {
-    // Clear old handlers to prevent memory leaks
-    this._boundHandlers.clear();
-
-    // Tab switching
-    this.shadowRoot.querySelectorAll('.tab').forEach(tab => {
-      const handler = () => {
-        this._activeTab = tab.dataset.tab;
-        this._render();
-      };
-      tab.addEventListener('click', handler);
-      this._boundHandlers.set(tab, handler);
-    });
-
-    // Child selector
-    this.shadowRoot.querySelectorAll('.child-chip').forEach(chip => {
-      const handler = () => {
-        this._selectedChild = chip.dataset.child;
-        this._render();
-      };
-      chip.addEventListener('click', handler);
-      this._boundHandlers.set(chip, handler);
-    });
-
-    // Day selector
-    this.shadowRoot.querySelectorAll('.day-btn').forEach(btn => {
-      const handler = () => {
-        this._selectedDay = btn.dataset.day;
-        this._render();
-      };
-      btn.addEventListener('click', handler);
-      this._boundHandlers.set(btn, handler);
-    });
-
-    // Add child button
-    const addChildBtn = this.shadowRoot.getElementById('add-child-btn');
-    if (addChildBtn) {
-      addChildBtn.addEventListener('click', () => this._addChild());
-    }
-
-    // Remove child buttons
-    this.shadowRoot.querySelectorAll('[data-action="remove-child"]').forEach(btn => {
-      btn.addEventListener('click', () => this._removeChild(btn.dataset.name));
-    });
+    // Handlers are delegated from the shadow root once, so patching the
+    // content never has to re-bind them.
+    this.shadowRoot.addEventListener('click', (e) => this._onClick(e));
+    this.shadowRoot.addEventListener('change', (e) => this._onChange(e));
+  }
 
-    // Add item button
-    const addItemBtn = this.shadowRoot.getElementById('add-item-btn');
-    if (addItemBtn) {
-      addItemBtn.addEventListener('click', () => this._addItem());
+  _onClick(e) {
+    const tab = e.target.closest('.tab');
+    if (tab) {
+      this._activeTab = tab.dataset.tab;
+      this._update();
+      return;
     }
 
-    // Upload image button
-    const uploadBtn = this.shadowRoot.getElementById('upload-image-btn');
-    const fileInput = this.shadowRoot.getElementById('image-file-input');
-    if (uploadBtn && fileInput) {
-      uploadBtn.addEventListener('click', () => {
-        this._filePickerOpen = true;
-        fileInput.click();
-      });
-      fileInput.addEventListener('change', (e) => {
-        this._filePickerOpen = false;
-        this._handleImageUpload(e);
-      });
+    const chip = e.target.closest('.child-chip');
+    if (chip) {
+      this._selectedChild = chip.dataset.child;
+      this._update();
+      return;
     }
 
-    // Remove item buttons
-    this.shadowRoot.querySelectorAll('[data-action="remove-item"]').forEach(btn => {
-      btn.addEventListener('click', () => this._removeItem(btn.dataset.id));
-    });
-
-    // Remove library item buttons (for Shared items)
-    this.shadowRoot.querySelectorAll('[data-action="remove-library-item"]').forEach(btn => {
-      btn.addEventListener('click', () => this._removeLibraryItem(btn.dataset.id));
-    });
-
-    // Schedule item buttons (add item to schedule)
-    this.shadowRoot.querySelectorAll('[data-action="schedule-item"]').forEach(btn => {
-      btn.addEventListener('click', () => this._scheduleItem(btn.dataset.id));
-    });
-
-    // Unschedule item buttons (remove item from schedule)
-    this.shadowRoot.querySelectorAll('[data-action="unschedule-item"]').forEach(btn => {
-      btn.addEventListener('click', () => this._unscheduleItem(btn.dataset.id));
-    });
-
-    // Exception: "Set Up Exception" button (non-editing mode)
-    const addExceptionBtn = this.shadowRoot.getElementById('add-exception-btn');
-    if (addExceptionBtn) {
-      addExceptionBtn.addEventListener('click', () => this._startException());
+    const dayBtn = e.target.closest('.day-btn');
+    if (dayBtn) {
+      this._selectedDay = dayBtn.dataset.day;
+      this._update();
+      return;
     }
 
-    // Exception: Save and Cancel buttons (editing mode)
-    const saveExceptionBtn = this.shadowRoot.getElementById('save-exception-btn');
-    if (saveExceptionBtn) {
-      saveExceptionBtn.addEventListener('click', () => this._saveException());
-    }
-    const cancelExceptionBtn = this.shadowRoot.getElementById('cancel-exception-btn');
-    if (cancelExceptionBtn) {
-      cancelExceptionBtn.addEventListener('click', () => this._cancelException());
+    const btn = e.target.closest('button');
+    if (!btn) return;
+
+    switch (btn.dataset.action || btn.id) {
+      case 'add-child-btn': this._addChild(); break;
+      case 'remove-child': this._removeChild(btn.dataset.name); break;
+      case 'add-item-btn': this._addItem(); break;
+      case 'upload-image-btn': {
+        const fileInput = this.shadowRoot.getElementById('image-file-input');
+        if (fileInput) {
+          this._filePickerOpen = true;
+          fileInput.click();
+        }
+        break;
+      }
+      case 'remove-item': this._removeItem(btn.dataset.id); break;
+      case 'remove-library-item': this._removeLibraryItem(btn.dataset.id); break;
+      case 'schedule-item': this._scheduleItem(btn.dataset.id); break;
+      case 'unschedule-item': this._unscheduleItem(btn.dataset.id); break;
+      case 'add-exception-btn': this._startException(); break;
+      case 'save-exception-btn': this._saveException(); break;
+      case 'cancel-exception-btn': this._cancelException(); break;
+      case 'exception-add-item': this._addExceptionItem(btn.dataset.id); break;
+      case 'exception-remove-item': this._removeExceptionItem(btn.dataset.id); break;
+      case 'edit-exception': this._editException(btn.dataset.date); break;
+      case 'remove-exception': this._removeException(btn.dataset.date); break;
     }
+  }
 
-    // Exception: date input change (while editing)
-    const exceptionDateInput = this.shadowRoot.getElementById('exception-date');
-    if (exceptionDateInput && this._exceptionItemIds !== null) {
-      exceptionDateInput.addEventListener('change', (e) => this._onExceptionDateChange(e.target.value));
+  _onChange(e) {
+    if (e.target.id === 'image-file-input') {
+      this._filePickerOpen = false;
+      this._handleImageUpload(e);
+    } else if (e.target.id === 'exception-date' && this._exceptionItemIds !== null) {
+      this._onExceptionDateChange(e.target.value);
     }
-
-    // Exception: add/remove item buttons in editing mode
-    this.shadowRoot.querySelectorAll('[data-action="exception-add-item"]').forEach(btn => {
-      btn.addEventListener('click', () => this._addExceptionItem(btn.dataset.id));
-    });
-    this.shadowRoot.querySelectorAll('[data-action="exception-remove-item"]').forEach(btn => {
-      btn.addEventListener('click', () => this._removeExceptionItem(btn.dataset.id));
-    });
-
-    // Exception: edit and remove buttons on existing exceptions
-    this.shadowRoot.querySelectorAll('[data-action="edit-exception"]').forEach(btn => {
-      btn.addEventListener('click', () => this._editException(btn.dataset.date));
-    });
-    this.shadowRoot.querySelectorAll('[data-action="remove-exception"]').forEach(btn => {
-      btn.addEventListener('click', () => this._removeException(btn.dataset.date));
-    });
   }
 
   async _callService(service, data) {
@@ -980,21 +1163,23 @@ class SchoolSchedulePanel extends HTMLElement {
       await this._hass.callService('school_schedule', service, data);
       // Wait for state to update
       await new Promise(resolve => setTimeout(resolve, 300));
-      this._render();
+      this._update();
+      return true;
     } catch (error) {
       console.error('Service call failed:', error);
       // Show error in a non-blocking way
-      const content = this.shadowRoot.getElementById('content');
-      if (content) {
-        const msg = document.createElement('div');
-        msg.className = 'message error';
-        msg.textContent = 'Error: ' + (error.message || 'Service call failed');
-        content.prepend(msg);
-        setTimeout(() => msg.remove(), 5000);
-      }
+      this._showMessage('Error: ' + (error.message || 'Service call failed'), 'error', 5000);
+      return false;
     }
   }
 
+  _clearInputs(...ids) {
+    ids.forEach(id => {
+      const el = this.shadowRoot.getElementById(id);
+      if (el) el.value = '';
+    });
+  }
+
   _addChild() {
     const nameInput = this.shadowRoot.getElementById('child-name');
     const name = nameInput?.value?.trim();
@@ -1002,7 +1187,9 @@ class SchoolSchedulePanel extends HTMLElement {
       this._showMessage('Please enter a name', 'error');
       return;
     }
-    this._callService('add_child', { name });
+    this._callService('add_child', { name }).then(ok => {
+      if (ok) this._clearInputs('child-name');
+    });
   }
 
   _removeChild(name) {
@@ -1063,27 +1250,35 @@ class SchoolSchedulePanel extends HTMLElement {
     const itemId = this._generateItemId(itemName, existingIds);
 
     // If "Shared" is selected, add to library; otherwise add to child
-    if (isShared) {
-      this._callService('add_library_item', {
+    const call = isShared
+      ? this._callService('add_library_item', {
         item_id: itemId,
         item_name: itemName,
         image: image || ''
-      });
-    } else {
-      this._callService('add_item', {
+      })
+      : this._callService('add_item', {
         child_name: this._selectedChild,
         item_id: itemId,
         item_name: itemName,
         image: image || ''
       });
-    }
+
+    // The form survives re-renders now, so reset it for the next item
+    call.then(ok => {
+      if (!ok) return;
+      this._clearInputs('item-name', 'item-image');
+      ['upload-status', 'image-preview'].forEach(id => {
+        const el = this.shadowRoot.getElementById(id);
+        if (el) el.innerHTML = '';
+      });
+    });
   }
 
   _removeItem(itemId) {
     // Find the item name for the message
     const data = this._getData();
     const childData = data?.children?.[this._selectedChild];
-    const item = (childData?.all_items || []).find(i => i.id === itemId);
+    const item = this._childItems(data, childData).find(i => i.id === itemId);
     const itemName = item?.name || itemId;
 
     this._showConfirmModal(
@@ -1114,13 +1309,22 @@ class SchoolSchedulePanel extends HTMLElement {
       const formData = new FormData();
       formData.append('file', file);
 
-      const response = await fetch('/api/school_schedule/upload', {
-        method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${this._hass.auth.data.access_token}`
-        },
-        body: formData
-      });
+      // The server refuses uploads with 429 while busy; wait as asked and retry
+      let response;
+      for (let attempt = 0; ; attempt++) {
+        response = await fetch('/api/school_schedule/upload', {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${this._hass.auth.data.access_token}`
+          },
+          body: formData
+        });
+        if (response.status !== 429 || attempt >= 4) break;
+        const wait = Math.max(1, Number(response.headers.get('Retry-After')) || 2);
+        if (statusEl) statusEl.textContent = `Server busy, retrying in ${wait}s...`;
+        await new Promise(resolve => setTimeout(resolve, wait * 1000));
+        if (statusEl) statusEl.textContent = 'Uploading...';
+      }
 
       const result = await response.json();
 
@@ -1170,7 +1374,7 @@ class SchoolSchedulePanel extends HTMLElement {
   }
 
   _scheduleItem(itemId) {
-    // Get current scheduled items and add the new one
+    // Get current scheduled items (including unsent edits) and add the new one
     const data = this._getData();
     const childData = data?.children?.[this._selectedChild] || {};
     const weeklySchedule = childData.weekly_schedule || {};
@@ -1180,25 +1384,17 @@ class SchoolSchedulePanel extends HTMLElement {
       currentItems.push(itemId);
     }
 
-    this._callService('set_weekly_schedule', {
-      child_name: this._selectedChild,
-      day: this._selectedDay,
-      item_ids: currentItems
-    });
+    this._queueEdit(this._selectedChild, 'weekly_schedule', this._selectedDay, currentItems);
   }
 
   _unscheduleItem(itemId) {
-    // Get current scheduled items and remove the item
+    // Get current scheduled items (including unsent edits) and remove the item
     const data = this._getData();
     const childData = data?.children?.[this._selectedChild] || {};
     const weeklySchedule = childData.weekly_schedule || {};
     const currentItems = (weeklySchedule[this._selectedDay] || []).filter(id => id !== itemId);
 
-    this._callService('set_weekly_schedule', {
-      child_name: this._selectedChild,
-      day: this._selectedDay,
-      item_ids: currentItems
-    });
+    this._queueEdit(this._selectedChild, 'weekly_schedule', this._selectedDay, currentItems);
   }
 
   _startException() {
@@ -1221,7 +1417,7 @@ class SchoolSchedulePanel extends HTMLElement {
 
     this._selectedExceptionDate = date;
     this._exceptionItemIds = [...defaultItems];
-    this._render();
+    this._update();
   }
 
   _editException(date) {
@@ -1232,19 +1428,19 @@ class SchoolSchedulePanel extends HTMLElement {
 
     this._selectedExceptionDate = date;
     this._exceptionItemIds = [...existingItems];
-    this._render();
+    this._update();
   }
 
   _addExceptionItem(itemId) {
     if (!this._exceptionItemIds.includes(itemId)) {
       this._exceptionItemIds.push(itemId);
     }
-    this._render();
+    this._update();
   }
 
   _removeExceptionItem(itemId) {
     this._exceptionItemIds = this._exceptionItemIds.filter(id => id !== itemId);
-    this._render();
+    this._update();
   }
 
   _onExceptionDateChange(newDate) {
@@ -1268,27 +1464,26 @@ class SchoolSchedulePanel extends HTMLElement {
       this._selectedExceptionDate = newDate;
       this._exceptionItemIds = [...(weeklySchedule[dayName] || [])];
     }
-    this._render();
+    this._update();
   }
 
   _saveException() {
     if (!this._selectedExceptionDate) return;
 
-    this._callService('add_exception', {
-      child_name: this._selectedChild,
-      date: this._selectedExceptionDate,
-      item_ids: this._exceptionItemIds || []
-    });
+    const date = this._selectedExceptionDate;
+    const itemIds = [...(this._exceptionItemIds || [])];
 
     // Clear editing state
     this._selectedExceptionDate = null;
     this._exceptionItemIds = null;
+
+    this._queueEdit(this._selectedChild, 'exceptions', date, itemIds);
   }
 
   _cancelException() {
     this._selectedExceptionDate = null;
     this._exceptionItemIds = null;
-    this._render();
+    this._update();
   }
 
   _removeException(date) {
@@ -1296,36 +1491,30 @@ class SchoolSchedulePanel extends HTMLElement {
     this._showConfirmModal(
       'Remove Exception',
       `Are you sure you want to remove the exception for ${formattedDate}?`,
-      () => this._callService('remove_exception', {
-        child_name: this._selectedChild,
-        date: date
-      })
+      () => this._queueEdit(this._selectedChild, 'exceptions', date, null)
     );
   }
 
-  _showMessage(text, type = 'success') {
-    const content = this.shadowRoot.getElementById('content');
-    if (content) {
+  _showMessage(text, type = 'success', timeout = 4000) {
+    // Messages live outside #content so patching the tab leaves them alone
+    const messages = this.shadowRoot.getElementById('messages');
+    if (messages) {
       const msg = document.createElement('div');
       msg.className = `message ${type}`;
       msg.textContent = text;
-      content.prepend(msg);
-      setTimeout(() => msg.remove(), 4000);
+      messages.prepend(msg);
+      setTimeout(() => msg.remove(), timeout);
     }
   }
 
   _updateData() {
-    // Defer DOM rebuild while user is interacting or file picker is open
+    // Defer DOM updates while user is interacting or file picker is open
     // to prevent losing focus, clearing inputs, and disrupting selections
     if (this._userInteracting || this._filePickerOpen) {
       this._pendingUpdate = true;
       return;
     }
-    const contentEl = this.shadowRoot.getElementById('content');
-    if (contentEl) {
-      contentEl.innerHTML = this._renderTabContent();
-      this._attachEventListeners();
-    }
+    this._update();
   }
 
   getCardSize() {